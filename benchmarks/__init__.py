@@ -0,0 +1,21 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Performance benchmarks of the agent.
+
+Benchmarks generate Robot Framework suites of the given shape and run them with the listener against a local stand-in
+ReportPortal server. Run them from the repository root with:
+
+    python -m benchmarks.run --tests 100 --depth 3 --logs 5 --latency 5 --output benchmark.json
+"""
@@ -0,0 +1,116 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Replay listener events recorded with the RP_RECORD_EVENTS variable into a fresh listener.
+
+Back ends:
+    null  - reported data is dropped by the NULL sink, which only counts calls and bytes
+    mock  - ReportPortal client is replaced with a mock object, nothing is sent or written
+    spool - reported data is written to a local spool file, see RP_SINK_TYPE variable
+    real  - reported data is sent to the server configured with RP_ENDPOINT, RP_PROJECT and RP_API_KEY variables
+
+Usage:
+    python -m benchmarks.replay TAPE [--backend {null,mock,spool,real}] [--variable NAME:VALUE]... [--repeat N]
+                                     [--output FILE]
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+from robotframework_reportportal import variables as rp_variables
+from robotframework_reportportal.listener import listener
+from robotframework_reportportal.recorder import read_events
+
+BACKENDS = ("null", "mock", "spool", "real")
+DEFAULT_VARIABLES = {
+    "RP_ENDPOINT": "http://localhost:8080",
+    "RP_PROJECT": "replay",
+    "RP_API_KEY": "replay",
+    "RP_LAUNCH": "Replay",
+}
+
+
+def replay(tape: str, backend: str = "mock", variables: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Feed listener events from the tape into a fresh listener as fast as possible.
+
+    :param tape:      Path to the tape file
+    :param backend:   Back end to report to: "null", "mock", "spool" or "real"
+    :param variables: ReportPortal variables to configure the listener with
+    :return:          Replay results
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown replay back end: {backend}")
+    os.environ.setdefault("AGENT_NO_ANALYTICS", "1")
+    events = list(read_events(tape))
+    replay_variables = {} if backend == "real" else dict(DEFAULT_VARIABLES)
+    if backend in ("null", "spool"):
+        replay_variables["RP_SINK_TYPE"] = backend.upper()
+    replay_variables.update(variables or {})
+    # Variables are taken from this storage if Robot Framework is not running
+    rp_variables._variables.clear()
+    rp_variables._variables.update(replay_variables)
+
+    patcher = mock.patch("reportportal_client.RPClient") if backend == "mock" else None
+    if patcher:
+        patcher.start()
+    try:
+        rp_listener = listener()
+        start = time.perf_counter()
+        for event, _, args, kwargs in events:
+            getattr(rp_listener, event)(*args, **kwargs)
+        duration = time.perf_counter() - start
+    finally:
+        if patcher:
+            patcher.stop()
+        rp_variables._variables.clear()
+    recorded_duration = events[-1][1] - events[0][1] if events else 0.0
+    return {
+        "tape": tape,
+        "backend": backend,
+        "events": len(events),
+        "recorded_duration_s": round(recorded_duration, 6),
+        "duration_s": round(duration, 6),
+        "events_per_second": round(len(events) / duration, 3) if duration else None,
+        "time_per_event_us": round(duration * 1e6 / len(events), 3) if events else None,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse command line arguments, replay the tape and write the results."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.replay", description="Replay listener event tape.")
+    parser.add_argument("tape", help="path to the tape file recorded with RP_RECORD_EVENTS variable")
+    parser.add_argument("--backend", choices=BACKENDS, default="mock", help="back end to report to")
+    parser.add_argument(
+        "--variable", action="append", default=[], help="agent variable in NAME:VALUE format, can be repeated"
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="number of replays")
+    parser.add_argument("--output", help="file to write JSON results to, stdout if not set")
+    args = parser.parse_args(argv)
+
+    variables = dict(v.split(":", 1) for v in args.variable)
+    results = [replay(args.tape, args.backend, variables) for _ in range(args.repeat)]
+    output = json.dumps(results if args.repeat > 1 else results[0], indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
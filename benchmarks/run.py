@@ -0,0 +1,206 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Run a benchmark of the agent and report its results as JSON.
+
+Usage:
+    python -m benchmarks.run [--tests N] [--depth N] [--logs N] [--attachments N] [--attachment-size BYTES]
+                             [--loops N] [--wuks N] [--latency MS] [--variable NAME:VALUE]... [--output FILE]
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import robot
+from reportportal_client.helpers import get_package_version
+
+from benchmarks.server import MockReportPortalServer
+from benchmarks.suites import SuiteShape, generate_suite
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+LISTENER = "robotframework_reportportal.listener"
+
+
+class EventCounter:
+    """Robot Framework listener which counts listener events."""
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    count: int
+
+    def __init__(self) -> None:
+        """Initialize counter attributes."""
+        self.count = 0
+
+    def _count(self, *_: Any) -> None:
+        self.count += 1
+
+    start_suite = end_suite = start_test = end_test = start_keyword = end_keyword = log_message = _count
+
+
+def get_peak_rss() -> Optional[int]:
+    """Get peak resident set size of the current process.
+
+    :return: Peak RSS in bytes, or None if it's not available on the platform
+    """
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def get_commit() -> Optional[str]:
+    """Get current Git commit of the repository, if possible."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(suite_path: str, output_dir: str, listeners: List[Any], variables: List[str]) -> float:
+    """Run the suite with Robot Framework.
+
+    :param suite_path: Path to the suite file
+    :param output_dir: Directory for Robot Framework output files
+    :param listeners:  Listeners to run the suite with
+    :param variables:  Robot Framework variables in "NAME:VALUE" format
+    :return:           Run duration in seconds
+    """
+    start = time.perf_counter()
+    robot.run(
+        suite_path,
+        listener=listeners,
+        variable=variables,
+        outputdir=output_dir,
+        log="NONE",
+        report="NONE",
+        stdout=io.StringIO(),
+        stderr=io.StringIO(),
+    )
+    return time.perf_counter() - start
+
+
+def run_benchmark(
+    shape: SuiteShape, latency: float = 0.0, variables: Optional[List[str]] = None, work_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """Run the benchmark for the suite of the given shape.
+
+    The suite is run three times: without the agent to get baseline time, with the agent reporting to the NULL sink
+    to get the agent's own overhead, and with the agent reporting to the local stand-in server.
+
+    :param shape:     Shape of the generated suite
+    :param latency:   Stand-in server response delay in seconds
+    :param variables: Additional Robot Framework variables in "NAME:VALUE" format to configure the agent
+    :param work_dir:  Directory for the generated suite and output files, a temporary one is used if not set
+    :return:          Benchmark results
+    """
+    os.environ.setdefault("AGENT_NO_ANALYTICS", "1")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        work_dir = work_dir or temp_dir
+        suite_path = generate_suite(work_dir, shape)
+
+        baseline_counter = EventCounter()
+        baseline_time = run_suite(suite_path, work_dir, [baseline_counter], [])
+
+        null_variables = [
+            "RP_ENDPOINT:http://localhost:8080",
+            "RP_PROJECT:benchmark",
+            "RP_API_KEY:benchmark",
+            "RP_LAUNCH:Benchmark",
+            "RP_SINK_TYPE:NULL",
+        ] + (variables or [])
+        null_time = run_suite(suite_path, work_dir, [EventCounter(), LISTENER], null_variables)
+
+        with MockReportPortalServer(latency=latency) as server:
+            agent_variables = [
+                f"RP_ENDPOINT:{server.endpoint}",
+                "RP_PROJECT:benchmark",
+                "RP_API_KEY:benchmark",
+                "RP_LAUNCH:Benchmark",
+            ] + (variables or [])
+            counter = EventCounter()
+            agent_time = run_suite(suite_path, work_dir, [counter, LISTENER], agent_variables)
+            request_count = server.request_count
+
+    events = counter.count
+    return {
+        "commit": get_commit(),
+        "agent_version": get_package_version("robotframework-reportportal"),
+        "python": platform.python_version(),
+        "robot": robot.__version__,
+        "shape": shape.to_dict(),
+        "latency_ms": latency * 1000,
+        "variables": variables or [],
+        "events": events,
+        "baseline_s": round(baseline_time, 6),
+        "null_sink_s": round(null_time, 6),
+        "duration_s": round(agent_time, 6),
+        "events_per_second": round(events / agent_time, 3) if agent_time else None,
+        "agent_overhead_per_event_us": round((null_time - baseline_time) * 1e6 / events, 3) if events else None,
+        "overhead_per_event_us": round((agent_time - baseline_time) * 1e6 / events, 3) if events else None,
+        "requests": request_count,
+        "peak_rss_bytes": get_peak_rss(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse command line arguments, run the benchmark and write its results."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Benchmark the agent.")
+    parser.add_argument("--tests", type=int, default=100, help="number of test cases")
+    parser.add_argument("--depth", type=int, default=3, help="depth of user keyword nesting")
+    parser.add_argument("--logs", type=int, default=5, help="number of log messages in the deepest keyword")
+    parser.add_argument("--attachments", type=int, default=0, help="number of attachments in the deepest keyword")
+    parser.add_argument("--attachment-size", type=int, default=65536, help="attachment size in bytes")
+    parser.add_argument("--loops", type=int, default=0, help="number of FOR loop iterations in each test")
+    parser.add_argument("--wuks", type=int, default=0, help="number of 'Wait Until Keyword Succeeds' attempts")
+    parser.add_argument("--latency", type=float, default=0.0, help="stand-in server response delay in ms")
+    parser.add_argument(
+        "--variable", action="append", default=[], help="agent variable in NAME:VALUE format, can be repeated"
+    )
+    parser.add_argument("--output", help="file to write JSON results to, stdout if not set")
+    args = parser.parse_args(argv)
+
+    shape = SuiteShape(
+        tests=args.tests,
+        depth=args.depth,
+        logs=args.logs,
+        attachments=args.attachments,
+        attachment_size=args.attachment_size,
+        loops=args.loops,
+        wuks=args.wuks,
+    )
+    results = run_benchmark(shape, args.latency / 1000, args.variable)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Local stand-in of the ReportPortal API server for load and integration testing.
+
+The server implements launch, item, log (JSON and multipart batch) and project settings endpoints the client uses.
+It supports response latency, error injection, request rate limit and request recording, in memory or into a JSON
+lines file.
+
+Usage:
+    python -m benchmarks.server [--host HOST] [--port PORT] [--latency MS] [--error-rate RATE]
+                                [--error-status STATUS] [--max-rps RPS] [--record FILE]
+"""
+
+import argparse
+import base64
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+LAUNCH_START_PATH = re.compile(r"^/api/v2/[^/]+/launch/?$")
+LAUNCH_FINISH_PATH = re.compile(r"^/api/v2/[^/]+/launch/[^/]+/finish/?$")
+ITEM_START_PATH = re.compile(r"^/api/v2/[^/]+/item(?:/[^/]+)?/?$")
+ITEM_FINISH_PATH = re.compile(r"^/api/v2/[^/]+/item/[^/]+/?$")
+LOG_PATH = re.compile(r"^/api/v2/[^/]+/log(?:/entry)?/?$")
+LAUNCH_INFO_PATH = re.compile(r"^/api/v1/[^/]+/launch/uuid/([^/]+)/?$")
+PROJECT_SETTINGS_PATH = re.compile(r"^/api/v1/([^/]+)/settings/?$")
+JSON_REQUEST_PART = "json_request_part"
+
+
+class RecordedFile:
+    """File received in a multipart log request."""
+
+    name: Optional[str]
+    content_type: str
+    data: bytes
+
+    def __init__(self, name: Optional[str], content_type: str, data: bytes) -> None:
+        """Initialize file attributes.
+
+        :param name:         File name
+        :param content_type: MIME type of the file
+        :param data:         File content
+        """
+        self.name = name
+        self.content_type = content_type
+        self.data = data
+
+
+class RecordedRequest:
+    """Request received by the server."""
+
+    method: str
+    path: str
+    status: int
+    body: Any
+    files: List[RecordedFile]
+
+    def __init__(self, method: str, path: str, status: int, body: Any, files: List[RecordedFile]) -> None:
+        """Initialize request attributes.
+
+        :param method: HTTP method
+        :param path:   Request path without query
+        :param status: Status of the response given
+        :param body:   Parsed JSON body, or JSON part of the multipart request
+        :param files:  Files of the multipart request
+        """
+        self.method = method
+        self.path = path
+        self.status = status
+        self.body = body
+        self.files = files
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the request to a JSON-serializable dictionary, file content is encoded with Base64."""
+        files = [
+            {"name": f.name, "content_type": f.content_type, "data": base64.b64encode(f.data).decode("ascii")}
+            for f in self.files
+        ]
+        return {"method": self.method, "path": self.path, "status": self.status, "body": self.body, "files": files}
+
+    @classmethod
+    def from_dict(cls, request: Dict[str, Any]) -> "RecordedRequest":
+        """Create the request from a dictionary made by :meth:`to_dict`."""
+        files = [RecordedFile(f["name"], f["content_type"], base64.b64decode(f["data"])) for f in request["files"]]
+        return cls(request["method"], request["path"], request["status"], request["body"], files)
+
+
+def read_recording(file_path: str) -> List[RecordedRequest]:
+    """Read requests recorded into a file by the server.
+
+    :param file_path: Path to the JSON lines file passed as `record_file`
+    :return:          List of requests in order of receipt
+    """
+    with open(file_path, encoding="utf-8") as f:
+        return [RecordedRequest.from_dict(json.loads(line)) for line in f if line.strip()]
+
+
+def parse_multipart(content_type: str, data: bytes) -> Tuple[Any, List[RecordedFile]]:
+    """Parse multipart log batch request body.
+
+    :param content_type: Value of the Content-Type header with the boundary
+    :param data:         Request body
+    :return:             Parsed JSON request part and the list of files
+    """
+    message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + data)
+    body = None
+    files = []
+    for part in message.iter_parts():
+        content = part.get_payload(decode=True) or b""
+        if part.get_param("name", header="content-disposition") == JSON_REQUEST_PART:
+            body = json.loads(content)
+        else:
+            files.append(RecordedFile(part.get_filename(), part.get_content_type(), content))
+    return body, files
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server: "_HTTPServer"
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, avoid delayed ACK stalls on keep-alive connections
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Do not write each request to stderr
+        pass
+
+    def _send_json(self, status: int, body: Any) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length)
+        status, body = self.server.stand_in.handle(
+            self.command, self.path.split("?", 1)[0], self.headers.get("Content-Type", ""), data
+        )
+        self._send_json(status, body)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_PUT = _handle
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    stand_in: "MockReportPortalServer"
+
+
+class MockReportPortalServer:
+    """Local stand-in of the ReportPortal API which answers to the requests the client makes.
+
+    The server runs on a background thread and can be used as a context manager.
+    """
+
+    host: str
+    port: int
+    latency: float
+    error_rate: float
+    error_status: int
+    max_rps: Optional[float]
+    record: bool
+    record_file: Optional[str]
+    request_count: int
+    error_count: int
+    log_count: int
+    requests: List[RecordedRequest]
+    _random: random.Random
+    _next_slot: float
+    _server: Optional[_HTTPServer]
+    _thread: Optional[threading.Thread]
+    _lock: threading.Lock
+    _record_file: Optional[IO[str]]
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        max_rps: Optional[float] = None,
+        record: bool = False,
+        seed: Optional[int] = None,
+        record_file: Optional[str] = None,
+    ) -> None:
+        """Initialize server attributes.
+
+        :param host:         Host to listen on
+        :param port:         Port to listen on, a free one is chosen if zero
+        :param latency:      Delay before each response in seconds
+        :param error_rate:   Share of requests to answer with an error, from 0 to 1
+        :param error_status: HTTP status of injected errors
+        :param max_rps:      Maximum number of requests per second to serve, requests above it wait for their turn
+        :param record:       Record received requests into the `requests` attribute
+        :param seed:         Random seed of the error injection
+        :param record_file:  Path to a JSON lines file to write received requests into while the server runs
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.max_rps = max_rps
+        self.record = record
+        self.record_file = record_file
+        self.request_count = 0
+        self.error_count = 0
+        self.log_count = 0
+        self.requests = []
+        self._random = random.Random(seed)
+        self._next_slot = 0.0
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._record_file = None
+
+    @property
+    def endpoint(self) -> str:
+        """Get URL of the server to use as ReportPortal endpoint."""
+        return f"http://{self.host}:{self.port}"
+
+    def _wait_for_slot(self) -> None:
+        """Delay the request to keep the rate under the limit."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1 / self.max_rps
+        if slot > now:
+            time.sleep(slot - now)
+
+    def handle(self, method: str, path: str, content_type: str, data: bytes) -> Tuple[int, Any]:
+        """Handle the request, applying rate limit, latency and error injection.
+
+        :param method:       HTTP method of the request
+        :param path:         Path of the request without query
+        :param content_type: Value of the Content-Type header
+        :param data:         Request body
+        :return:             HTTP status and JSON body of the response
+        """
+        if self.max_rps:
+            self._wait_for_slot()
+        if self.latency:
+            time.sleep(self.latency)
+        files: List[RecordedFile] = []
+        if content_type.startswith("multipart/"):
+            body, files = parse_multipart(content_type, data)
+        else:
+            body = json.loads(data) if data else None
+        with self._lock:
+            self.request_count += 1
+            error = self.error_rate > 0 and self._random.random() < self.error_rate
+        if error:
+            status, response = self.error_status, {"errorCode": 5000, "message": "Injected error"}
+        else:
+            status, response = self.respond(method, path, body)
+        with self._lock:
+            if error:
+                self.error_count += 1
+            elif LOG_PATH.match(path):
+                self.log_count += len(body) if isinstance(body, list) else 1
+            if self.record or self._record_file:
+                request = RecordedRequest(method, path, status, body, files)
+                if self.record:
+                    self.requests.append(request)
+                if self._record_file:
+                    self._record_file.write(json.dumps(request.to_dict(), separators=(",", ":")) + "\n")
+                    self._record_file.flush()
+        return status, response
+
+    def respond(self, method: str, path: str, body: Any = None) -> Tuple[int, Any]:
+        """Build response to the request.
+
+        :param method: HTTP method of the request
+        :param path:   Path of the request
+        :param body:   Parsed request body
+        :return:       HTTP status and JSON body of the response
+        """
+        if method == "POST" and LAUNCH_START_PATH.match(path):
+            return 201, {"id": str(uuid.uuid4())}
+        if method == "PUT" and LAUNCH_FINISH_PATH.match(path):
+            return 200, {"message": "Launch finished"}
+        if method == "POST" and LOG_PATH.match(path):
+            if isinstance(body, list):
+                return 201, {"responses": [{"id": str(uuid.uuid4())} for _ in body]}
+            return 201, {"id": str(uuid.uuid4())}
+        if method == "POST" and ITEM_START_PATH.match(path):
+            return 201, {"id": (body or {}).get("uuid") or str(uuid.uuid4())}
+        if method == "PUT" and ITEM_FINISH_PATH.match(path):
+            return 200, {"message": "Item finished"}
+        launch_info = LAUNCH_INFO_PATH.match(path)
+        if method == "GET" and launch_info:
+            return 200, {"id": 1, "uuid": launch_info.group(1)}
+        project_settings = PROJECT_SETTINGS_PATH.match(path)
+        if method == "GET" and project_settings:
+            return 200, {"project": project_settings.group(1), "subTypes": {}}
+        return 404, {"errorCode": 4040, "message": f"No handler for {method} {path}"}
+
+    def get_requests(
+        self, method: Optional[str] = None, path_pattern: Optional[re.Pattern] = None
+    ) -> List[RecordedRequest]:
+        """Get recorded requests, filtered by method and path.
+
+        :param method:       HTTP method to filter by
+        :param path_pattern: Compiled pattern of the path to filter by, e.g. ITEM_START_PATH
+        :return:             List of matching requests in order of receipt
+        """
+        with self._lock:
+            requests = list(self.requests)
+        return [
+            r
+            for r in requests
+            if (method is None or r.method == method) and (path_pattern is None or path_pattern.match(r.path))
+        ]
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Get counters of the received requests."""
+        with self._lock:
+            return {"requests": self.request_count, "errors": self.error_count, "logs": self.log_count}
+
+    def start(self) -> "MockReportPortalServer":
+        """Start serving requests on a background thread.
+
+        :return: The server itself
+        """
+        if self.record_file:
+            self._record_file = open(self.record_file, "w", encoding="utf-8")
+        self._server = _HTTPServer((self.host, self.port), _RequestHandler)
+        self._server.stand_in = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="rp-mock-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving requests and release the port."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._record_file:
+            with self._lock:
+                self._record_file.close()
+                self._record_file = None
+
+    def __enter__(self) -> "MockReportPortalServer":
+        """Start the server on entering the context."""
+        return self.start()
+
+    def __exit__(self, *_: Any) -> None:
+        """Stop the server on leaving the context."""
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parse command line arguments and serve requests until interrupted."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.server", description="Stand-in ReportPortal server.")
+    parser.add_argument("--host", default="127.0.0.1", help="host to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="response delay in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests to fail, from 0 to 1")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status of injected errors")
+    parser.add_argument("--max-rps", type=float, help="maximum number of requests per second")
+    parser.add_argument("--record", metavar="FILE", help="JSON lines file to record received requests into")
+    args = parser.parse_args(argv)
+
+    server = MockReportPortalServer(
+        args.host,
+        args.port,
+        args.latency / 1000,
+        args.error_rate,
+        args.error_status,
+        args.max_rps,
+        record_file=args.record,
+    )
+    server.start()
+    print(f"Stand-in ReportPortal server is listening on {server.endpoint}, press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.get_statistics()))
+
+
+if __name__ == "__main__":
+    main()
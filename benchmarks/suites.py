@@ -0,0 +1,134 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module generates Robot Framework suites of the given shape for benchmarking."""
+
+import os
+from typing import Any, Dict, List
+
+SUITE_FILE_NAME = "benchmark.robot"
+ATTACHMENT_FILE_NAME = "attachment.png"
+ATTACHMENT_LOG = '</td></tr><tr><td colspan="3"><a href="{path}"><img src="{path}" width="800px"></a>'
+CELL_SEPARATOR = "    "
+
+
+class SuiteShape:
+    """Shape of a generated benchmark suite."""
+
+    tests: int
+    depth: int
+    logs: int
+    attachments: int
+    attachment_size: int
+    loops: int
+    wuks: int
+
+    def __init__(
+        self,
+        tests: int = 10,
+        depth: int = 2,
+        logs: int = 5,
+        attachments: int = 0,
+        attachment_size: int = 65536,
+        loops: int = 0,
+        wuks: int = 0,
+    ) -> None:
+        """Initialize shape attributes.
+
+        :param tests:           Number of test cases
+        :param depth:           Depth of user keyword nesting inside each test
+        :param logs:            Number of log messages inside the deepest keyword
+        :param attachments:     Number of image attachments inside the deepest keyword
+        :param attachment_size: Size of the attachment file in bytes
+        :param loops:           Number of FOR loop iterations with a log message inside each test
+        :param wuks:            Number of 'Wait Until Keyword Succeeds' attempts inside each test, all but the last
+                                one fail
+        """
+        self.tests = tests
+        self.depth = depth
+        self.logs = logs
+        self.attachments = attachments
+        self.attachment_size = attachment_size
+        self.loops = loops
+        self.wuks = wuks
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the shape to a dictionary."""
+        return dict(vars(self))
+
+
+def _row(*cells: str, indent: int = 1) -> str:
+    return CELL_SEPARATOR * indent + CELL_SEPARATOR.join(cells)
+
+
+def _build_suite(shape: SuiteShape, attachment_path: str) -> str:
+    lines: List[str] = ["*** Test Cases ***"]
+    for test_number in range(1, shape.tests + 1):
+        lines.append(f"Benchmark test {test_number}")
+        if shape.depth > 0:
+            lines.append(_row("Benchmark keyword 1"))
+        else:
+            lines.extend(_leaf_rows(shape, attachment_path))
+        if shape.loops > 0:
+            lines.append(_row("FOR", "${i}", "IN RANGE", str(shape.loops)))
+            lines.append(_row("Log", "Loop iteration ${i}", indent=2))
+            lines.append(_row("END"))
+        if shape.wuks > 0:
+            lines.append(_row("Set Test Variable", "${ATTEMPT}", "${0}"))
+            wuks = str(shape.wuks)
+            lines.append(_row("Wait Until Keyword Succeeds", f"{wuks}x", "0s", "Fail Until Attempt", wuks))
+        lines.append("")
+
+    lines.append("*** Keywords ***")
+    for level in range(1, shape.depth + 1):
+        lines.append(f"Benchmark keyword {level}")
+        if level < shape.depth:
+            lines.append(_row(f"Benchmark keyword {level + 1}"))
+        else:
+            lines.extend(_leaf_rows(shape, attachment_path))
+        lines.append("")
+    lines.append("Fail Until Attempt")
+    lines.append(_row("[Arguments]", "${attempts}"))
+    lines.append(_row("Set Test Variable", "${ATTEMPT}", "${ATTEMPT + 1}"))
+    lines.append(_row("IF", "${ATTEMPT} < ${attempts}"))
+    lines.append(_row("Fail", "Attempt ${ATTEMPT} failed", indent=2))
+    lines.append(_row("END"))
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _leaf_rows(shape: SuiteShape, attachment_path: str) -> List[str]:
+    rows = [_row("Log", f"Benchmark message {n}") for n in range(1, shape.logs + 1)]
+    rows.extend(
+        _row("Log", ATTACHMENT_LOG.format(path=attachment_path), "html=True") for _ in range(shape.attachments)
+    )
+    return rows
+
+
+def generate_suite(directory: str, shape: SuiteShape) -> str:
+    """Generate a Robot Framework suite file of the given shape along with its attachment file.
+
+    :param directory: Directory to write the files to
+    :param shape:     Shape of the suite
+    :return:          Path to the suite file
+    """
+    os.makedirs(directory, exist_ok=True)
+    attachment_path = os.path.abspath(os.path.join(directory, ATTACHMENT_FILE_NAME)).replace(os.sep, "/")
+    if shape.attachments > 0:
+        with open(attachment_path, "wb") as f:
+            f.write(os.urandom(shape.attachment_size))
+    suite_path = os.path.join(directory, SUITE_FILE_NAME)
+    with open(suite_path, "w", encoding="utf-8") as f:
+        f.write(_build_suite(shape, attachment_path))
+    return suite_path
@@ -0,0 +1,514 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""Local reporting daemon shared by Robot Framework processes of one machine, e.g. pabot workers.
+
+Workers connect to the daemon over a Unix domain socket and send it ReportPortal client calls as JSON lines. The
+daemon makes the calls with clients which share a single HTTP session, hence a single connection pool and
+authentication, and a single log batcher per distinct client configuration, including credentials. It's started by
+the first worker and stops once the last worker disconnects and no other one connects within the idle timeout.
+
+Usage:
+    python -m robotframework_reportportal.aggregator SOCKET [--idle-timeout SECONDS]
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import IO, Any, Dict, Optional
+
+from reportportal_client import OutputType, RPClient
+
+try:
+    import fcntl
+except ImportError:
+    # Not a POSIX system, no Unix domain sockets either
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = 5.0
+# Maximum time to wait for a spawned daemon to accept connections
+SPAWN_TIMEOUT = 10.0
+SPAWN_POLL_INTERVAL = 0.05
+
+
+def get_socket_path(endpoint: str, project: str) -> str:
+    """Get default socket path, the same for all processes of the current user reporting to the same project.
+
+    The socket is placed in a directory accessible only by the current user, which is created if it doesn't exist, so
+    other users can't bind the socket first and receive credentials of the workers.
+
+    :param endpoint: ReportPortal endpoint
+    :param project:  ReportPortal project
+    :return:         Path to the socket in the temporary directory
+    :raises ValueError: If the directory exists, but it's not private to the current user
+    """
+    directory = os.path.join(tempfile.gettempdir(), f"rp-aggregator-{os.getuid()}")
+    try:
+        os.mkdir(directory, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+        raise ValueError(f"ReportPortal aggregator directory is not private to the current user: {directory}")
+    key_hash = hashlib.sha1(f"{endpoint}|{project}".encode("utf-8")).hexdigest()[:12]
+    return os.path.join(directory, f"{key_hash}.sock")
+
+
+def _get_config_key(config: Dict[str, Any]) -> str:
+    """Get a key of the client configuration, so only workers with the same credentials and settings share a session.
+
+    :param config: Client keyword arguments sent by the worker
+    :return:       Hash of the configuration
+    """
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _encode_attachment(attachment: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not attachment:
+        return attachment
+    data = attachment.get("data")
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return {**attachment, "data": base64.b64encode(data or b"").decode("ascii")}
+
+
+def _decode_attachment(attachment: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not attachment:
+        return attachment
+    return {**attachment, "data": base64.b64decode(attachment["data"])}
+
+
+class AggregatorServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix domain socket server which makes ReportPortal client calls of all connected workers.
+
+    There is a client per launch, since a client reports to a single launch, but all clients with the same
+    configuration share the HTTP session and the log batcher of the first of them.
+    """
+
+    daemon_threads = True
+    idle_timeout: float
+    workers: int
+    clients: Dict[str, RPClient]
+    session_clients: Dict[str, RPClient]
+    _socket_inode: int
+    _closing: bool
+    _idle_timer: Optional[threading.Timer]
+    _lock: threading.Lock
+
+    def __init__(self, socket_path: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+        """Bind the socket, accessible only by the current user, since workers send credentials to it.
+
+        :param socket_path:  Path to the socket
+        :param idle_timeout: Time in seconds to wait for a new worker after the last one disconnects
+        """
+        umask = os.umask(0o077)
+        try:
+            super().__init__(socket_path, AggregatorHandler)
+        finally:
+            os.umask(umask)
+        self._socket_inode = os.stat(socket_path).st_ino
+        self.idle_timeout = idle_timeout
+        self.workers = 0
+        self.clients = {}
+        self.session_clients = {}
+        self._closing = False
+        self._idle_timer = None
+        self._lock = threading.Lock()
+
+    def get_client(self, config: Dict[str, Any], launch_uuid: Optional[str] = None) -> RPClient:
+        """Get the client of the given launch, or a new client to start a launch with.
+
+        :param config:      Client keyword arguments sent by the worker
+        :param launch_uuid: UUID of the launch to report to
+        :return:            Client sharing the session and the log batcher with clients of the same configuration
+        """
+        with self._lock:
+            if launch_uuid in self.clients:
+                return self.clients[launch_uuid]
+            config_key = _get_config_key(config)
+            http_timeout = config.get("http_timeout")
+            if isinstance(http_timeout, list):
+                config = {**config, "http_timeout": tuple(http_timeout)}
+            session_client = self.session_clients.get(config_key)
+            if session_client is None:
+                client = RPClient(**config, launch_uuid=launch_uuid)
+                self.session_clients[config_key] = client
+            else:
+                # Internals of the client, which may change between its versions, without them batches are not shared
+                log_batcher = getattr(session_client, "_log_batcher", None)
+                client = RPClient(**config, launch_uuid=launch_uuid, log_batcher=log_batcher)
+                client.session.close()
+                client.session = session_client.session
+            if launch_uuid:
+                self.clients[launch_uuid] = client
+            return client
+
+    def register_launch(self, launch_uuid: str, client: RPClient) -> None:
+        """Make the client which started a launch available to other workers reporting to the launch.
+
+        :param launch_uuid: Launch UUID
+        :param client:      Client which started the launch
+        """
+        with self._lock:
+            self.clients.setdefault(launch_uuid, client)
+
+    def flush_logs(self) -> None:
+        """Send all batched log messages."""
+        with self._lock:
+            clients = [*self.session_clients.values(), *self.clients.values()]
+        for client in clients:
+            # Internals of the client, which may change between its versions
+            log_batcher = getattr(client, "_log_batcher", None)
+            send_batch = getattr(client, "_log", None)
+            if log_batcher and send_batch:
+                send_batch(log_batcher.flush())
+
+    def connect_worker(self) -> bool:
+        """Count a connected worker.
+
+        :return: False if the daemon is shutting down and the worker should connect to a new one
+        """
+        with self._lock:
+            if self._closing:
+                return False
+            self.workers += 1
+            if self._idle_timer:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            return True
+
+    def disconnect_worker(self) -> None:
+        """Count a disconnected worker, schedule shutdown if it was the last one."""
+        with self._lock:
+            self.workers -= 1
+            if self.workers == 0:
+                self._idle_timer = threading.Timer(self.idle_timeout, self._shutdown_if_idle)
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+
+    def _remove_socket_file(self) -> None:
+        try:
+            # The file may be replaced by a daemon started after this one was considered dead
+            if os.stat(self.server_address).st_ino == self._socket_inode:
+                os.remove(self.server_address)
+        except OSError:
+            pass
+
+    def _shutdown_if_idle(self) -> None:
+        with self._lock:
+            if self.workers > 0:
+                return
+            self._idle_timer = None
+            self._closing = True
+            # New workers start a new daemon from now on
+            self._remove_socket_file()
+        self.shutdown()
+
+    def server_close(self) -> None:
+        """Close the socket, remove the socket file and send the logs left."""
+        super().server_close()
+        self._remove_socket_file()
+        for client in self.session_clients.values():
+            client.close()
+
+
+class AggregatorHandler(socketserver.StreamRequestHandler):
+    """Connection of a single worker, its calls are made one by one in order of receiving."""
+
+    server: AggregatorServer
+    config: Dict[str, Any]
+    client: Optional[RPClient]
+
+    def handle(self) -> None:
+        """Read calls, make them and write results back until the worker disconnects."""
+        self.config = {}
+        self.client = None
+        if not self.server.connect_worker():
+            return
+        try:
+            for line in self.rfile:
+                call = json.loads(line)
+                try:
+                    response = {"result": self.dispatch(call["method"], call.get("kwargs", {}))}
+                except Exception as e:
+                    logger.exception(e)
+                    response = {"error": f"{type(e).__name__}: {e}"}
+                self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+        finally:
+            self.server.disconnect_worker()
+
+    def dispatch(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        """Make the call received from the worker.
+
+        :param method: Client method name or "connect"
+        :param kwargs: Keyword arguments of the call
+        :return:       Result of the call
+        """
+        if method == "connect":
+            self.config = kwargs["config"]
+            launch_uuid = self.config.pop("launch_uuid", None)
+            if launch_uuid:
+                self.client = self.server.get_client(self.config, launch_uuid)
+            return None
+        if method == "start_launch":
+            if self.client is None:
+                self.client = self.server.get_client(self.config)
+            launch_uuid = self.client.start_launch(**kwargs)
+            if launch_uuid:
+                self.server.register_launch(launch_uuid, self.client)
+            return launch_uuid
+        if method == "close":
+            self.server.flush_logs()
+            return None
+        if self.client is None:
+            raise ValueError(f"Call '{method}' was made before the launch start")
+        if method == "log":
+            kwargs["attachment"] = _decode_attachment(kwargs.get("attachment"))
+        elif method not in ("finish_launch", "start_test_item", "finish_test_item"):
+            raise ValueError(f"Unknown call: {method}")
+        return getattr(self.client, method)(**kwargs)
+
+
+def connect(socket_path: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> socket.socket:
+    """Connect to the daemon, start it if it's not running.
+
+    Workers start the daemon under an exclusive lock of a file next to the socket, so only one daemon is started.
+
+    :param socket_path:  Path to the socket
+    :param idle_timeout: Idle timeout of the daemon to start
+    :return:             Connected socket
+    """
+    if fcntl is None:
+        raise ValueError("ReportPortal aggregator is not supported on this platform.")
+    with open(socket_path + ".lock", "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            return _connect(socket_path)
+        except PermissionError:
+            raise
+        except OSError:
+            pass
+        if os.path.exists(socket_path):
+            # Left by a daemon which was killed
+            os.remove(socket_path)
+        subprocess.Popen(
+            [sys.executable, "-m", __name__, socket_path, "--idle-timeout", str(idle_timeout)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        deadline = time.monotonic() + SPAWN_TIMEOUT
+        while True:
+            try:
+                return _connect(socket_path)
+            except PermissionError:
+                raise
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(SPAWN_POLL_INTERVAL)
+
+
+def _connect(socket_path: str) -> socket.socket:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        _check_owner(sock, socket_path)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _check_owner(sock: socket.socket, socket_path: str) -> None:
+    """Make sure the daemon runs as the current user before sending it credentials.
+
+    :param sock:        Connected socket
+    :param socket_path: Path to the socket
+    :raises PermissionError: If the daemon or the socket belongs to another user
+    """
+    if hasattr(socket, "SO_PEERCRED"):
+        credentials = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _, uid, _ = struct.unpack("3i", credentials)
+    else:
+        uid = os.stat(socket_path).st_uid
+    if uid != os.getuid():
+        raise PermissionError(f"ReportPortal aggregator socket belongs to another user: {socket_path}")
+
+
+class AggregatorClient:
+    """ReportPortal client stand-in which sends every call to the local reporting daemon.
+
+    Calls which failed in the daemon or could not be sent return None, the same way as failed calls of the client,
+    and are counted. Nothing is logged on failure, since log messages of the agent are reported back through it.
+    """
+
+    socket_path: str
+    launch_uuid: Optional[str]
+    launch_uuid_print: bool
+    print_output: Optional[OutputType]
+    errors: int
+    last_error: Optional[str]
+    _config: Dict[str, Any]
+    _idle_timeout: float
+    _socket: Optional[socket.socket]
+    _file: Optional[IO[bytes]]
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        socket_path: str,
+        config: Dict[str, Any],
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        launch_uuid_print: bool = False,
+        print_output: Optional[OutputType] = None,
+    ) -> None:
+        """Connect to the daemon, starting it if needed, and send the client configuration.
+
+        :param socket_path:       Path to the socket
+        :param config:            Keyword arguments of the ReportPortal client to create in the daemon
+        :param idle_timeout:      Idle timeout of the daemon to start
+        :param launch_uuid_print: Print launch UUID on launch start
+        :param print_output:      Output stream for launch UUID printing
+        """
+        self.socket_path = socket_path
+        self.launch_uuid = config.get("launch_uuid")
+        self.launch_uuid_print = launch_uuid_print
+        self.print_output = print_output
+        self.errors = 0
+        self.last_error = None
+        self._config = config
+        self._idle_timeout = idle_timeout
+        self._socket = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._connect()
+
+    def _connect(self) -> None:
+        # The daemon may stop right after accepting the connection, then the next one is started
+        for _ in range(2):
+            try:
+                self._socket = connect(self.socket_path, self._idle_timeout)
+            except OSError as e:
+                raise ValueError(f"Unable to connect to ReportPortal aggregator: {e}")
+            self._file = self._socket.makefile("rwb")
+            if self._request("connect", config=self._config, count_error=False) is not False:
+                return
+            self._disconnect()
+        raise ValueError(f"Unable to connect to ReportPortal aggregator: {self.last_error}")
+
+    def _disconnect(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+        if self._socket:
+            self._socket.close()
+            self._socket = None
+
+    def _request(self, method: str, count_error: bool = True, **kwargs: Any) -> Any:
+        line = json.dumps({"method": method, "kwargs": kwargs}, separators=(",", ":"), default=str)
+        with self._lock:
+            if self._file is None:
+                response = {"error": "Not connected"}
+            else:
+                try:
+                    self._file.write(line.encode("utf-8") + b"\n")
+                    self._file.flush()
+                    response_line = self._file.readline()
+                    response = json.loads(response_line) if response_line else {"error": "Connection closed"}
+                except OSError as e:
+                    response = {"error": f"{type(e).__name__}: {e}"}
+        if "error" in response:
+            if count_error:
+                self.errors += 1
+            self.last_error = response["error"]
+            return False if method == "connect" else None
+        return response["result"]
+
+    def start_launch(self, **kwargs: Any) -> Optional[str]:
+        """Send launch start call and return the launch UUID."""
+        own_launch = not self.launch_uuid
+        launch_uuid = self._request("start_launch", **kwargs)
+        if launch_uuid:
+            self.launch_uuid = launch_uuid
+            if own_launch and self.launch_uuid_print and self.print_output:
+                print(f"ReportPortal Launch UUID: {launch_uuid}", file=self.print_output.get_output())
+        return launch_uuid
+
+    def finish_launch(self, **kwargs: Any) -> None:
+        """Send launch finish call."""
+        return self._request("finish_launch", **kwargs)
+
+    def start_test_item(self, **kwargs: Any) -> Optional[str]:
+        """Send item start call and return the item UUID."""
+        return self._request("start_test_item", **kwargs)
+
+    def finish_test_item(self, **kwargs: Any) -> Optional[str]:
+        """Send item finish call."""
+        return self._request("finish_test_item", **kwargs)
+
+    def log(self, **kwargs: Any) -> None:
+        """Send log call, encoding attachment data with Base64."""
+        kwargs["attachment"] = _encode_attachment(kwargs.get("attachment"))
+        self._request("log", **kwargs)
+
+    def close(self) -> None:
+        """Ask the daemon to send batched logs and disconnect."""
+        self._request("close")
+        self._disconnect()
+        if self.errors:
+            logger.warning(f"{self.errors} ReportPortal aggregator calls failed, the last error: {self.last_error}")
+
+
+def main() -> None:
+    """Parse command line arguments and serve until the last worker disconnects."""
+    parser = argparse.ArgumentParser(
+        prog=f"python -m {__name__}", description="Local ReportPortal reporting daemon shared by workers."
+    )
+    parser.add_argument("socket", help="path to the Unix domain socket to listen on")
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help="time in seconds to wait for a new worker after the last one disconnects",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    server = AggregatorServer(args.socket, args.idle_timeout)
+    # Stop if no worker connects at all
+    server.connect_worker()
+    server.disconnect_worker()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains attachment processing routines of the agent."""
+
+import gzip
+import io
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from warnings import warn
+
+from reportportal_client.logs import MAX_LOG_BATCH_PAYLOAD_SIZE
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+COPY_BUFFER_SIZE = 1024 * 1024
+PROCESSABLE_IMAGE_TYPES = {"image/bmp", "image/jpeg", "image/png", "image/tiff", "image/webp"}
+IMAGE_EXTENSIONS = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "BMP": ".bmp", "TIFF": ".tiff"}
+
+
+class CompressionType(Enum):
+    """Enum of supported compression types for Robot Framework output files."""
+
+    NONE = "NONE"
+    GZIP = "GZIP"
+    ZIP = "ZIP"
+
+
+class FileTooLargeError(ValueError):
+    """Compressed file exceeds the attachment size limit."""
+
+
+def compress_file(
+    file_path: str, compression: CompressionType, max_size: int = MAX_LOG_BATCH_PAYLOAD_SIZE
+) -> Dict[str, Any]:
+    """Compress the given file and return attachment dictionary for it.
+
+    The file is read and compressed by chunks into a temporary file, so the uncompressed content is never fully
+    loaded into memory. The compressed content is loaded only if it fits the size limit.
+
+    :param file_path:   Path to the file to compress
+    :param compression: Compression type to use
+    :param max_size:    Maximum size of the compressed file in bytes
+    :return:            Attachment dictionary with "name", "data" and "mime" keys
+    :raises FileTooLargeError: If the compressed file is larger than the limit
+    """
+    file_name = os.path.basename(file_path)
+    with tempfile.TemporaryFile() as archive:
+        if compression is CompressionType.GZIP:
+            with open(file_path, "rb") as source, gzip.GzipFile(filename=file_name, mode="wb", fileobj=archive) as gz:
+                shutil.copyfileobj(source, gz, COPY_BUFFER_SIZE)
+            name, mime = f"{file_name}.gz", "application/gzip"
+        elif compression is CompressionType.ZIP:
+            with zipfile.ZipFile(archive, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+                zf.write(file_path, arcname=file_name)
+            name, mime = f"{file_name}.zip", "application/zip"
+        else:
+            raise ValueError(f"Unsupported compression type: {compression}")
+        size = archive.tell()
+        if size > max_size:
+            raise FileTooLargeError(f"compressed size {size} bytes exceeds the limit of {max_size} bytes")
+        archive.seek(0)
+        return {"name": name, "data": archive.read(), "mime": mime}
+
+
+class FileCompressor:
+    """Compress Robot Framework output files on a background thread."""
+
+    compression: CompressionType
+    max_size: int
+    _executor: Optional[ThreadPoolExecutor]
+    _tasks: List[Tuple[Dict[str, str], str, Future]]
+
+    def __init__(self, compression: CompressionType, max_size: int = MAX_LOG_BATCH_PAYLOAD_SIZE) -> None:
+        """Initialize compressor attributes.
+
+        :param compression: Compression type to use
+        :param max_size:    Maximum size of a compressed file in bytes
+        """
+        self.compression = compression
+        self.max_size = max_size
+        self._executor = None
+        self._tasks = []
+
+    def submit(self, message: Dict[str, str], file_path: str) -> None:
+        """Schedule compression of the given file.
+
+        :param message:   Message to log along with the compressed file
+        :param file_path: Path to the file to compress
+        """
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="rp-compress")
+        self._tasks.append(
+            (message, file_path, self._executor.submit(compress_file, file_path, self.compression, self.max_size))
+        )
+
+    def complete(self) -> Iterator[Tuple[Dict[str, str], str, Optional[Dict[str, Any]]]]:
+        """Wait for all scheduled compressions and return their results in submission order.
+
+        Files which are too large after the compression are skipped, since their uncompressed content is larger still.
+
+        :return: Iterator over message, file path and attachment tuples. Attachment is None if compression failed.
+        """
+        tasks = self._tasks
+        self._tasks = []
+        for message, file_path, task in tasks:
+            try:
+                attachment = task.result()
+            except FileTooLargeError as e:
+                logger.warning(f"File {file_path} is not attached: {e}")
+                continue
+            except Exception as e:
+                logger.warning(f"Unable to compress file {file_path}: {e}")
+                attachment = None
+            yield message, file_path, attachment
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
+
+class ImageProcessor:
+    """Downscale and re-encode image attachments on a thread pool.
+
+    Processing requires Pillow library to be installed, otherwise attachments are passed as is.
+    """
+
+    max_size: Optional[Tuple[int, int]]
+    image_format: Optional[str]
+    quality: int
+    _executor: Optional[ThreadPoolExecutor]
+
+    def __init__(self, max_size: Optional[Tuple[int, int]], image_format: Optional[str], quality: int) -> None:
+        """Initialize processor attributes.
+
+        :param max_size:     Maximum width and height of the image
+        :param image_format: Pillow format name to re-encode the image to, or None to keep the original format
+        :param quality:      Encoding quality for lossy formats
+        """
+        self.max_size = max_size
+        self.image_format = image_format
+        self.quality = quality
+        self._executor = None
+        if Image is None:
+            warn(
+                "Pillow library is not installed, image attachments will be sent without processing.",
+                RuntimeWarning,
+                2,
+            )
+
+    def process(self, attachment: Dict[str, Any]) -> Dict[str, Any]:
+        """Downscale and re-encode the given image attachment.
+
+        :param attachment: Attachment dictionary with "name", "data" and "mime" keys
+        :return:           Processed attachment or the original one if processing failed or gave no size benefit
+        """
+        try:
+            with Image.open(io.BytesIO(attachment["data"])) as image:
+                image_format = self.image_format or image.format
+                resized = bool(self.max_size) and (image.width > self.max_size[0] or image.height > self.max_size[1])
+                if not resized and image_format == image.format:
+                    return attachment
+                if resized:
+                    image.thumbnail(self.max_size)
+                if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+                    image = image.convert("RGB")
+                output = io.BytesIO()
+                image.save(output, format=image_format, quality=self.quality)
+        except Exception as e:
+            logger.warning(f"Unable to process image {attachment.get('name')}: {e}")
+            return attachment
+        data = output.getvalue()
+        if not resized and len(data) >= len(attachment["data"]):
+            return attachment
+        name = os.path.splitext(attachment["name"])[0] + IMAGE_EXTENSIONS.get(image_format, "")
+        return {"name": name, "data": data, "mime": Image.MIME.get(image_format, attachment["mime"])}
+
+    def submit(self, attachment: Dict[str, Any]) -> Union[Dict[str, Any], Future]:
+        """Schedule processing of the given attachment if it is a supported image.
+
+        :param attachment: Attachment dictionary with "name", "data" and "mime" keys
+        :return:           Future of the processed attachment, or the original attachment if it is not processable
+        """
+        if Image is None or attachment.get("mime") not in PROCESSABLE_IMAGE_TYPES:
+            return attachment
+        if not self._executor:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="rp-image")
+        return self._executor.submit(self.process, attachment)
+
+    def shutdown(self) -> None:
+        """Wait for scheduled processing and release the thread pool."""
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
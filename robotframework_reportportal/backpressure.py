@@ -0,0 +1,106 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains policies of handling log messages when the log queue is full."""
+
+import base64
+import json
+import os
+import tempfile
+from enum import Enum
+from typing import IO, Any, Dict, FrozenSet, Iterator, Optional
+
+SHED_LOGS_ATTRIBUTE_KEY = "rp_shed_logs"
+SHED_LOGS_SUMMARY = "{number} log messages were not reported, since ReportPortal could not keep up: {levels}."
+SPILLED_LOGS_SUMMARY = "{number} log messages were spilled to disk and reported at the end of the launch."
+
+
+class QueuePolicy(Enum):
+    """Enum of actions to take on a log message when the log queue is full."""
+
+    # Wait until there is room in the queue
+    BLOCK = "BLOCK"
+    # Drop TRACE and DEBUG messages, wait for the others
+    DROP_DEBUG = "DROP_DEBUG"
+    # Drop all messages except errors, wait for errors
+    DROP_NON_ERRORS = "DROP_NON_ERRORS"
+    # Write messages to a local file and send them at the end of the launch
+    SPILL = "SPILL"
+
+
+SHED_LEVELS: Dict[QueuePolicy, FrozenSet[str]] = {
+    QueuePolicy.BLOCK: frozenset(),
+    QueuePolicy.DROP_DEBUG: frozenset({"TRACE", "DEBUG"}),
+    QueuePolicy.DROP_NON_ERRORS: frozenset({"TRACE", "DEBUG", "INFO", "WARN"}),
+    QueuePolicy.SPILL: frozenset(),
+}
+
+
+class LogSpill:
+    """Local JSON lines file to put log requests to, which do not fit into the log queue.
+
+    The file is removed once its log requests are read.
+    """
+
+    file_path: Optional[str]
+    count: int
+    _file: Optional[IO[str]]
+
+    def __init__(self, file_path: Optional[str] = None) -> None:
+        """Initialize spill attributes, the file is created on the first write.
+
+        :param file_path: Path to the spill file, by default a new temporary file unique for the process is used
+        """
+        self.file_path = file_path
+        self.count = 0
+        self._file = None
+
+    def write(self, sl_rq: Dict[str, Any]) -> None:
+        """Write log request to the file, encoding attachment data with Base64.
+
+        :param sl_rq: Log request
+        """
+        if self._file is None:
+            if self.file_path is None:
+                fd, self.file_path = tempfile.mkstemp(prefix="reportportal_log_spill_", suffix=".jsonl")
+                self._file = os.fdopen(fd, "w", encoding="utf-8")
+            else:
+                self._file = open(self.file_path, "w", encoding="utf-8")
+        attachment = sl_rq["attachment"]
+        if attachment:
+            data = attachment.get("data")
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            sl_rq = {**sl_rq, "attachment": {**attachment, "data": base64.b64encode(data or b"").decode("ascii")}}
+        self._file.write(json.dumps(sl_rq, separators=(",", ":"), default=str) + "\n")
+        self.count += 1
+
+    def read(self) -> Iterator[Dict[str, Any]]:
+        """Close the file, read log requests written to it and remove the file.
+
+        :return: Iterator over log requests in order of writing
+        """
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        try:
+            with open(self.file_path, encoding="utf-8") as f:
+                for line in f:
+                    sl_rq = json.loads(line)
+                    if sl_rq["attachment"]:
+                        sl_rq["attachment"]["data"] = base64.b64decode(sl_rq["attachment"]["data"])
+                    yield sl_rq
+        finally:
+            os.remove(self.file_path)
@@ -0,0 +1,202 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains log batcher which adapts batch size to observed payload size and response latency."""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from reportportal_client.core.rp_requests import RPRequestLog
+
+try:
+    from reportportal_client._internal.logs.batcher import LogBatcher
+except ImportError:
+    # Internal module of the client, which may change between its versions
+    LogBatcher = object
+
+# Weight of the latest observation in exponential moving averages
+SMOOTHING = 0.2
+
+
+def is_adaptive_batching_supported() -> bool:
+    """Check if the installed client has the log batcher internals the adaptive batcher is built on.
+
+    :return: True if adaptive batching can be used
+    """
+    return LogBatcher is not object and all(
+        hasattr(LogBatcher, attribute) for attribute in ("_append", "flush", "append")
+    )
+
+
+class AdaptiveLogBatcher(LogBatcher):
+    """Log batcher which grows or shrinks the number of entries in a batch within the given bounds.
+
+    The number of entries is doubled while batches are sent faster than a half of the latency threshold and halved
+    when sending a batch takes longer than the threshold. It's also capped by the payload limit divided by the average
+    entry size, so batches of large attachments are not split by the payload limit half-full. A batch is sent
+    regardless of its size if its first entry waits longer than the time budget.
+    """
+
+    min_entry_num: int
+    max_entry_num: int
+    time_budget: float
+    latency_threshold: float
+    batches: int
+    entries: int
+    payload_size: int
+    adjustments: int
+    entry_size: Optional[float]
+    latency: Optional[float]
+    _first_entry_time: float
+    _last_batches: Dict[int, Tuple[int, int]]
+
+    def __init__(
+        self,
+        entry_num: int,
+        max_entry_num: int,
+        payload_limit: int,
+        time_budget: float,
+        latency_threshold: Optional[float] = None,
+        min_entry_num: int = 1,
+    ) -> None:
+        """Initialize the batcher instance with empty batch and specific limits.
+
+        :param entry_num:         Initial number of entries in a batch
+        :param max_entry_num:     Maximum number of entries in a batch
+        :param payload_limit:     Maximum batch size in bytes
+        :param time_budget:       Maximum time in seconds the first entry of a batch waits for the batch to be sent
+        :param latency_threshold: Time in seconds to send a batch, above which the batch size is decreased, the time
+                                  budget if not set
+        :param min_entry_num:     Minimum number of entries in a batch
+        """
+        super().__init__(max(min_entry_num, min(entry_num, max_entry_num)), payload_limit)
+        self.min_entry_num = min_entry_num
+        self.max_entry_num = max_entry_num
+        self.time_budget = time_budget
+        self.latency_threshold = time_budget if latency_threshold is None else latency_threshold
+        self.batches = 0
+        self.entries = 0
+        self.payload_size = 0
+        self.adjustments = 0
+        self.entry_size = None
+        self.latency = None
+        self._first_entry_time = 0.0
+        # A batch is taken and sent by the same thread: the single log lane thread, or the listener thread which
+        # flushes expired and remaining batches. Call latency is matched with the batch by the thread, under the lock
+        self._last_batches = {}
+
+    def _set_entry_num(self, entry_num: int) -> None:
+        entry_num = max(self.min_entry_num, min(entry_num, self.max_entry_num, self._get_size_cap()))
+        if entry_num != self.entry_num:
+            self.entry_num = entry_num
+            self.adjustments += 1
+
+    def _get_size_cap(self) -> int:
+        if not self.entry_size:
+            return self.max_entry_num
+        return max(self.min_entry_num, int(self.payload_limit // self.entry_size))
+
+    def _take(self) -> List[RPRequestLog]:
+        batch = self._batch
+        self._last_batches[threading.get_ident()] = (len(batch), self._payload_size)
+        self.batches += 1
+        self.entries += len(batch)
+        self.payload_size += self._payload_size
+        self._batch = []
+        self._payload_size = 0
+        return batch
+
+    def _append(self, size: int, log_req: RPRequestLog) -> Optional[List[RPRequestLog]]:
+        now = time.monotonic()
+        with self._lock:
+            if self.entry_size is None:
+                self.entry_size = float(size)
+            else:
+                self.entry_size += (size - self.entry_size) * SMOOTHING
+            if self.entry_num > self._get_size_cap():
+                self._set_entry_num(self.entry_num)
+
+            batch = None
+            if self._batch and self._payload_size + size >= self.payload_limit:
+                batch = self._take()
+            if not self._batch:
+                self._first_entry_time = now
+            self._batch.append(log_req)
+            self._payload_size += size
+            if batch is None and (
+                len(self._batch) >= self.entry_num or now - self._first_entry_time >= self.time_budget
+            ):
+                batch = self._take()
+            return batch
+
+    def flush(self) -> Optional[List[RPRequestLog]]:
+        """Immediately return everything what's left in the internal batch.
+
+        :return: a batch or None
+        """
+        with self._lock:
+            if not self._batch:
+                return None
+            return self._take()
+
+    def flush_expired(self) -> Optional[List[RPRequestLog]]:
+        """Return the internal batch if its first entry waits longer than the time budget.
+
+        :return: a batch or None
+        """
+        with self._lock:
+            if not self._batch or time.monotonic() - self._first_entry_time < self.time_budget:
+                return None
+            return self._take()
+
+    def observe_latency(self, duration: float) -> None:
+        """Adjust the number of entries in a batch by the time of the call which sent the last batch.
+
+        Calls which did not send a batch are ignored. The call is matched with the batch by the current thread.
+
+        :param duration: Call duration in seconds
+        """
+        with self._lock:
+            if self._last_batches.pop(threading.get_ident(), None) is None:
+                return
+            if self.latency is None:
+                self.latency = duration
+            else:
+                self.latency += (duration - self.latency) * SMOOTHING
+            if duration > self.latency_threshold:
+                self._set_entry_num(self.entry_num // 2)
+            elif duration < self.latency_threshold / 2:
+                self._set_entry_num(self.entry_num * 2)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert chosen batch size and batching statistics to a dictionary.
+
+        :return: Dictionary with the current limits and batching statistics
+        """
+        return {
+            "entry_num": self.entry_num,
+            "min_entry_num": self.min_entry_num,
+            "max_entry_num": self.max_entry_num,
+            "payload_limit": self.payload_limit,
+            "time_budget_ms": round(self.time_budget * 1000, 3),
+            "latency_threshold_ms": round(self.latency_threshold * 1000, 3),
+            "batches": self.batches,
+            "entries": self.entries,
+            "mean_batch_entries": round(self.entries / self.batches, 3) if self.batches else None,
+            "mean_batch_bytes": round(self.payload_size / self.batches, 3) if self.batches else None,
+            "mean_entry_bytes": round(self.entry_size, 3) if self.entry_size is not None else None,
+            "mean_latency_ms": round(self.latency * 1000, 3) if self.latency is not None else None,
+            "adjustments": self.adjustments,
+        }
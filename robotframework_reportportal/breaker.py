@@ -0,0 +1,128 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains circuit breaker which detects that ReportPortal is down or too slow to report to."""
+
+import time
+from collections import deque
+from typing import Deque, Optional
+
+# Number of the latest calls to calculate latency percentile by
+LATENCY_WINDOW = 50
+# Minimal number of calls in the window to compare latency percentile with the threshold
+LATENCY_MIN_CALLS = 10
+LATENCY_PERCENTILE = 95
+
+
+class CircuitBreaker:
+    """Track client call failures and latency, and open the circuit when thresholds are exceeded.
+
+    The circuit is opened after the given number of consecutive failures, or when 95th latency percentile of the
+    latest calls exceeds the threshold. Once the recovery interval passes, a probe is allowed, which closes the
+    circuit on success or postpones the next probe on failure.
+    """
+
+    failure_threshold: int
+    latency_threshold: Optional[float]
+    recovery_interval: Optional[float]
+    consecutive_failures: int
+    is_open: bool
+    trips: int
+    reason: Optional[str]
+    _latencies: Deque[float]
+    _opened_at: float
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        latency_threshold: Optional[float] = None,
+        recovery_interval: Optional[float] = None,
+    ) -> None:
+        """Initialize circuit breaker attributes.
+
+        :param failure_threshold: Number of consecutive failed calls to open the circuit
+        :param latency_threshold: 95th latency percentile in seconds to open the circuit, not checked if not set
+        :param recovery_interval: Time in seconds between attempts to close the circuit, never closed if not set
+        """
+        self.failure_threshold = failure_threshold
+        self.latency_threshold = latency_threshold
+        self.recovery_interval = recovery_interval
+        self.consecutive_failures = 0
+        self.is_open = False
+        self.trips = 0
+        self.reason = None
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._opened_at = 0.0
+
+    def get_latency_percentile(self) -> Optional[float]:
+        """Calculate 95th latency percentile of the latest calls.
+
+        :return: Latency in seconds or None if there were no calls
+        """
+        if not self._latencies:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[min(len(latencies) - 1, len(latencies) * LATENCY_PERCENTILE // 100)]
+
+    def record(self, duration: float, failed: bool) -> bool:
+        """Record a client call and open the circuit if a threshold is exceeded.
+
+        :param duration: Call duration in seconds
+        :param failed:   Whether the call failed
+        :return:         True if the circuit was opened by this call
+        """
+        self._latencies.append(duration)
+        if failed:
+            self.consecutive_failures += 1
+        else:
+            self.consecutive_failures = 0
+        if self.is_open:
+            return False
+        if self.consecutive_failures >= self.failure_threshold:
+            self.open(f"{self.consecutive_failures} consecutive calls failed")
+            return True
+        if self.latency_threshold is not None and len(self._latencies) >= LATENCY_MIN_CALLS:
+            latency = self.get_latency_percentile()
+            if latency > self.latency_threshold:
+                self.open(f"95th latency percentile is {latency * 1000:.0f} ms")
+                return True
+        return False
+
+    def open(self, reason: str) -> None:
+        """Open the circuit.
+
+        :param reason: Human-readable reason
+        """
+        self.is_open = True
+        self.trips += 1
+        self.reason = reason
+        self._opened_at = time.monotonic()
+
+    def close(self) -> None:
+        """Close the circuit and forget previous calls."""
+        self.is_open = False
+        self.consecutive_failures = 0
+        self._latencies.clear()
+
+    def should_probe(self) -> bool:
+        """Check if the circuit is open and it's time to try to close it."""
+        return (
+            self.is_open
+            and self.recovery_interval is not None
+            and time.monotonic() - self._opened_at >= self.recovery_interval
+        )
+
+    def postpone_probe(self) -> None:
+        """Wait for another recovery interval before the next probe."""
+        self._opened_at = time.monotonic()
@@ -0,0 +1,161 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains time budget which limits how long a listener call may block Robot Framework execution."""
+
+import concurrent.futures
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BUDGET_THREAD_NAME_PREFIX = "rp-listener"
+
+
+class ListenerTimeBudget:
+    """Run listener calls on a single background thread and wait for each of them no longer than the budget.
+
+    Calls are executed one by one in order of submission, so the listener state is never accessed concurrently. If a
+    call does not finish within the budget, Robot Framework execution continues and the call is finished in the
+    background, before any of the following calls. If the number of unfinished calls reaches the queue size, the
+    next call is waited for regardless of the budget, as if it was made synchronously.
+    """
+
+    budget: float
+    queue_size: int
+    calls: int
+    exceeded: Dict[str, int]
+    blocked: int
+    errors: int
+    max_wait: float
+    last_error: Optional[BaseException]
+    _pending: int
+    _executor: ThreadPoolExecutor
+    _worker: Optional[threading.Thread]
+    _lock: threading.Lock
+
+    def __init__(self, budget: float, queue_size: int = 1000) -> None:
+        """Initialize budget attributes and the background thread pool.
+
+        :param budget:     Maximum time in seconds a listener call may block execution
+        :param queue_size: Maximum number of unfinished calls, "0" means the number is not limited
+        """
+        self.budget = budget
+        self.queue_size = queue_size
+        self.calls = 0
+        self.exceeded = {}
+        self.blocked = 0
+        self.errors = 0
+        self.max_wait = 0.0
+        self.last_error = None
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=BUDGET_THREAD_NAME_PREFIX)
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def _run(self, func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Any:
+        self._worker = threading.current_thread()
+        return func(*args, **kwargs)
+
+    def _on_done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _on_deferred_done(self, future: Future) -> None:
+        error = future.exception()
+        if error is None:
+            return
+        with self._lock:
+            self.errors += 1
+            self.last_error = error
+            first_error = self.errors == 1
+        if first_error:
+            # The following errors are only counted, the summary shows the last one
+            logger.error("ReportPortal listener call failed in background", exc_info=error)
+
+    def call(
+        self, event: str, func: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any], wait: bool = False
+    ) -> Any:
+        """Run the call in the background and wait for it within the budget.
+
+        Calls made from the background thread itself, e.g. nested listener calls, are executed immediately.
+
+        :param event:  Listener event name to count exceeded budget by
+        :param func:   Function to call
+        :param args:   Positional arguments of the function
+        :param kwargs: Keyword arguments of the function
+        :param wait:   Wait for the call to finish regardless of the budget
+        :return:       Result of the call or None if it was deferred
+        """
+        if threading.current_thread() is self._worker:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        with self._lock:
+            queue_full = bool(self.queue_size) and self._pending >= self.queue_size
+            if queue_full and not wait:
+                self.blocked += 1
+            self._pending += 1
+        future = self._executor.submit(self._run, func, args, kwargs)
+        future.add_done_callback(self._on_done)
+        try:
+            return future.result(timeout=None if wait or queue_full else self.budget)
+        except concurrent.futures.TimeoutError:
+            with self._lock:
+                self.exceeded[event] = self.exceeded.get(event, 0) + 1
+            future.add_done_callback(self._on_deferred_done)
+            return None
+        finally:
+            wait_time = time.perf_counter() - start
+            with self._lock:
+                self.calls += 1
+                if not wait:
+                    self.max_wait = max(self.max_wait, wait_time)
+
+    def shutdown(self) -> None:
+        """Release the background thread once the submitted calls are finished, without waiting for them."""
+        self._executor.shutdown(wait=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert budget counters to a dictionary.
+
+        :return: Dictionary with the budget and the numbers of calls which exceeded it
+        """
+        return {
+            "budget_ms": round(self.budget * 1000, 3),
+            "calls": self.calls,
+            "exceeded": sum(self.exceeded.values()),
+            "exceeded_by_event": dict(sorted(self.exceeded.items())),
+            "blocked_on_full_queue": self.blocked,
+            "deferred_errors": self.errors,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+        }
+
+    def format_summary(self) -> str:
+        """Format budget counters as a single line suitable for the console."""
+        events = ", ".join(f"{event}: {count}" for event, count in sorted(self.exceeded.items()))
+        summary = (
+            f"ReportPortal listener time budget: {sum(self.exceeded.values())} of {self.calls} calls exceeded "
+            f"{self.budget * 1000:g} ms and were finished in background"
+        )
+        if events:
+            summary += f" ({events})"
+        summary += f", max wait {self.max_wait * 1000:.1f} ms"
+        if self.blocked:
+            summary += f", {self.blocked} waited for the full queue of {self.queue_size} calls"
+        if self.errors:
+            summary += f", {self.errors} of them failed, last error: {self.last_error!r}"
+        return summary
@@ -0,0 +1,263 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains coordination of pabot workers through the shared state of PabotLib remote server.
+
+PabotLib server lives for a single pabot run and is available to all of its workers by PABOTLIBURI variable, so its
+locks and values are used to share a launch and its suites between the workers.
+"""
+
+import json
+import time
+import xmlrpc.client
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+LAUNCH_LOCK_NAME = "reportportal_launch"
+LAUNCH_UUID_KEY = "reportportal_launch_uuid"
+LAUNCH_WORKERS_KEY = "reportportal_launch_workers"
+LAUNCH_LAST_STARTED_KEY = "reportportal_launch_last_started"
+SUITE_KEY_PREFIX = "reportportal_suite:"
+OPEN_SUITES_KEY = "reportportal_open_suites"
+LOCK_POLL_INTERVAL = 0.05
+# Maximum time to wait for a lock, which is held at most for a single ReportPortal call
+LOCK_TIMEOUT = 120.0
+# Status of a suite shared by workers is the most severe status of its parts
+STATUS_SEVERITY = {"SKIPPED": 0, "PASSED": 1, "FAILED": 2}
+
+
+class PabotLibError(Exception):
+    """PabotLib server failed to run a keyword."""
+
+
+class PabotLib:
+    """Client of PabotLib remote server."""
+
+    caller_id: str
+    _proxy: xmlrpc.client.ServerProxy
+
+    def __init__(self, uri: str, caller_id: str) -> None:
+        """Initialize the remote server proxy.
+
+        :param uri:       PabotLib server URI as passed in PABOTLIBURI variable, e.g. "127.0.0.1:8270"
+        :param caller_id: ID of the current worker to hold locks with
+        """
+        self.caller_id = caller_id
+        self._proxy = xmlrpc.client.ServerProxy(uri if "://" in uri else f"http://{uri}", allow_none=True)
+
+    def run_keyword(self, name: str, *args: Any) -> Any:
+        """Run PabotLib keyword on the server.
+
+        :param name: Keyword name
+        :param args: Keyword arguments
+        :return:     Keyword return value
+        """
+        result = self._proxy.run_keyword(name, list(args), {})
+        if result.get("status") != "PASS":
+            raise PabotLibError(f"PabotLib keyword '{name}' failed: {result.get('error')}")
+        return result.get("return")
+
+    def acquire_lock(self, name: str, timeout: float = LOCK_TIMEOUT) -> None:
+        """Wait for the lock and acquire it.
+
+        :param name:    Lock name
+        :param timeout: Maximum time in seconds to wait for the lock
+        :raises PabotLibError: If the lock was not acquired within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while not self.run_keyword("acquire_lock", name, self.caller_id):
+            if time.monotonic() >= deadline:
+                raise PabotLibError(f"PabotLib lock '{name}' was not acquired within {timeout:g} seconds")
+            time.sleep(LOCK_POLL_INTERVAL)
+
+    def release_lock(self, name: str) -> None:
+        """Release the lock.
+
+        :param name: Lock name
+        """
+        self.run_keyword("release_lock", name, self.caller_id)
+
+    @contextmanager
+    def lock(self, name: str) -> Iterator[None]:
+        """Hold the lock within the context.
+
+        :param name: Lock name
+        """
+        self.acquire_lock(name)
+        try:
+            yield
+        finally:
+            self.release_lock(name)
+
+    def get_value(self, key: str) -> str:
+        """Get shared value, empty string if it was not set.
+
+        :param key: Value key
+        """
+        return self.run_keyword("get_parallel_value_for_key", key) or ""
+
+    def set_value(self, key: str, value: str) -> None:
+        """Set shared value.
+
+        :param key:   Value key
+        :param value: Value to set
+        """
+        self.run_keyword("set_parallel_value_for_key", key, value)
+
+
+class LaunchCoordinator:
+    """Share a single launch between pabot workers.
+
+    The first worker starts the launch while holding the lock, the others wait for the lock and report to the launch
+    started. If the start fails, the next worker starts the launch. The launch is finished by the last worker to
+    finish, once the last execution of pabot has started.
+    """
+
+    pabot_lib: PabotLib
+    is_last_execution: bool
+    is_creator: bool
+
+    def __init__(self, pabot_lib: PabotLib, is_last_execution: bool) -> None:
+        """Initialize coordinator attributes.
+
+        :param pabot_lib:         PabotLib server client
+        :param is_last_execution: Whether pabot had no more items to run when it started the current worker
+        """
+        self.pabot_lib = pabot_lib
+        self.is_last_execution = is_last_execution
+        self.is_creator = False
+
+    def _join(self) -> None:
+        workers = int(self.pabot_lib.get_value(LAUNCH_WORKERS_KEY) or "0")
+        self.pabot_lib.set_value(LAUNCH_WORKERS_KEY, str(workers + 1))
+        if self.is_last_execution:
+            self.pabot_lib.set_value(LAUNCH_LAST_STARTED_KEY, "1")
+
+    def get_launch(self, start_launch: Callable[[], Optional[str]]) -> Optional[str]:
+        """Get UUID of the launch started by another worker, or start it, and join the launch.
+
+        :param start_launch: Function which starts the launch and returns its UUID, called under the lock
+        :return:             Launch UUID or None if the launch was not started
+        """
+        with self.pabot_lib.lock(LAUNCH_LOCK_NAME):
+            launch_uuid = self.pabot_lib.get_value(LAUNCH_UUID_KEY)
+            if not launch_uuid:
+                launch_uuid = start_launch()
+                if not launch_uuid:
+                    return None
+                self.is_creator = True
+                self.pabot_lib.set_value(LAUNCH_UUID_KEY, launch_uuid)
+            self._join()
+            return launch_uuid
+
+    def leave(self) -> bool:
+        """Leave the launch.
+
+        :return: True if the current worker is the last one and should finish the launch
+        """
+        with self.pabot_lib.lock(LAUNCH_LOCK_NAME):
+            workers = int(self.pabot_lib.get_value(LAUNCH_WORKERS_KEY) or "1") - 1
+            self.pabot_lib.set_value(LAUNCH_WORKERS_KEY, str(workers))
+            return workers <= 0 and self.pabot_lib.get_value(LAUNCH_LAST_STARTED_KEY) == "1"
+
+
+class SuiteRegistry:
+    """Share suite items between pabot workers which run parts of the same suites, e.g. with '--testlevelsplit'.
+
+    A suite is started by the first worker which reports to it, the others get its UUID by the suite long name. Every
+    worker leaving the suite merges its end time and status into the shared ones. Once no worker reports to the suite
+    and the last execution of pabot has started, the suite is finished along with its descendants left open by the
+    workers which finished earlier.
+    """
+
+    pabot_lib: PabotLib
+
+    def __init__(self, pabot_lib: PabotLib) -> None:
+        """Initialize registry attributes.
+
+        :param pabot_lib: PabotLib server client
+        """
+        self.pabot_lib = pabot_lib
+
+    def _get_json(self, key: str, default: Any) -> Any:
+        value = self.pabot_lib.get_value(key)
+        return json.loads(value) if value else default
+
+    def _set_json(self, key: str, value: Any) -> None:
+        self.pabot_lib.set_value(key, json.dumps(value, separators=(",", ":")) if value is not None else "")
+
+    def start(self, longname: str, start_suite: Callable[[], Optional[str]]) -> Optional[str]:
+        """Get UUID of the suite started by another worker, or start it.
+
+        :param longname:    Robot Framework suite long name
+        :param start_suite: Function which starts the suite and returns its UUID
+        :return:            Suite UUID
+        """
+        key = SUITE_KEY_PREFIX + longname
+        with self.pabot_lib.lock(LAUNCH_LOCK_NAME):
+            entry = self._get_json(key, None)
+            if entry:
+                entry["workers"] += 1
+                self._set_json(key, entry)
+                return entry["uuid"]
+            item_uuid = start_suite()
+            if item_uuid:
+                self._set_json(key, {"uuid": item_uuid, "workers": 1, "end_time": None, "status": None})
+                self._set_json(OPEN_SUITES_KEY, self._get_json(OPEN_SUITES_KEY, []) + [longname])
+            return item_uuid
+
+    def finish(self, longname: str, end_time: str, status: str) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """Leave the suite and get the suites which should be finished by the current worker.
+
+        :param longname: Robot Framework suite long name
+        :param end_time: End time of the part of the suite run by the current worker
+        :param status:   Status of the part of the suite run by the current worker
+        :return:         UUID, end time and status tuples of the suites to finish, descendants first, or an empty
+                         list if other workers still report to the suite
+        """
+        key = SUITE_KEY_PREFIX + longname
+        with self.pabot_lib.lock(LAUNCH_LOCK_NAME):
+            entry = self._get_json(key, None)
+            if not entry:
+                return []
+            entry["workers"] -= 1
+            if entry["end_time"] is None or int(end_time) > int(entry["end_time"]):
+                entry["end_time"] = end_time
+            if entry["status"] is None or STATUS_SEVERITY.get(status, 0) > STATUS_SEVERITY.get(entry["status"], 0):
+                entry["status"] = status
+            self._set_json(key, entry)
+            if entry["workers"] > 0 or self.pabot_lib.get_value(LAUNCH_LAST_STARTED_KEY) != "1":
+                return []
+            # Descendants have no workers either, since their workers would report to the suite as well
+            return self._take_open_suites(lambda name: name == longname or name.startswith(longname + "."))
+
+    def finish_all(self) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        """Get all the suites left open, to be finished by the worker which finishes the launch.
+
+        :return: UUID, end time and status tuples of the suites to finish, descendants first. End time and status
+                 are None for the suites which no worker has left, e.g. because a worker crashed
+        """
+        with self.pabot_lib.lock(LAUNCH_LOCK_NAME):
+            return self._take_open_suites(lambda name: True)
+
+    def _take_open_suites(self, predicate: Callable[[str], bool]) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        open_suites = self._get_json(OPEN_SUITES_KEY, [])
+        to_finish = [name for name in open_suites if predicate(name)]
+        self._set_json(OPEN_SUITES_KEY, [name for name in open_suites if name not in to_finish])
+        suites = []
+        for name in sorted(to_finish, key=lambda n: n.count("."), reverse=True):
+            entry: Dict[str, Any] = self._get_json(SUITE_KEY_PREFIX + name, None)
+            self._set_json(SUITE_KEY_PREFIX + name, None)
+            suites.append((entry["uuid"], entry["end_time"], entry["status"]))
+        return suites
@@ -14,10 +14,12 @@
 
 """This module contains functions to ease reporting to ReportPortal."""
 
+import base64
 import binascii
 import fnmatch
 import re
-from typing import Iterable, Optional, Tuple
+import zlib
+from typing import Iterable, List, Optional, Tuple
 
 
 def translate_glob_to_regex(pattern: Optional[str]) -> Optional[re.Pattern]:
@@ -66,12 +68,59 @@ ROBOT_MARKUP_REPLACEMENT_PATTERS = [
 
 PATTERN_MATCHES_EMPTY_STRING: re.Pattern = re.compile("^$")
 
+DATA_URI_IMAGE_MARKER = "data:image/"
+DATA_URI_IMAGE_PATTERN = re.compile(
+    r"<img\s[^>]*?src=[\"']data:(image/[\w.+-]+);base64,([A-Za-z0-9+/=\s]+)[\"'][^>]*>"
+)
+HTML_TAG_PATTERN = re.compile(r"<[^>]*>")
+
 
 def robot_markup_to_markdown(text: str) -> str:
     """Convert Robot Framework's text markup to Markdown format."""
     return replace_patterns(text, ROBOT_MARKUP_REPLACEMENT_PATTERS)
 
 
+def extract_data_uri_images(html: str) -> Tuple[str, List[Tuple[str, bytes]]]:
+    """Extract all images embedded into HTML text as base64 data URIs and decode them.
+
+    :param html: HTML text to search in
+    :return: Tuple of the HTML text without the embedded images and the list of image mime type and decoded image
+             data tuples. Images which can't be decoded are left in the text
+    """
+    images = []
+    if DATA_URI_IMAGE_MARKER not in html:
+        return html, images
+
+    def extract(match: re.Match) -> str:
+        try:
+            data = base64.b64decode(match.group(2))
+        except (binascii.Error, ValueError):
+            return match.group(0)
+        images.append((match.group(1), data))
+        return ""
+
+    return DATA_URI_IMAGE_PATTERN.sub(extract, html), images
+
+
+def has_html_text(html: str) -> bool:
+    """Check if HTML has any visible text besides the markup.
+
+    :param html: HTML text to check
+    :return: True if there is any non-whitespace text outside the tags
+    """
+    return bool(HTML_TAG_PATTERN.sub("", html).strip())
+
+
+def is_sampled(key: str, rate: float) -> bool:
+    """Decide whether the key falls into the sample of the given rate, same keys give the same decision on every run.
+
+    :param key:  Key to decide by, e.g. test case ID
+    :param rate: Sample rate from 0.0 to 1.0
+    :return:     True if the key is in the sample
+    """
+    return zlib.crc32(key.encode("utf-8")) < rate * 2**32
+
+
 def _unescape(binary_string: str, stop_at: int = -1):
     result = bytearray()
     join_list = list()
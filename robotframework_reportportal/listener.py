@@ -17,16 +17,21 @@
 import logging
 import os
 import re
+import tempfile
 import uuid
 import warnings
+from concurrent.futures import Future
 from functools import wraps
-from mimetypes import guess_type
-from typing import Any, Dict, List, Optional, Union
+from mimetypes import guess_extension, guess_type
+from typing import IO, Any, Dict, List, Optional, Union
 from warnings import warn
 
 from reportportal_client.helpers import LifoQueue, guess_content_type_from_bytes, is_binary
+from robot.api.logger import console
 
-from robotframework_reportportal.helpers import _unescape
+from robotframework_reportportal.attachments import CompressionType, FileCompressor, ImageProcessor
+from robotframework_reportportal.budget import ListenerTimeBudget
+from robotframework_reportportal.helpers import _unescape, extract_data_uri_images, has_html_text, is_sampled
 from robotframework_reportportal.model import (
     Entity,
     Keyword,
@@ -36,10 +41,14 @@ from robotframework_reportportal.model import (
     KeywordTypeEqual,
     Launch,
     LogMessage,
+    SpilledLogMessage,
     Suite,
     Test,
 )
+from robotframework_reportportal.profiler import ListenerProfiler
+from robotframework_reportportal.recorder import EventRecorder
 from robotframework_reportportal.service import RobotService
+from robotframework_reportportal.sinks import NullClient
 from robotframework_reportportal.static import MAIN_SUITE_ID, PABOT_WITHOUT_LAUNCH_ID_MSG
 from robotframework_reportportal.variables import Variables
 
@@ -66,9 +75,21 @@ IMAGE_PATTERN = re.compile(
 )
 
 DEFAULT_BINARY_FILE_TYPE = "application/octet-stream"
+EMBEDDED_IMAGE_NAME = "embedded_image"
 TRUNCATION_SIGN = "...'"
 REMOVED_KEYWORD_CONTENT_LOG = "Content removed using the --remove-keywords option."
+REMOVED_KEYWORDS_CONTENT_LOG = "Content of {number} keywords removed using the --remove-keywords option."
+SAMPLED_OUT_CONTENT_LOG = "Content of {number} keywords not reported, since the passed test is outside of the sample."
+# Log levels, on which held back content of a test is posted
+KEEP_LOG_LEVELS = {"ERROR", "WARN"}
+SAMPLED_OUT_KEEP_LOG_LEVELS = {"ERROR", "WARN", "FAIL"}
+# Size of log messages and attachments of a test outside of the sample held in memory, the rest is spilled to disk
+SAMPLED_OUT_BUFFER_SIZE = 10 * 1024 * 1024
 FLATTENED_KEYWORD_CONTENT_LOG = "Content flattened."
+FOLDED_KEYWORD_START_LOG = "{indent}Keyword started: {name}"
+FOLDED_KEYWORD_END_LOG = "{indent}Keyword finished [{status}]{elapsed}: {name}"
+FOLDED_KEYWORD_LOG_INDENT = "    "
+FOLDED_KEYWORD_LOG_BATCH_SIZE = 100
 REMOVED_WUKS_KEYWORD_LOG = "{number} failing items removed using the --remove-keywords option."
 REMOVED_FOR_WHILE_KEYWORD_LOG = "{number} passing items removed using the --remove-keywords option."
 WUKS_KEYWORD_NAME = "BuiltIn.Wait Until Keyword Succeeds"
@@ -89,6 +110,19 @@ def check_rp_enabled(func):
         if args and isinstance(args[0], listener):
             if not args[0].service:
                 return
+            recorder = args[0]._recorder
+            if recorder:
+                recorder.record(func.__name__, args[1:], kwargs)
+            profiler = args[0]._profiler
+            budget = args[0]._budget
+            if budget:
+                call, call_args = (profiler.measure, (func.__name__, func, *args)) if profiler else (func, args)
+                # Wait for the last call, so everything is reported before Robot Framework exits
+                budget.call(func.__name__, call, call_args, kwargs, wait=func.__name__ == "close")
+                return
+            if profiler:
+                profiler.measure(func.__name__, func, *args, **kwargs)
+                return
         func(*args, **kwargs)
 
     return wrap
@@ -115,6 +149,17 @@ class listener:
     _items: LifoQueue[Union[Keyword, Launch, Suite, Test]]
     _service: Optional[RobotService]
     _variables: Optional[Variables]
+    _file_compressor: Optional[FileCompressor]
+    _image_processor: Optional[ImageProcessor]
+    _profiler: Optional[ListenerProfiler]
+    _recorder: Optional[EventRecorder]
+    _budget: Optional[ListenerTimeBudget]
+    _folded_keyword_log: List[str]
+    _folded_keyword_log_item_id: Optional[str]
+    _folded_keyword_log_time: Optional[str]
+    _sampled_out_test: Optional[Test]
+    _sampled_out_size: int
+    _sampled_out_spill: Optional[IO[bytes]]
     _remove_keyword_filters: List[KeywordMatch] = []
     _flatten_keyword_filters: List[KeywordMatch] = []
     _remove_all_keyword_content: bool = False
@@ -126,6 +171,31 @@ class listener:
         self._items = LifoQueue()
         self._service = None
         self._variables = None
+        self._file_compressor = None
+        self._image_processor = None
+        self._profiler = None
+        self._recorder = None
+        self._budget = None
+        self._folded_keyword_log = []
+        self._folded_keyword_log_item_id = None
+        self._folded_keyword_log_time = None
+        self._sampled_out_test = None
+        self._sampled_out_size = 0
+        self._sampled_out_spill = None
+
+    def _process_image(self, attachment: Dict[str, Any]) -> Union[Dict[str, Any], Future]:
+        """Schedule image attachment downscaling and re-encoding if it is configured.
+
+        :param attachment: Attachment dictionary with "name", "data" and "mime" keys
+        :return:           Future of the processed attachment or the original attachment
+        """
+        if not self.variables.image_max_size and not self.variables.image_format:
+            return attachment
+        if not self._image_processor:
+            self._image_processor = ImageProcessor(
+                self.variables.image_max_size, self.variables.image_format, self.variables.image_quality
+            )
+        return self._image_processor.submit(attachment)
 
     def _build_msg_struct(self, message: Dict[str, Any]) -> LogMessage:
         """Check if the given message comes from our custom logger or not.
@@ -179,9 +249,40 @@ class listener:
                             mime_type = DEFAULT_BINARY_FILE_TYPE
                         else:
                             mime_type = image_type_by_name or image_type_by_data or DEFAULT_BINARY_FILE_TYPE
-                        msg.attachment = {"name": os.path.basename(image_path), "data": image_data, "mime": mime_type}
+                        msg.attachment = self._process_image(
+                            {"name": os.path.basename(image_path), "data": image_data, "mime": mime_type}
+                        )
         return msg
 
+    def _split_embedded_images(self, msg: LogMessage) -> List[LogMessage]:
+        """Extract images embedded into HTML message as data URIs into attachments, one log entry per image.
+
+        The first image is attached to the message itself, which keeps the rest of its text. If there is no text
+        left, the message tells the image name, as the following entries do.
+
+        :param msg: Internal message object built from HTML message
+        :return:    List of messages to log
+        """
+        text, images = extract_data_uri_images(msg.message)
+        if not images:
+            return [msg]
+        messages = []
+        for i, (mime_type, image_data) in enumerate(images):
+            suffix = f"_{i + 1}" if i else ""
+            image_name = f"{EMBEDDED_IMAGE_NAME}{suffix}{guess_extension(mime_type) or ''}"
+            if i == 0:
+                image_msg = msg
+                msg.message = text if has_html_text(text) else f"Image attached: {image_name}"
+            else:
+                image_msg = LogMessage(f"Image attached: {image_name}")
+                image_msg.item_id = msg.item_id
+                image_msg.level = msg.level
+                image_msg.launch_log = msg.launch_log
+                image_msg.timestamp = msg.timestamp
+            image_msg.attachment = self._process_image({"name": image_name, "data": image_data, "mime": mime_type})
+            messages.append(image_msg)
+        return messages
+
     def _add_current_item(self, item: Union[Keyword, Launch, Suite, Test]) -> None:
         """Add the last item from the self._items queue."""
         self._items.put(item)
@@ -200,51 +301,75 @@ class listener:
 
         :param message: Internal message object to send
         """
+        self._flush_folded_keyword_log()
         self.service.log(message=message)
 
-    def __post_skipped_keyword(self, kwd: Keyword, clean_data_remove: bool) -> None:
-        self._do_start_keyword(kwd)
-        if clean_data_remove:
-            kwd.remove_data = False
-        for log_message in kwd.skipped_logs:
-            self.__post_log_message(log_message)
-        skipped_keywords = kwd.skipped_keywords
-        kwd.skipped_keywords = []
-        for skipped_kwd in skipped_keywords:
-            self.__post_skipped_keyword(skipped_kwd, clean_data_remove)
-        if kwd.status != "NOT SET":
-            self._do_end_keyword(kwd)
+    def _flush_folded_keyword_log(self) -> None:
+        """Send collected folded keyword lines as a single log message."""
+        if not self._folded_keyword_log:
+            return
+        msg = LogMessage("\n".join(self._folded_keyword_log))
+        msg.item_id = self._folded_keyword_log_item_id
+        msg.timestamp = self._folded_keyword_log_time
+        self._folded_keyword_log = []
+        self.service.log(message=msg)
+
+    def _log_folded_keyword(self, keyword: Keyword, line: str, timestamp: str) -> None:
+        """Add a line about folded keyword to the log of the nearest reported ancestor.
+
+        Lines are collected and sent in batches, the batch is sent earlier if any other log message or item finish
+        is going to be sent to keep the order.
+
+        :param keyword:   Folded keyword
+        :param line:      Line to log
+        :param timestamp: Line timestamp
+        """
+        if self._folded_keyword_log and self._folded_keyword_log_item_id != keyword.rp_item_id:
+            self._flush_folded_keyword_log()
+        if not self._folded_keyword_log:
+            self._folded_keyword_log_item_id = keyword.rp_item_id
+            self._folded_keyword_log_time = timestamp
+        self._folded_keyword_log.append(line)
+        if len(self._folded_keyword_log) >= FOLDED_KEYWORD_LOG_BATCH_SIZE:
+            self._flush_folded_keyword_log()
 
     def _post_skipped_keywords(self, to_post: Optional[Any], clean_data_remove: bool = False) -> None:
+        """Post keywords and log messages skipped because of the '--removekeywords' option.
+
+        The skipped tree is traversed with an explicit stack. Every posted keyword and log message is drained from the
+        buffers of its parent, so the buffers form a posted frontier: any following replay of the same subtree starts
+        from where the previous one stopped, and each skipped entity is posted only once.
+
+        :param to_post:           Root of the skipped tree, it's not finished here even if it was started
+        :param clean_data_remove: Stop removing data of the keywords posted by the call
+        """
         if not to_post:
             return
-        if isinstance(to_post, Keyword) and not to_post.posted:
-            self._do_start_keyword(to_post)
-            if clean_data_remove:
-                to_post.remove_data = False
-            log_messages = to_post.skipped_logs
-            to_post.skipped_logs = []
-            for log_message in log_messages:
-                self.__post_log_message(log_message)
-        skipped_keywords = to_post.skipped_keywords
-        if skipped_keywords:
-            to_post.skipped_keywords = []
-            for skipped_kwd in skipped_keywords:
-                if skipped_kwd.posted:
-                    log_messages = skipped_kwd.skipped_logs
-                    skipped_kwd.skipped_logs = []
-                    for log_message in log_messages:
-                        self.__post_log_message(log_message)
-                    skipped_child_keywords = skipped_kwd.skipped_keywords
-                    for skipped_child_kwd in skipped_child_keywords:
-                        if skipped_child_kwd.posted:
-                            continue
-                        self.__post_skipped_keyword(skipped_child_kwd, clean_data_remove)
-                    continue
-                self.__post_skipped_keyword(skipped_kwd, clean_data_remove)
+        stack = [(to_post, False)]
+        while stack:
+            item, finish = stack.pop()
+            if finish:
+                self._do_end_keyword(item)
+                continue
+            if isinstance(item, Keyword) and not item.posted:
+                self._do_start_keyword(item)
+                if clean_data_remove:
+                    item.remove_data = False
+                if item is not to_post and item.status != "NOT SET":
+                    stack.append((item, True))
+            if isinstance(item, (Keyword, Test)):
+                log_messages = item.skipped_logs
+                item.skipped_logs = []
+                for log_message in log_messages:
+                    if isinstance(log_message, SpilledLogMessage):
+                        log_message = log_message.load()
+                    self.__post_log_message(log_message)
+            skipped_keywords = item.skipped_keywords
+            item.skipped_keywords = []
+            stack.extend((skipped_kwd, False) for skipped_kwd in reversed(skipped_keywords))
 
     def __find_root_keyword_with_removed_data(self, keyword: Entity) -> Entity:
-        if keyword.parent.remove_data and keyword.parent.type == "KEYWORD":
+        if keyword.parent.remove_data and keyword.parent.type in ("KEYWORD", "TEST"):
             return self.__find_root_keyword_with_removed_data(keyword.parent)
         return keyword
 
@@ -262,21 +387,51 @@ class listener:
         if not getattr(current_item, "remove_data", False) and getattr(current_item, "posted", True):
             self.__post_log_message(message)
         else:
-            if message.level not in {"ERROR", "WARN"}:
-                self.current_item.skipped_logs.append(message)
+            keep_levels = SAMPLED_OUT_KEEP_LOG_LEVELS if self._sampled_out_test else KEEP_LOG_LEVELS
+            if message.level not in keep_levels:
+                if self._sampled_out_test:
+                    self.current_item.skipped_logs.append(self._hold_sampled_out_log(message))
+                else:
+                    self.current_item.skipped_logs.append(message)
             else:
                 if not self._remove_all_keyword_content:
                     # Post everything skipped by '--removekeywords' option
                     self._post_skipped_keywords(self.__find_root_keyword_with_removed_data(current_item), True)
                     self.__post_log_message(message)
 
+    def _hold_sampled_out_log(self, message: LogMessage) -> Union[LogMessage, SpilledLogMessage]:
+        """Hold back log message of a test outside of the sample until the test finishes.
+
+        Messages are kept in memory up to the buffer size, the rest is written to a temporary file.
+
+        :param message: Internal message object
+        :return:        The message or its reference in the temporary file
+        """
+        if isinstance(message.attachment, Future):
+            # The size of a processed image is known only once it's ready
+            message.attachment = message.attachment.result()
+        size = len(message.message)
+        if message.attachment:
+            size += len(message.attachment.get("data") or b"")
+        if self._sampled_out_size + size <= SAMPLED_OUT_BUFFER_SIZE:
+            self._sampled_out_size += size
+            return message
+        if self._sampled_out_spill is None:
+            self._sampled_out_spill = tempfile.TemporaryFile(prefix="reportportal_sampled_out_")
+        return SpilledLogMessage(message, self._sampled_out_spill)
+
     @check_rp_enabled
     def log_message(self, message: Dict) -> None:
         """Send log message to the Report Portal.
 
         :param message: Message passed by the Robot Framework
         """
+        self._start_pending_suites()
         msg = self._build_msg_struct(message)
+        if message.get("html", "no") == "yes" and not msg.attachment:
+            for embedded_msg in self._split_embedded_images(msg):
+                self._log_message(embedded_msg)
+            return
         self._log_message(msg)
 
     @check_rp_enabled
@@ -286,13 +441,16 @@ class listener:
         :param msg:   Message passed by the Robot Framework
         :param image: Path to image
         """
+        self._start_pending_suites()
         mes = self._build_msg_struct(msg)
         with open(image, "rb") as fh:
-            mes.attachment = {
-                "name": os.path.basename(image),
-                "data": fh.read(),
-                "mime": guess_type(image)[0] or DEFAULT_BINARY_FILE_TYPE,
-            }
+            mes.attachment = self._process_image(
+                {
+                    "name": os.path.basename(image),
+                    "data": fh.read(),
+                    "mime": guess_type(image)[0] or DEFAULT_BINARY_FILE_TYPE,
+                }
+            )
         self._log_message(mes)
 
     @property
@@ -308,6 +466,17 @@ class listener:
                 self.variables.enabled = False
                 self._service = None
                 raise e
+            if self.variables.profile or self.variables.profile_stats_file:
+                self._profiler = ListenerProfiler(bool(self.variables.profile_stats_file))
+            if self.variables.record_events:
+                self._recorder = EventRecorder(self.variables.record_events)
+            if self.variables.listener_time_budget:
+                # Robot Framework variables are not accessible from the background thread, so read them here
+                if self.variables.pabot_used:
+                    _ = self.variables.pabot_pool_id
+                self._budget = ListenerTimeBudget(
+                    self.variables.listener_time_budget, self.variables.listener_queue_size
+                )
         return self._service
 
     @property
@@ -374,7 +543,7 @@ class listener:
 
         launch = Launch(self.variables.launch_name, attributes, self.variables.launch_attributes)
         launch.doc = self.variables.launch_doc or launch.doc
-        if self.variables.pabot_used and not self._variables.launch_id:
+        if self.variables.pabot_used and not self._variables.launch_id and not self.service.coordinator:
             warn(PABOT_WITHOUT_LAUNCH_ID_MSG, stacklevel=2)
         logger.debug(f"ReportPortal - Start Launch: {launch.robot_attributes}")
         self.service.start_launch(
@@ -405,14 +574,30 @@ class listener:
         """
         if attributes["id"] == MAIN_SUITE_ID:
             self.start_launch(attributes, ts)
-            if self.variables.pabot_used:
+            # Workers sharing suites report to the same main suite, so it's not distinguished by the pool ID
+            if self.variables.pabot_used and not self.service.suite_registry:
                 name = f"{name}.{self.variables.pabot_pool_id}"
             logger.debug(f"ReportPortal - Create global Suite: {attributes}")
         else:
             logger.debug(f"ReportPortal - Start Suite: {attributes}")
         suite = Suite(name, attributes, self.current_item)
-        suite.rp_item_id = self.service.start_suite(suite=suite, ts=ts)
+        # Suites are reported lazily, on the first test, keyword or log message inside, to skip empty ones
+        suite.posted = False
         self._add_current_item(suite)
+        if not self.variables.skip_empty_suites:
+            self._start_pending_suites()
+
+    def _start_pending_suites(self) -> None:
+        """Report all not yet reported suites of the current item stack, from the top one to the bottom one."""
+        pending_suites = []
+        item = self.current_item
+        while item is not None and item.type == "SUITE" and not item.posted:
+            pending_suites.append(item)
+            item = item.parent
+        for suite in reversed(pending_suites):
+            # Mark the suite before the call, since messages logged by the client on failure come back here
+            suite.posted = True
+            suite.rp_item_id = self.service.start_suite(suite=suite)
 
     def _log_data_removed(self, item_id: str, timestamp: str, message: str) -> None:
         msg = LogMessage(message)
@@ -424,6 +609,29 @@ class listener:
     def _log_keyword_content_removed(self, item_id: str, timestamp: str) -> None:
         self._log_data_removed(item_id, timestamp, REMOVED_KEYWORD_CONTENT_LOG)
 
+    def _log_keywords_content_removed(self, item: Entity) -> None:
+        """Log a single notice about content removal of all child keywords of the given test or suite.
+
+        :param item: Test or suite which passed and hence had its keywords content removed
+        """
+        number = len(item.skipped_keywords)
+        if not number:
+            return
+        if item.remove_data:
+            # Only a test outside of the sample removes its own data, its nested keywords are counted too
+            number = 0
+            stack = list(item.skipped_keywords)
+            while stack:
+                number += 1
+                stack.extend(stack.pop().skipped_keywords)
+            message = SAMPLED_OUT_CONTENT_LOG.format(number=number)
+        elif number == 1:
+            message = REMOVED_KEYWORD_CONTENT_LOG
+        else:
+            message = REMOVED_KEYWORDS_CONTENT_LOG.format(number=number)
+        item.skipped_keywords = []
+        self._log_data_removed(item.rp_item_id, item.start_time, message)
+
     @check_rp_enabled
     def end_suite(self, _: Optional[str], attributes: Dict, ts: Optional[Any] = None) -> None:
         """Finish started test suite at the ReportPortal.
@@ -434,11 +642,16 @@ class listener:
         """
         suite = self._remove_current_item().update(attributes)
         logger.debug(f"ReportPortal - End Suite: {suite.robot_attributes}")
+        if not suite.posted:
+            # The suite had no content, so it was not reported
+            if attributes["id"] == MAIN_SUITE_ID:
+                self.finish_launch(attributes, ts)
+            return
         if attributes["status"] == "FAIL" and self._remove_data_passed_tests:
             self._post_skipped_keywords(suite)
         elif self._remove_data_passed_tests:
-            for kwd in suite.skipped_keywords:
-                self._log_keyword_content_removed(kwd.rp_item_id, kwd.start_time)
+            self._log_keywords_content_removed(suite)
+        self._flush_folded_keyword_log()
         self.service.finish_suite(suite=suite, ts=ts)
         if attributes["id"] == MAIN_SUITE_ID:
             self.finish_launch(attributes, ts)
@@ -455,7 +668,13 @@ class listener:
             # no 'source' parameter at this level for Robot versions < 4
             attributes = attributes.copy()
             attributes["source"] = getattr(self.current_item, "source", None)
+        self._start_pending_suites()
         test = Test(name, attributes, self.variables.test_attributes, self.current_item)
+        sample_rate = self.variables.passed_detail_sample_rate
+        if sample_rate is not None and not is_sampled(test.test_case_id, sample_rate):
+            # Keywords are posted only if the test fails, the same way as with '--remove-keywords PASSED' option
+            test.remove_data = True
+            self._sampled_out_test = test
         logger.debug(f"ReportPortal - Start Test: {attributes}")
         test.rp_item_id = self.service.start_test(test=test, ts=ts)
         self._add_current_item(test)
@@ -471,13 +690,20 @@ class listener:
         test = self.current_item.update(attributes)
         if not test.critical and test.status == "FAIL":
             test.status = "SKIP"
-        if attributes["status"] == "FAIL" and self._remove_data_passed_tests:
+        remove_data = self._remove_data_passed_tests or test.remove_data
+        if attributes["status"] == "FAIL" and remove_data:
             self._post_skipped_keywords(test)
-        elif self._remove_data_passed_tests:
-            for kwd in test.skipped_keywords:
-                self._log_keyword_content_removed(kwd.rp_item_id, kwd.start_time)
+        elif remove_data:
+            self._log_keywords_content_removed(test)
+        if test is self._sampled_out_test:
+            self._sampled_out_test = None
+            self._sampled_out_size = 0
+            if self._sampled_out_spill:
+                self._sampled_out_spill.close()
+                self._sampled_out_spill = None
         logger.debug(f"ReportPortal - End Test: {test.robot_attributes}")
         self._remove_current_item()
+        self._flush_folded_keyword_log()
         self.service.finish_test(test=test, ts=ts)
 
     def _do_start_keyword(self, keyword: Keyword, ts: Optional[str] = None) -> None:
@@ -499,6 +725,28 @@ class listener:
     def _log_keyword_content_flattened(self, item_id: str, timestamp: str) -> None:
         self._log_data_removed(item_id, timestamp, FLATTENED_KEYWORD_CONTENT_LOG)
 
+    def _should_fold(self, keyword: Keyword) -> bool:
+        if self.variables.keywords_as_logs:
+            return True
+        max_depth = self.variables.max_keyword_depth
+        return max_depth is not None and keyword.depth > max_depth
+
+    def _get_folded_keyword_indent(self, keyword: Keyword) -> str:
+        reported_depth = 0 if self.variables.keywords_as_logs else self.variables.max_keyword_depth
+        return FOLDED_KEYWORD_LOG_INDENT * (keyword.depth - reported_depth - 1)
+
+    def _fold_keyword(self, keyword: Keyword) -> None:
+        """Report the keyword as log lines of the nearest reported ancestor instead of a separate item.
+
+        :param keyword: Keyword to fold
+        """
+        keyword.rp_item_id = keyword.parent.rp_item_id
+        keyword.flattened = True
+        keyword.folded = True
+        indent = self._get_folded_keyword_indent(keyword)
+        line = FOLDED_KEYWORD_START_LOG.format(indent=indent, name=keyword.get_name())
+        self._log_folded_keyword(keyword, line, keyword.start_time)
+
     @check_rp_enabled
     def start_keyword(self, name: str, attributes: Dict, ts: Optional[Any] = None) -> None:
         """Start a new keyword(test step) at the ReportPortal.
@@ -507,8 +755,14 @@ class listener:
         :param attributes: Dictionary passed by the Robot Framework
         :param ts:         Timestamp(used by the ResultVisitor)
         """
+        self._start_pending_suites()
         parent = self.current_item
         kwd = Keyword(name, attributes, parent)
+        if self.variables.keywords_as_logs:
+            self._fold_keyword(kwd)
+            self._add_current_item(kwd)
+            return
+
         remove_kwd = parent.remove_data
         skip_data = self._remove_all_keyword_content or self._remove_data_passed_tests
         kwd.remove_data = remove_kwd or skip_data
@@ -528,9 +782,11 @@ class listener:
             parent.skipped_keywords.append(kwd)
             kwd.posted = False
         else:
-            if parent.flattened or self._should_flatten(parent):
+            if (parent.flattened and not parent.folded) or self._should_flatten(parent):
                 kwd.rp_item_id = parent.rp_item_id
                 kwd.flattened = True
+            elif self._should_fold(kwd):
+                self._fold_keyword(kwd)
             else:
                 self._do_start_keyword(kwd, ts)
                 if not kwd.flattened and self._should_flatten(kwd):
@@ -544,6 +800,7 @@ class listener:
 
     def _do_end_keyword(self, keyword: Keyword, ts: Optional[str] = None) -> None:
         logger.debug(f"ReportPortal - End Keyword: {keyword.robot_attributes}")
+        self._flush_folded_keyword_log()
         self.service.finish_keyword(keyword=keyword, ts=ts)
 
     @check_rp_enabled
@@ -595,10 +852,46 @@ class listener:
                 self._log_keyword_content_removed(kwd.rp_item_id, kwd.start_time)
 
         self._remove_current_item()
+        if kwd.folded:
+            elapsed = attributes.get("elapsedtime")
+            line = FOLDED_KEYWORD_END_LOG.format(
+                indent=self._get_folded_keyword_indent(kwd),
+                status=kwd.status,
+                elapsed=f" in {elapsed} ms" if elapsed is not None else "",
+                name=kwd.get_name(),
+            )
+            self._log_folded_keyword(kwd, line, kwd.end_time)
         if not kwd.posted or kwd.flattened:
             return
         self._do_end_keyword(kwd, ts)
 
+    def _attach_file(self, message: Dict[str, str], file_path: str) -> None:
+        """Attach file created by Robot Framework to RP launch, compressing it if configured.
+
+        :param message:   Message passed along with the file
+        :param file_path: Path to the file
+        """
+        compression = self.variables.attach_compression
+        if compression is CompressionType.NONE:
+            self.log_message_with_image(message, file_path)
+            return
+        if not self._file_compressor:
+            self._file_compressor = FileCompressor(compression, self.variables.log_batch_payload_limit)
+        self._file_compressor.submit(message, file_path)
+
+    def _post_compressed_files(self) -> None:
+        """Wait for the file compression and send compressed files to ReportPortal."""
+        if not self._file_compressor:
+            return
+        for message, file_path, attachment in self._file_compressor.complete():
+            if not attachment:
+                self.log_message_with_image(message, file_path)
+                continue
+            msg = self._build_msg_struct(message)
+            msg.attachment = attachment
+            self._log_message(msg)
+
+    @check_rp_enabled
     def log_file(self, log_path: str) -> None:
         """Attach HTML log file created by Robot Framework to RP launch.
 
@@ -606,8 +899,9 @@ class listener:
         """
         if self.variables.attach_log:
             message = {"message": "Execution log", "level": "INFO"}
-            self.log_message_with_image(message, log_path)
+            self._attach_file(message, log_path)
 
+    @check_rp_enabled
     def report_file(self, report_path: str) -> None:
         """Attach HTML report created by Robot Framework to RP launch.
 
@@ -615,8 +909,9 @@ class listener:
         """
         if self.variables.attach_report:
             message = {"message": "Execution report", "level": "INFO"}
-            self.log_message_with_image(message, report_path)
+            self._attach_file(message, report_path)
 
+    @check_rp_enabled
     def xunit_file(self, xunit_path: str) -> None:
         """Attach XUnit file created by Robot Framework to RP launch.
 
@@ -624,9 +919,42 @@ class listener:
         """
         if self.variables.attach_xunit:
             message = {"message": "XUnit result file", "level": "INFO"}
-            self.log_message_with_image(message, xunit_path)
+            self._attach_file(message, xunit_path)
+
+    def _report_metrics(self) -> None:
+        """Write ReportPortal calls metrics to the console and to the metrics file if it's configured."""
+        metrics = self.service.metrics
+        console(metrics.format_summary())
+        if self.variables.metrics_file:
+            try:
+                metrics.write(self.variables.metrics_file)
+            except OSError as e:
+                logger.warning(f"Unable to write metrics file {self.variables.metrics_file}: {e}")
+
+    def _report_profile(self) -> None:
+        """Write listener overhead table to the console and cProfile statistics to the file if it's configured."""
+        console(self._profiler.format_summary())
+        if self.variables.profile_stats_file:
+            try:
+                self._profiler.dump_stats(self.variables.profile_stats_file)
+            except OSError as e:
+                logger.warning(f"Unable to write profile statistics file {self.variables.profile_stats_file}: {e}")
 
     @check_rp_enabled
     def close(self) -> None:
         """Call service terminate when the whole test execution is done."""
+        self._post_compressed_files()
         self.service.terminate_service()
+        if self._image_processor:
+            self._image_processor.shutdown()
+        if self.service.metrics:
+            self._report_metrics()
+        if isinstance(self.service.rp, NullClient):
+            console(self.service.rp.format_summary())
+        if self._profiler:
+            self._report_profile()
+        if self._recorder:
+            self._recorder.close()
+        if self._budget:
+            console(self._budget.format_summary())
+            self._budget.shutdown()
@@ -0,0 +1,223 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains performance metrics of the ReportPortal calls made by the agent."""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+from robotframework_reportportal.batching import AdaptiveLogBatcher
+
+# Upper bounds of latency histogram buckets in milliseconds, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+SUMMARY_HEADER = "ReportPortal calls:"
+SUMMARY_ROW = "{method:<16} {count:>8} {errors:>7} {total:>11} {mean:>9} {p95:>9} {max:>9} {size:>12}"
+
+
+def get_payload_size(request: Dict[str, Any]) -> int:
+    """Estimate payload size of the request by the size of its string and attachment values.
+
+    :param request: Keyword arguments of the client call
+    :return:        Size estimation in bytes
+    """
+    size = 0
+    for value in request.values():
+        if isinstance(value, str):
+            size += len(value)
+        elif isinstance(value, dict):
+            data = value.get("data")
+            if isinstance(data, (bytes, str)):
+                size += len(data)
+    return size
+
+
+class CallMetrics:
+    """Statistics of calls of a single client method."""
+
+    count: int
+    errors: int
+    total_time: float
+    max_time: float
+    payload_size: int
+    histogram: List[int]
+
+    def __init__(self) -> None:
+        """Initialize statistics attributes."""
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.payload_size = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, duration: float, payload_size: int, error: bool) -> None:
+        """Record a single call.
+
+        :param duration:     Call duration in seconds
+        :param payload_size: Request payload size in bytes
+        :param error:        Whether the call raised an error
+        """
+        self.count += 1
+        if error:
+            self.errors += 1
+        self.total_time += duration
+        if duration > self.max_time:
+            self.max_time = duration
+        self.payload_size += payload_size
+        self.histogram[bisect_left(LATENCY_BUCKETS_MS, duration * 1000)] += 1
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Estimate latency percentile by the histogram.
+
+        :param percent: Percentile to estimate, from 0 to 100
+        :return:        Upper bound of the bucket the percentile falls into in milliseconds
+        """
+        if not self.count:
+            return None
+        threshold = self.count * percent / 100
+        passed = 0
+        for i, number in enumerate(self.histogram):
+            passed += number
+            if passed >= threshold:
+                break
+        if i < len(LATENCY_BUCKETS_MS):
+            return float(min(LATENCY_BUCKETS_MS[i], self.max_time * 1000))
+        return self.max_time * 1000
+
+    def to_dict(self, duration: float) -> Dict[str, Any]:
+        """Convert statistics to a dictionary.
+
+        :param duration: Duration of the whole run in seconds to calculate throughput
+        :return:         Dictionary with the statistics
+        """
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "total_ms": round(self.total_time * 1000, 3),
+            "mean_ms": round(self.total_time * 1000 / self.count, 3) if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": round(self.max_time * 1000, 3),
+            "payload_bytes": self.payload_size,
+            "calls_per_second": round(self.count / duration, 3) if duration else None,
+            "histogram": {
+                **{f"<={bound}ms": number for bound, number in zip(LATENCY_BUCKETS_MS, self.histogram)},
+                f">{LATENCY_BUCKETS_MS[-1]}ms": self.histogram[-1],
+            },
+        }
+
+
+class ServiceMetrics:
+    """Per-method statistics of the ReportPortal client calls."""
+
+    calls: Dict[str, CallMetrics]
+    start_time: float
+    log_batcher: Optional[AdaptiveLogBatcher]
+    _lock: threading.Lock
+
+    def __init__(self) -> None:
+        """Initialize metrics attributes."""
+        self.calls = {}
+        self.start_time = time.perf_counter()
+        self.log_batcher = None
+        self._lock = threading.Lock()
+
+    def record(self, method: str, duration: float, payload_size: int = 0, error: bool = False) -> None:
+        """Record a single client call.
+
+        :param method:       Name of the reported method, e.g. "start_test" or "log"
+        :param duration:     Call duration in seconds
+        :param payload_size: Request payload size in bytes
+        :param error:        Whether the call raised an error
+        """
+        with self._lock:
+            call = self.calls.get(method)
+            if call is None:
+                call = self.calls[method] = CallMetrics()
+            call.record(duration, payload_size, error)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert metrics to a dictionary.
+
+        :return: Dictionary with run duration, totals, per-method statistics and adaptive log batching state
+        """
+        duration = time.perf_counter() - self.start_time
+        calls = list(self.calls.values())
+        result = {
+            "duration_ms": round(duration * 1000, 3),
+            "count": sum(c.count for c in calls),
+            "errors": sum(c.errors for c in calls),
+            "total_ms": round(sum(c.total_time for c in calls) * 1000, 3),
+            "payload_bytes": sum(c.payload_size for c in calls),
+            "methods": {method: call.to_dict(duration) for method, call in sorted(self.calls.items())},
+        }
+        if self.log_batcher:
+            result["log_batching"] = self.log_batcher.to_dict()
+        return result
+
+    def write(self, file_path: str) -> None:
+        """Write metrics to a JSON file.
+
+        :param file_path: Path to the file
+        """
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def format_summary(self) -> str:
+        """Format metrics as a text table suitable for the console.
+
+        :return: Table with per-method statistics
+        """
+        metrics = self.to_dict()
+        lines = [
+            SUMMARY_HEADER,
+            SUMMARY_ROW.format(
+                method="method",
+                count="calls",
+                errors="errors",
+                total="total ms",
+                mean="mean ms",
+                p95="p95 ms",
+                max="max ms",
+                size="bytes",
+            ),
+        ]
+        for method, call in metrics["methods"].items():
+            lines.append(
+                SUMMARY_ROW.format(
+                    method=method,
+                    count=call["count"],
+                    errors=call["errors"],
+                    total=f"{call['total_ms']:.1f}",
+                    mean=f"{call['mean_ms']:.1f}",
+                    p95=f"{call['p95_ms']:.1f}",
+                    max=f"{call['max_ms']:.1f}",
+                    size=call["payload_bytes"],
+                )
+            )
+        lines.append(
+            f"Total: {metrics['count']} calls, {metrics['errors']} errors, {metrics['total_ms']:.1f} ms spent in the"
+            f" client out of {metrics['duration_ms']:.1f} ms of the run"
+        )
+        batching = metrics.get("log_batching")
+        if batching:
+            lines.append(
+                f"Log batching: {batching['entry_num']} entries per batch ({batching['min_entry_num']}-"
+                f"{batching['max_entry_num']}), {batching['batches']} batches of {batching['mean_batch_entries']}"
+                f" entries and {batching['mean_batch_bytes']} bytes on average, {batching['adjustments']} adjustments"
+            )
+        return "\n".join(lines)
@@ -14,10 +14,13 @@
 
 """This module contains models representing Robot Framework test items."""
 
+import base64
+import json
 import os
 import re
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, List, Optional, Union
+from concurrent.futures import Future
+from typing import IO, Any, Callable, Dict, List, Optional, Union
 
 from reportportal_client.helpers import gen_attributes
 
@@ -32,6 +35,7 @@ class Entity:
     type: str
     remove_data: bool
     flattened: bool
+    folded: bool
     remove_filter: Optional[Any]
     remove_origin: Optional[Any]
     rp_item_id: Optional[str]
@@ -50,6 +54,7 @@ class Entity:
         self.rp_item_id = None
         self.remove_data = False
         self.flattened = False
+        self.folded = False
         self.remove_filter = None
         self.remove_origin = None
         self.skipped_keywords = []
@@ -64,7 +69,7 @@ class Entity:
 class LogMessage(str):
     """Class represents Robot Framework messages."""
 
-    attachment: Optional[Dict[str, str]]
+    attachment: Optional[Union[Dict[str, Any], Future]]
     launch_log: bool
     item_id: Optional[str]
     level: str
@@ -81,12 +86,64 @@ class LogMessage(str):
         self.timestamp = None
 
 
+class SpilledLogMessage:
+    """Class represents log message written to a temporary file, so it's not held in memory until it's posted."""
+
+    file: IO[bytes]
+    offset: int
+    size: int
+
+    def __init__(self, message: LogMessage, file: IO[bytes]):
+        """Write the message to the end of the file, encoding attachment data with Base64.
+
+        :param message: Message to write, its attachment should not be a Future
+        :param file:    Binary temporary file to write the message to
+        """
+        attachment = message.attachment
+        if attachment:
+            data = attachment.get("data")
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            attachment = {**attachment, "data": base64.b64encode(data or b"").decode("ascii")}
+        record = {
+            "message": message.message,
+            "level": message.level,
+            "item_id": message.item_id,
+            "launch_log": message.launch_log,
+            "timestamp": message.timestamp,
+            "attachment": attachment,
+        }
+        line = json.dumps(record, separators=(",", ":"), default=str).encode("utf-8")
+        file.seek(0, os.SEEK_END)
+        self.file = file
+        self.offset = file.tell()
+        self.size = len(line)
+        file.write(line)
+
+    def load(self) -> LogMessage:
+        """Read the message back from the file.
+
+        :return: Internal message object
+        """
+        self.file.seek(self.offset)
+        record = json.loads(self.file.read(self.size))
+        message = LogMessage(record["message"])
+        message.level = record["level"]
+        message.item_id = record["item_id"]
+        message.launch_log = record["launch_log"]
+        message.timestamp = record["timestamp"]
+        if record["attachment"]:
+            message.attachment = {**record["attachment"], "data": base64.b64decode(record["attachment"]["data"])}
+        return message
+
+
 class Keyword(Entity):
     """Class represents Robot Framework keyword."""
 
     robot_attributes: Dict[str, Any]
     args: List[str]
     assign: List[str]
+    depth: int
     doc: str
     end_time: str
     keyword_name: str
@@ -97,7 +154,7 @@ class Keyword(Entity):
     status: str
     tags: List[str]
     type: str = "KEYWORD"
-    skipped_logs: List[LogMessage]
+    skipped_logs: List[Union[LogMessage, SpilledLogMessage]]
 
     def __init__(self, name: str, robot_attributes: Dict[str, Any], parent: Entity):
         """Initialize required attributes.
@@ -110,6 +167,7 @@ class Keyword(Entity):
         self.robot_attributes = robot_attributes
         self.args = robot_attributes["args"]
         self.assign = robot_attributes["assign"]
+        self.depth = parent.depth + 1 if isinstance(parent, Keyword) else 1
         self.doc = robot_markup_to_markdown(robot_attributes["doc"])
         self.end_time = robot_attributes.get("endtime")
         self.keyword_name = robot_attributes["kwname"]
@@ -257,6 +315,7 @@ class Test(Entity):
     start_time: str
     status: str
     template: str
+    skipped_logs: List[Union[LogMessage, SpilledLogMessage]]
 
     def __init__(self, name: str, robot_attributes: Dict[str, Any], test_attributes: List[str], parent: Entity):
         """Initialize required attributes.
@@ -280,6 +339,7 @@ class Test(Entity):
         self.start_time = robot_attributes["starttime"]
         self.status = robot_attributes.get("status")
         self.template = robot_attributes["template"]
+        self.skipped_logs = []
 
     @property
     def critical(self) -> bool:
@@ -0,0 +1,127 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains profiler of the time the agent spends in the listener calls."""
+
+import cProfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+SUMMARY_HEADER = "ReportPortal listener overhead:"
+SUMMARY_ROW = "{event:<24} {count:>8} {wall:>11} {cpu:>11} {mean:>10} {share:>7}"
+
+
+class EventStatistics:
+    """Time statistics of a single listener event type."""
+
+    count: int
+    wall_time: float
+    cpu_time: float
+
+    def __init__(self) -> None:
+        """Initialize statistics attributes."""
+        self.count = 0
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+
+class ListenerProfiler:
+    """Measure wall and CPU time of the listener calls, optionally profiling them with cProfile.
+
+    Only the outermost listener call is measured, so nested calls are attributed to the calling event.
+    """
+
+    events: Dict[str, EventStatistics]
+    start_time: float
+    _profile: Optional[cProfile.Profile]
+    _depth: int
+
+    def __init__(self, use_cprofile: bool = False) -> None:
+        """Initialize profiler attributes.
+
+        :param use_cprofile: Run cProfile inside the listener calls
+        """
+        self.events = {}
+        self.start_time = time.perf_counter()
+        self._profile = cProfile.Profile() if use_cprofile else None
+        self._depth = 0
+
+    def measure(self, event: str, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Call the given listener method and record its time under the given event type.
+
+        :param event: Event type name, usually the method name
+        :param func:  Method to call
+        :return:      Result of the call
+        """
+        if self._depth:
+            return func(*args, **kwargs)
+        self._depth += 1
+        profile = self._profile
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        if profile:
+            profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if profile:
+                profile.disable()
+            cpu_time = time.thread_time() - cpu_start
+            wall_time = time.perf_counter() - wall_start
+            self._depth -= 1
+            statistics = self.events.get(event)
+            if statistics is None:
+                statistics = self.events[event] = EventStatistics()
+            statistics.count += 1
+            statistics.wall_time += wall_time
+            statistics.cpu_time += cpu_time
+
+    def dump_stats(self, file_path: str) -> None:
+        """Write cProfile statistics to a file readable by the pstats module.
+
+        :param file_path: Path to the file
+        """
+        if self._profile:
+            self._profile.dump_stats(file_path)
+
+    def format_summary(self) -> str:
+        """Format per-event-type agent time as a text table suitable for the console.
+
+        :return: Table with call count, wall and CPU time per event type, and agent to run time totals
+        """
+        run_time = time.perf_counter() - self.start_time
+        lines: List[str] = [
+            SUMMARY_HEADER,
+            SUMMARY_ROW.format(
+                event="event", count="calls", wall="wall ms", cpu="cpu ms", mean="mean us", share="% run"
+            ),
+        ]
+        for event, statistics in sorted(self.events.items(), key=lambda e: e[1].wall_time, reverse=True):
+            lines.append(
+                SUMMARY_ROW.format(
+                    event=event,
+                    count=statistics.count,
+                    wall=f"{statistics.wall_time * 1000:.1f}",
+                    cpu=f"{statistics.cpu_time * 1000:.1f}",
+                    mean=f"{statistics.wall_time * 1e6 / statistics.count:.1f}",
+                    share=f"{statistics.wall_time * 100 / run_time:.2f}" if run_time else "",
+                )
+            )
+        agent_time = sum(s.wall_time for s in self.events.values())
+        agent_cpu_time = sum(s.cpu_time for s in self.events.values())
+        lines.append(
+            f"Total: {agent_time * 1000:.1f} ms in the agent ({agent_cpu_time * 1000:.1f} ms CPU),"
+            f" {(run_time - agent_time) * 1000:.1f} ms outside of the agent, {run_time * 1000:.1f} ms overall"
+        )
+        return "\n".join(lines)
@@ -0,0 +1,121 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains recorder of the listener events to a tape file and the tape reader.
+
+The tape is a JSON lines file. The first line is a header with the tape version, every following line is a listener
+call with its name, time offset from the start of the recording in seconds, positional and keyword arguments.
+"""
+
+import base64
+import json
+import time
+from typing import IO, Any, Dict, Iterator, List, Tuple
+
+from robotframework_reportportal.model import LogMessage
+
+TAPE_VERSION = 1
+BYTES_KEY = "__bytes__"
+LOG_MESSAGE_KEY = "__log_message__"
+
+
+def encode_value(value: Any) -> Any:
+    """Convert listener call argument to a JSON-serializable value.
+
+    :param value: Argument value
+    :return:      JSON-serializable value
+    """
+    if isinstance(value, LogMessage):
+        return {
+            LOG_MESSAGE_KEY: {
+                "message": value.message,
+                "level": value.level,
+                "attachment": encode_value(value.attachment),
+                "launch_log": value.launch_log,
+            }
+        }
+    if isinstance(value, dict):
+        return {key: encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if isinstance(value, bytes):
+        return {BYTES_KEY: base64.b64encode(value).decode("ascii")}
+    return value
+
+
+def _decode_object(value: Dict[str, Any]) -> Any:
+    if BYTES_KEY in value:
+        return base64.b64decode(value[BYTES_KEY])
+    if LOG_MESSAGE_KEY in value:
+        fields = value[LOG_MESSAGE_KEY]
+        message = LogMessage(fields["message"])
+        message.level = fields["level"]
+        message.attachment = fields["attachment"]
+        message.launch_log = fields["launch_log"]
+        return message
+    return value
+
+
+class EventRecorder:
+    """Write listener calls to a tape file."""
+
+    file_path: str
+    _file: IO[str]
+    _start_time: float
+
+    def __init__(self, file_path: str) -> None:
+        """Open the tape file and write its header.
+
+        :param file_path: Path to the tape file
+        """
+        self.file_path = file_path
+        self._file = open(file_path, "w", encoding="utf-8")
+        self._start_time = time.perf_counter()
+        self._file.write(json.dumps({"version": TAPE_VERSION}) + "\n")
+
+    def record(self, event: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        """Write a listener call to the tape.
+
+        :param event:  Name of the listener method
+        :param args:   Positional arguments of the call
+        :param kwargs: Keyword arguments of the call
+        """
+        line = {
+            "event": event,
+            "time": round(time.perf_counter() - self._start_time, 6),
+            "args": encode_value(args),
+            "kwargs": encode_value(kwargs),
+        }
+        self._file.write(json.dumps(line, separators=(",", ":"), default=str) + "\n")
+
+    def close(self) -> None:
+        """Flush and close the tape file."""
+        self._file.close()
+
+
+def read_events(file_path: str) -> Iterator[Tuple[str, float, List[Any], Dict[str, Any]]]:
+    """Read listener calls from the tape file.
+
+    :param file_path: Path to the tape file
+    :return:          Iterator over listener method name, time offset, positional and keyword arguments tuples
+    """
+    with open(file_path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != TAPE_VERSION:
+            raise ValueError(f"Unsupported event tape version: {header.get('version')}")
+        for line in f:
+            if not line.strip():
+                continue
+            event = json.loads(line, object_hook=_decode_object)
+            yield event["event"], event["time"], event["args"], event["kwargs"]
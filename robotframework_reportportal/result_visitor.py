@@ -28,6 +28,7 @@ from urllib.parse import unquote
 from robot.result import Keyword, Message, Result, ResultVisitor, TestCase, TestSuite
 
 from robotframework_reportportal import listener
+from robotframework_reportportal.helpers import DATA_URI_IMAGE_MARKER
 from robotframework_reportportal.time_visitor import corrections
 
 # noinspection PyUnresolvedReferences
@@ -191,6 +192,11 @@ class RobotResultsVisitor(ResultVisitor):
                 "message": msg.message,
                 "level": msg.level,
             }
+            if msg.html and DATA_URI_IMAGE_MARKER in msg.message:
+                # Embedded images are decoded by the listener itself
+                message["html"] = "yes"
+                listener.log_message(message)
+                return True
             try:
                 m = self.split_message_and_image(message["message"])
                 message["message"] = m[0]
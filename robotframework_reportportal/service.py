@@ -15,25 +15,81 @@
 """This module is a Robot service for reporting results to ReportPortal."""
 
 import logging
-from typing import Optional
+import socket
+import threading
+import time
+import uuid
+import xmlrpc.client
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple, Union
 
 from dateutil.parser import parse
-from reportportal_client import RP, create_client
+from reportportal_client import RP, ClientType, RPClient, create_client
 from reportportal_client.helpers import dict_to_payload, get_launch_sys_attrs, get_package_version, timestamp
 
+from robotframework_reportportal.backpressure import (
+    SHED_LEVELS,
+    SHED_LOGS_ATTRIBUTE_KEY,
+    SHED_LOGS_SUMMARY,
+    SPILLED_LOGS_SUMMARY,
+    LogSpill,
+    QueuePolicy,
+)
+from robotframework_reportportal.batching import AdaptiveLogBatcher, is_adaptive_batching_supported
+from robotframework_reportportal.breaker import CircuitBreaker
+from robotframework_reportportal.coordination import LaunchCoordinator, PabotLib, PabotLibError, SuiteRegistry
+from robotframework_reportportal.metrics import ServiceMetrics, get_payload_size
 from robotframework_reportportal.model import Keyword, Launch, LogMessage, Suite, Test
+from robotframework_reportportal.sinks import NullClient, SinkType, SpoolClient, read_spool
 from robotframework_reportportal.static import LOG_LEVEL_MAPPING, STATUS_MAPPING
+from robotframework_reportportal.token_cache import (
+    CachedOAuthPasswordGrant,
+    TokenCache,
+    create_session,
+    get_cache_path,
+    is_token_cache_supported,
+)
 from robotframework_reportportal.variables import Variables
 
+if TYPE_CHECKING:
+    from robotframework_reportportal.aggregator import AggregatorClient
+
 logger = logging.getLogger(__name__)
 
 TOP_LEVEL_ITEMS = {"BEFORE_SUITE", "AFTER_SUITE"}
+# Client methods to call on the journal by names of the calls
+JOURNAL_METHODS = {
+    "start_launch": "start_launch",
+    "finish_launch": "finish_launch",
+    "start_suite": "start_test_item",
+    "finish_suite": "finish_test_item",
+    "start_test": "start_test_item",
+    "finish_test": "finish_test_item",
+    "start_keyword": "start_test_item",
+    "finish_keyword": "finish_test_item",
+    "log": "log",
+    "attachment": "log",
+}
+# Calls which return None if the request failed
+CHECKED_METHODS = {
+    "start_launch",
+    "start_suite",
+    "start_test",
+    "start_keyword",
+    "finish_suite",
+    "finish_test",
+    "finish_keyword",
+}
 
 
 def to_epoch(date: Optional[str]) -> Optional[str]:
     """Convert Robot Framework timestamp to UTC timestamp."""
     if not date:
         return None
+    if date.isdigit():
+        # Already a timestamp, e.g. passed by the result visitor
+        return date
     try:
         parsed_date = parse(date)
     except ValueError:
@@ -50,8 +106,34 @@ class RobotService:
 
     agent_name: str
     agent_version: str
-    rp: Optional[RP]
+    rp: Optional[Union[RP, SpoolClient, NullClient, "AggregatorClient"]]
     debug: bool
+    metrics: Optional[ServiceMetrics]
+    log_batcher: Optional[AdaptiveLogBatcher]
+    _observe_log_latency: bool
+    log_buffering: bool
+    log_buffer_max_count: int
+    log_buffer_max_size: int
+    _pending_logs: Deque[Dict[str, Any]]
+    _log_buffer: List[Dict[str, Any]]
+    _log_buffer_size: int
+    _log_lane: Optional[ThreadPoolExecutor]
+    _log_lane_tasks: Deque[Future]
+    _log_lane_item_tasks: Dict[str, Future]
+    log_queue_size: int
+    log_queue_policy: QueuePolicy
+    shed_logs: Dict[str, int]
+    _test_shed_logs: int
+    _log_spill: Optional[LogSpill]
+    breaker: Optional[CircuitBreaker]
+    journal: Optional[SpoolClient]
+    journal_file: Optional[str]
+    _journal_replayed: int
+    _recovering: bool
+    _breaker_lock: threading.RLock
+    coordinator: Optional[LaunchCoordinator]
+    suite_registry: Optional[SuiteRegistry]
+    _pabot_client_args: Optional[Tuple[Variables, Dict[str, Any]]]
 
     def __init__(self) -> None:
         """Initialize service attributes."""
@@ -59,6 +141,32 @@ class RobotService:
         self.agent_version = get_package_version(self.agent_name)
         self.rp = None
         self.debug = False
+        self.metrics = None
+        self.log_batcher = None
+        self._observe_log_latency = False
+        self.log_buffering = False
+        self.log_buffer_max_count = 0
+        self.log_buffer_max_size = 0
+        self._pending_logs = deque()
+        self._log_buffer = []
+        self._log_buffer_size = 0
+        self._log_lane = None
+        self._log_lane_tasks = deque()
+        self._log_lane_item_tasks = {}
+        self.log_queue_size = 0
+        self.log_queue_policy = QueuePolicy.BLOCK
+        self.shed_logs = {}
+        self._test_shed_logs = 0
+        self._log_spill = None
+        self.breaker = None
+        self.journal = None
+        self.journal_file = None
+        self._journal_replayed = 0
+        self._recovering = False
+        self._breaker_lock = threading.RLock()
+        self.coordinator = None
+        self.suite_registry = None
+        self._pabot_client_args = None
 
     def _get_launch_attributes(self, cmd_attrs: list) -> list:
         """Generate launch attributes including both system and user ones.
@@ -77,35 +185,387 @@ class RobotService:
         """
         if self.rp is None:
             self.debug = variables.debug_mode
+            if variables.metrics or variables.metrics_file:
+                self.metrics = ServiceMetrics()
+            self.log_buffering = variables.log_buffer
+            self.log_buffer_max_count = variables.log_buffer_max_count
+            self.log_buffer_max_size = variables.log_buffer_max_size
+            if variables.sink_type is SinkType.SPOOL:
+                logger.info(f"ReportPortal - Init service: spool file={variables.spool_file}")
+                self.rp = SpoolClient(variables.spool_file)
+                return
+            if variables.sink_type is SinkType.NULL:
+                logger.debug("ReportPortal - Init service: NULL sink")
+                self.rp = NullClient()
+                return
+            client_config = {
+                "endpoint": variables.endpoint,
+                "project": variables.project,
+                "api_key": variables.api_key,
+                "is_skipped_an_issue": variables.skipped_issue,
+                "log_batch_size": variables.log_batch_size,
+                "retries": 5,
+                "verify_ssl": variables.verify_ssl,
+                "max_pool_size": variables.pool_size,
+                "log_batch_payload_limit": variables.log_batch_payload_limit,
+                "launch_uuid": variables.launch_id,
+                "http_timeout": variables.http_timeout,
+                "oauth_uri": variables.oauth_uri,
+                "oauth_username": variables.oauth_username,
+                "oauth_password": variables.oauth_password,
+                "oauth_client_id": variables.oauth_client_id,
+                "oauth_client_secret": variables.oauth_client_secret,
+                "oauth_scope": variables.oauth_scope,
+            }
+            if variables.sink_type is SinkType.AGGREGATOR and not hasattr(socket, "AF_UNIX"):
+                logger.warning(
+                    "ReportPortal aggregator sink requires Unix domain sockets, which are not supported on this "
+                    "platform, reporting to ReportPortal directly."
+                )
+            elif variables.sink_type is SinkType.AGGREGATOR:
+                self._init_aggregator_client(variables, client_config)
+                return
             logger.debug(f"ReportPortal - Init service: endpoint={variables.endpoint}, project={variables.project}")
+            if variables.circuit_breaker:
+                self.breaker = CircuitBreaker(
+                    variables.circuit_breaker_failures,
+                    variables.circuit_breaker_latency,
+                    variables.circuit_breaker_recovery_interval,
+                )
+                self.journal_file = variables.circuit_breaker_journal
+                logger.info(f"ReportPortal - Init service: circuit breaker journal file={self.journal_file}")
+            if variables.log_lane_workers > 1:
+                logger.warning(
+                    "Log lane uses one worker thread to keep the order of log messages, "
+                    f"'RP_LOG_LANE_WORKERS' value {variables.log_lane_workers} is ignored."
+                )
+            if variables.log_lane_workers > 0:
+                # A single thread sends log messages in the order they were handed over
+                self._log_lane = ThreadPoolExecutor(1, thread_name_prefix="rp-log-lane")
+                self.log_queue_size = variables.log_queue_size
+                self.log_queue_policy = variables.log_queue_policy
+                if self.log_queue_policy is QueuePolicy.SPILL:
+                    self._log_spill = LogSpill(variables.log_spill_file)
+            elif variables.log_queue_policy is not QueuePolicy.BLOCK:
+                logger.warning(
+                    "'RP_LOG_QUEUE_POLICY' only applies to the log lane queue, set 'RP_LOG_LANE_WORKERS' to enable it."
+                )
+            if variables.log_batch_adaptive and not is_adaptive_batching_supported():
+                logger.warning(
+                    "Adaptive log batching is not supported by the installed version of ReportPortal client, "
+                    "the default log batching is used."
+                )
+            elif variables.log_batch_adaptive:
+                self.log_batcher = AdaptiveLogBatcher(
+                    variables.log_batch_size,
+                    variables.log_batch_max_size,
+                    variables.log_batch_payload_limit,
+                    variables.log_batch_time_budget,
+                    variables.log_batch_latency_threshold,
+                )
+                # Only the synchronous client sends batches within the log call, others do it in background
+                self._observe_log_latency = variables.client_type is ClientType.SYNC
+                if self.metrics:
+                    self.metrics.log_batcher = self.log_batcher
+            if variables.pabot_launch_coordination and variables.pabot_used and not variables.launch_id:
+                self._init_pabot_coordination(variables, client_config)
+            self._create_client(variables, client_config)
+
+    def _create_client(self, variables: Variables, client_config: Dict[str, Any]) -> None:
+        """Create the client which reports to ReportPortal.
+
+        :param variables:     ReportPortal variables
+        :param client_config: Keyword arguments of the client
+        """
+        self.rp = create_client(
+            client_type=variables.client_type,
+            log_batcher=self.log_batcher,
+            launch_uuid_print=variables.launch_uuid_print,
+            print_output=variables.launch_uuid_print_output,
+            **client_config,
+        )
+        if variables.oauth_token_cache:
+            self._use_token_cache(variables)
+
+    def _use_token_cache(self, variables: Variables) -> None:
+        """Make the client share OAuth tokens with other processes through the token cache.
+
+        :param variables: ReportPortal variables
+        """
+        # Other client types authenticate asynchronously, in their own sessions
+        if not variables.oauth_uri or not isinstance(self.rp, RPClient):
+            logger.debug("ReportPortal - Init service: OAuth token cache is not used, no synchronous OAuth client")
+            return
+        # The cache is built on internals of the client, pinned in the requirements
+        adapters = getattr(getattr(self.rp.session, "_client", None), "adapters", None)
+        if not is_token_cache_supported(self.rp.auth) or not isinstance(adapters, dict):
+            logger.warning(
+                "ReportPortal OAuth token cache is not supported by the installed ReportPortal client version, "
+                "the client's own authentication is used."
+            )
+            return
+        try:
+            cache = TokenCache(variables.oauth_token_cache_file or get_cache_path())
+        except ValueError as e:
+            logger.warning(f"Unable to use ReportPortal OAuth token cache: {e}")
+            return
+        auth = self.rp.auth
+        cached_auth = CachedOAuthPasswordGrant(
+            cache,
+            oauth_uri=auth.oauth_uri,
+            username=auth.username,
+            password=auth.password,
+            client_id=auth.client_id,
+            client_secret=auth.client_secret,
+            scope=auth.scope,
+        )
+        # Keep the adapters with the retry strategy and the pool size of the client
+        self.rp.auth = cached_auth
+        self.rp.session = create_session(cached_auth, adapters)
+        logger.debug(f"ReportPortal - Init service: OAuth token cache={cache.file_path}")
+
+    def _init_aggregator_client(self, variables: Variables, client_config: Dict[str, Any]) -> None:
+        """Create the client which reports through the local reporting daemon.
+
+        :param variables:     ReportPortal variables
+        :param client_config: Keyword arguments of the client the daemon creates
+        """
+        # The module needs Unix domain sockets, so it's imported only when they are available
+        from robotframework_reportportal.aggregator import AggregatorClient, get_socket_path
 
-            self.rp = create_client(
-                client_type=variables.client_type,
-                endpoint=variables.endpoint,
-                project=variables.project,
-                api_key=variables.api_key,
-                is_skipped_an_issue=variables.skipped_issue,
-                log_batch_size=variables.log_batch_size,
-                retries=5,
-                verify_ssl=variables.verify_ssl,
-                max_pool_size=variables.pool_size,
-                log_batch_payload_limit=variables.log_batch_payload_limit,
-                launch_uuid=variables.launch_id,
-                launch_uuid_print=variables.launch_uuid_print,
-                print_output=variables.launch_uuid_print_output,
-                http_timeout=variables.http_timeout,
-                oauth_uri=variables.oauth_uri,
-                oauth_username=variables.oauth_username,
-                oauth_password=variables.oauth_password,
-                oauth_client_id=variables.oauth_client_id,
-                oauth_client_secret=variables.oauth_client_secret,
-                oauth_scope=variables.oauth_scope,
+        ignored = [
+            name
+            for name, enabled in (
+                ("RP_CIRCUIT_BREAKER", variables.circuit_breaker),
+                ("RP_LOG_LANE_WORKERS", variables.log_lane_workers > 0),
+                ("RP_LOG_BATCH_ADAPTIVE", variables.log_batch_adaptive),
+                ("RP_PABOT_LAUNCH_COORDINATION", variables.pabot_launch_coordination),
+                ("RP_OAUTH_TOKEN_CACHE", variables.oauth_token_cache),
             )
+            if enabled
+        ]
+        if ignored:
+            logger.warning(f"ReportPortal aggregator sink does not support {', '.join(ignored)}, ignoring them.")
+        socket_path = variables.aggregator_socket or get_socket_path(variables.endpoint, variables.project)
+        logger.debug(f"ReportPortal - Init service: aggregator socket={socket_path}")
+        self.rp = AggregatorClient(
+            socket_path,
+            client_config,
+            variables.aggregator_idle_timeout,
+            variables.launch_uuid_print,
+            variables.launch_uuid_print_output,
+        )
+
+    def _init_pabot_coordination(self, variables: Variables, client_config: Dict[str, Any]) -> None:
+        """Prepare sharing of the launch between pabot workers, which happens on launch start.
+
+        :param variables:     ReportPortal variables
+        :param client_config: Keyword arguments of the client, to re-create it for the launch of another worker
+        """
+        is_last_execution = variables.pabot_is_last_execution
+        if is_last_execution is None:
+            # Without the flag no worker knows when to finish the shared launch
+            logger.warning(
+                "Pabot does not pass PABOTISLASTEXECUTIONINPOOL variable, ReportPortal launch is not shared with "
+                "other pabot workers."
+            )
+            return
+        pabot_lib = PabotLib(variables.pabot_used, variables.pabot_caller_id or str(uuid.uuid4()))
+        self.coordinator = LaunchCoordinator(pabot_lib, is_last_execution)
+        if variables.pabot_shared_suites:
+            self.suite_registry = SuiteRegistry(pabot_lib)
+        self._pabot_client_args = (variables, client_config)
+
+    def _start_pabot_launch(self, start_rq: Dict[str, Any]) -> Optional[str]:
+        """Start the launch shared by pabot workers, or join the launch started by another worker.
+
+        :param start_rq: Launch start request
+        :return:         Launch UUID
+        """
+        started = []
+
+        def start_launch() -> Optional[str]:
+            started.append(self._call("start_launch", self.rp.start_launch, start_rq))
+            return started[0]
+
+        try:
+            launch_uuid = self.coordinator.get_launch(start_launch)
+        except (OSError, xmlrpc.client.Error, PabotLibError) as e:
+            logger.warning(f"Unable to share ReportPortal launch with other pabot workers, starting own one: {e}")
+            launch_uuid = started[0] if started else self._call("start_launch", self.rp.start_launch, start_rq)
+            self.coordinator = None
+            self.suite_registry = None
+            return launch_uuid
+        if not launch_uuid:
+            # The launch start failed, so there is no launch to leave
+            self.coordinator = None
+            self.suite_registry = None
+        elif not self.coordinator.is_creator:
+            # The client reports only to the launch it was created with
+            variables, client_config = self._pabot_client_args
+            self.rp.close()
+            self._create_client(variables, {**client_config, "launch_uuid": launch_uuid})
+            launch_uuid = self._call("start_launch", self.rp.start_launch, start_rq)
+        return launch_uuid
 
     def terminate_service(self) -> None:
         """Terminate common ReportPortal client."""
         if self.rp:
-            self.rp.close()
+            self._send_pending_logs()
+            self._flush_log_buffer()
+            self._send_spilled_logs()
+            self._wait_log_lane()
+            if self._log_lane:
+                self._log_lane.shutdown()
+            if self.breaker and self.breaker.is_open and self.breaker.recovery_interval is not None:
+                with self._breaker_lock:
+                    self._try_recover()
+            if self.breaker and self.breaker.is_open:
+                # The client would send its pending log batch on close, it goes to the journal instead
+                self._journal_client_log_batch()
+                if isinstance(self.rp, RPClient):
+                    self.rp.close()
+            else:
+                self._call("close", self.rp.close, {})
+            if self.journal:
+                self.journal.close()
+                if self.breaker.is_open:
+                    logger.warning(
+                        f"ReportPortal was not available, reported data was written to the journal file: "
+                        f"{self.journal_file}"
+                    )
+
+    def _journal_call(self, method: str, request: Dict[str, Any]) -> Any:
+        """Make the call on the local journal instead of the client.
+
+        :param method:  Name of the method the call is recorded under in metrics
+        :param request: Keyword arguments of the call
+        :return:        Result of the call
+        """
+        if self.journal is None:
+            self.journal = SpoolClient(self.journal_file)
+            logger.warning(
+                f"ReportPortal circuit breaker opened: {self.breaker.reason}, reporting to the journal file:"
+                f" {self.journal_file}"
+            )
+        journal_method = JOURNAL_METHODS.get(method)
+        # Log batches of the client are not journaled, since they consist of prepared requests
+        return getattr(self.journal, journal_method)(**request) if journal_method else None
+
+    def _journal_client_log_batch(self) -> None:
+        """Write log entries collected in the client's log batch to the journal."""
+        # Internals of the client, which may change between its versions
+        client_batcher = getattr(self.rp, "_log_batcher", None)
+        if not isinstance(self.rp, RPClient) or not client_batcher:
+            return
+        for entry in client_batcher.flush() or []:
+            attachment = None
+            if entry.file:
+                attachment = {"name": entry.file.name, "data": entry.file.content, "mime": entry.file.content_type}
+            request = {
+                "attachment": attachment,
+                "item_id": entry.item_uuid,
+                "level": entry.level,
+                "message": entry.message,
+                "time": entry.time,
+            }
+            self._journal_call("attachment" if attachment else "log", request)
+
+    def _replay_journal_call(self, method: str, request: Dict[str, Any]) -> bool:
+        """Make a call written to the journal on the client.
+
+        :param method:  Client method name
+        :param request: Keyword arguments of the call
+        :return:        Whether the call succeeded
+        """
+        if method in ("start_launch", "finish_launch"):
+            # Items use the launch UUID the client gets on launch start
+            request.pop("uuid", None)
+        result = getattr(self.rp, method)(**request)
+        return result is not None or method in ("log", "finish_launch")
+
+    def _try_recover(self) -> None:
+        """Probe ReportPortal and close the circuit after the journal is back-filled to the server."""
+        # Messages logged by the client during the recovery come back as log calls
+        if self._recovering:
+            return
+        self._recovering = True
+        try:
+            self._backfill_journal()
+        finally:
+            self._recovering = False
+
+    def _backfill_journal(self) -> None:
+        if not self.rp.get_project_settings():
+            self.breaker.postpone_probe()
+            return
+        if self.journal:
+            self.journal.flush()
+            for i, (method, request) in enumerate(read_spool(self.journal_file)):
+                if i < self._journal_replayed:
+                    continue
+                if not self._replay_journal_call(method, request):
+                    self.breaker.postpone_probe()
+                    return
+                self._journal_replayed += 1
+        logger.warning("ReportPortal circuit breaker closed, the journal is sent to the server")
+        self.breaker.close()
+
+    def _call(self, method: str, client_method: Callable, request: Dict[str, Any]) -> Any:
+        """Call the client method, or the local journal if the circuit breaker is open.
+
+        :param method:        Name of the method to record metrics under
+        :param client_method: Client method to call
+        :param request:       Keyword arguments of the call
+        :return:              Result of the call
+        """
+        if not self.breaker:
+            return self._measure_call(method, client_method, request)
+        with self._breaker_lock:
+            if self.breaker.should_probe():
+                self._try_recover()
+            if self.breaker.is_open:
+                return self._journal_call(method, request)
+        start = time.perf_counter()
+        error = None
+        result = None
+        try:
+            result = self._measure_call(method, client_method, request)
+        except Exception as e:
+            error = e
+        failed = error is not None or (result is None and method in CHECKED_METHODS)
+        if not failed and method not in CHECKED_METHODS:
+            # Log calls mostly put messages into a batch, their success tells nothing about the server
+            return result
+        with self._breaker_lock:
+            self.breaker.record(time.perf_counter() - start, failed)
+            if failed and self.breaker.is_open:
+                # Logs waiting in the client's batch were made before the failed call, they go to the journal first
+                self._journal_client_log_batch()
+                # The failed call is made on the journal, so the item is reported there
+                return self._journal_call(method, request)
+        if error is not None:
+            raise error
+        return result
+
+    def _measure_call(self, method: str, client_method: Callable, request: Dict[str, Any]) -> Any:
+        """Call the client method, recording its latency and payload size if metrics are enabled.
+
+        :param method:        Name of the method to record metrics under
+        :param client_method: Client method to call
+        :param request:       Keyword arguments of the call
+        :return:              Result of the call
+        """
+        if not self.metrics:
+            return client_method(**request)
+        start = time.perf_counter()
+        try:
+            result = client_method(**request)
+        except Exception:
+            self.metrics.record(method, time.perf_counter() - start, get_payload_size(request), True)
+            raise
+        self.metrics.record(method, time.perf_counter() - start, get_payload_size(request))
+        return result
 
     def start_launch(
         self,
@@ -136,7 +596,9 @@ class RobotService:
         }
         logger.debug("ReportPortal - Start launch: request_body={0}".format(sl_pt))
         try:
-            return self.rp.start_launch(**sl_pt)
+            if self.coordinator:
+                return self._start_pabot_launch(sl_pt)
+            return self._call("start_launch", self.rp.start_launch, sl_pt)
         except Exception as e:
             if self.debug:
                 logger.error(f"Unable to start launch: {e}")
@@ -149,10 +611,30 @@ class RobotService:
         :param launch: Launch name
         :param ts:     End time
         """
+        self._send_pending_logs()
+        self._flush_log_buffer()
+        self._send_spilled_logs()
+        self._wait_log_lane()
+        self._log_shed_summary()
+        if self.coordinator:
+            try:
+                is_last_worker = self.coordinator.leave()
+            except (OSError, xmlrpc.client.Error, PabotLibError) as e:
+                logger.warning(f"Unable to leave ReportPortal launch shared by pabot workers, not finishing it: {e}")
+                return
+            if not is_last_worker:
+                logger.debug("ReportPortal - Finish launch: other pabot workers still report to the launch")
+                return
+            if self.suite_registry:
+                self._finish_open_suites()
+            # The launch could be started by another worker, but it's finished by the last one
+            for own_launch_attribute in ("use_own_launch", "own_launch"):
+                if hasattr(self.rp, own_launch_attribute):
+                    setattr(self.rp, own_launch_attribute, True)
         fl_rq = {"end_time": ts or to_epoch(launch.end_time) or timestamp(), "status": STATUS_MAPPING[launch.status]}
         logger.debug("ReportPortal - Finish launch: request_body={0}".format(fl_rq))
         try:
-            self.rp.finish_launch(**fl_rq)
+            self._call("finish_launch", self.rp.finish_launch, fl_rq)
         except Exception as e:
             if self.debug:
                 logger.error(f"Unable to finish launch: {e}")
@@ -176,7 +658,11 @@ class RobotService:
         }
         logger.debug("ReportPortal - Start suite: request_body={0}".format(start_rq))
         try:
-            return self.rp.start_test_item(**start_rq)
+            if self.suite_registry:
+                return self.suite_registry.start(
+                    suite.longname, lambda: self._call("start_suite", self.rp.start_test_item, start_rq)
+                )
+            return self._call("start_suite", self.rp.start_test_item, start_rq)
         except Exception as e:
             if self.debug:
                 logger.error(f"Unable to start suite: {e}")
@@ -190,6 +676,10 @@ class RobotService:
         :param issue: Corresponding issue if it exists
         :param ts:    End time
         """
+        self._send_pending_logs()
+        self._flush_log_buffer()
+        self._wait_item_logs(suite.rp_item_id)
+        self._send_client_log_batch(expired_only=True)
         fta_rq = {
             "end_time": ts or to_epoch(suite.end_time) or timestamp(),
             "issue": issue,
@@ -198,13 +688,44 @@ class RobotService:
         }
         logger.debug("ReportPortal - Finish suite: request_body={0}".format(fta_rq))
         try:
-            self.rp.finish_test_item(**fta_rq)
+            if self.suite_registry:
+                self._finish_shared_suite(suite, fta_rq)
+                return
+            self._call("finish_suite", self.rp.finish_test_item, fta_rq)
         except Exception as e:
             if self.debug:
                 logger.error(f"Unable to finish suite: {e}")
                 logger.exception(e)
             raise e
 
+    def _finish_shared_suite(self, suite: Suite, fta_rq: Dict[str, Any]) -> None:
+        """Leave the suite shared with other pabot workers and finish it, if the current worker is the last one.
+
+        :param suite:  Instance of the started suite item
+        :param fta_rq: Finish request of the part of the suite run by the current worker
+        """
+        suites = self.suite_registry.finish(suite.longname, fta_rq["end_time"], fta_rq["status"])
+        if not suites:
+            logger.debug("ReportPortal - Finish suite: other pabot workers still report to the suite")
+        for item_id, end_time, status in suites:
+            # Suites left open by other workers are finished without the issue of the current one
+            issue = fta_rq["issue"] if item_id == fta_rq["item_id"] else None
+            # Descendants of crashed workers have neither end time nor status
+            rq = {
+                "end_time": end_time or timestamp(),
+                "issue": issue,
+                "item_id": item_id,
+                "status": status or "FAILED",
+            }
+            self._call("finish_suite", self.rp.finish_test_item, rq)
+
+    def _finish_open_suites(self) -> None:
+        """Finish the shared suites left open by pabot workers, e.g. the ones which crashed."""
+        for item_id, end_time, status in self.suite_registry.finish_all():
+            rq = {"end_time": end_time or timestamp(), "issue": None, "item_id": item_id, "status": status or "FAILED"}
+            logger.debug("ReportPortal - Finish open suite: request_body={0}".format(rq))
+            self._call("finish_suite", self.rp.finish_test_item, rq)
+
     def start_test(self, test: Test, ts: Optional[str] = None):
         """Call start_test method of the common client.
 
@@ -224,9 +745,10 @@ class RobotService:
             "start_time": ts or to_epoch(test.start_time) or timestamp(),
             "test_case_id": test.test_case_id,
         }
+        self._test_shed_logs = 0
         logger.debug("ReportPortal - Start test: request_body={0}".format(start_rq))
         try:
-            return self.rp.start_test_item(**start_rq)
+            return self._call("start_test", self.rp.start_test_item, start_rq)
         except Exception as e:
             if self.debug:
                 logger.error(f"Unable to start test: {e}")
@@ -240,6 +762,12 @@ class RobotService:
         :param issue: Corresponding issue if it exists
         :param ts:    End time
         """
+        self._send_pending_logs()
+        # Logs of a failed test are sent before its finish, even if the client's log batch is not full
+        self._flush_log_buffer(send_batch=self.log_buffering and test.status == "FAIL")
+        self._wait_item_logs(test.rp_item_id)
+        # Do not let the adaptive batch wait for a next entry longer than its time budget
+        self._send_client_log_batch(expired_only=True)
         description = None
         if test.doc:
             description = test.doc
@@ -249,8 +777,11 @@ class RobotService:
                 description += f"\n\n---\n\n{message}"
             else:
                 description = message
+        attributes = test.attributes
+        if self._test_shed_logs:
+            attributes = attributes + [{"key": SHED_LOGS_ATTRIBUTE_KEY, "value": str(self._test_shed_logs)}]
         fta_rq = {
-            "attributes": test.attributes,
+            "attributes": attributes,
             "end_time": ts or to_epoch(test.end_time) or timestamp(),
             "issue": issue,
             "item_id": test.rp_item_id,
@@ -261,7 +792,7 @@ class RobotService:
             fta_rq["description"] = description
         logger.debug("ReportPortal - Finish test: request_body={0}".format(fta_rq))
         try:
-            self.rp.finish_test_item(**fta_rq)
+            self._call("finish_test", self.rp.finish_test_item, fta_rq)
         except Exception as e:
             if self.debug:
                 logger.error(f"Unable to finish test: {e}")
@@ -286,7 +817,7 @@ class RobotService:
             start_rq["uuid"] = keyword.rp_item_id
         logger.debug("ReportPortal - Start keyword: request_body={0}".format(start_rq))
         try:
-            return self.rp.start_test_item(**start_rq)
+            return self._call("start_keyword", self.rp.start_test_item, start_rq)
         except Exception as e:
             if self.debug:
                 logger.error(f"Unable to start keyword: {e}")
@@ -300,6 +831,8 @@ class RobotService:
         :param issue:   Corresponding issue if it exists
         :param ts:      End time
         """
+        self._send_pending_logs()
+        self._wait_item_logs(keyword.rp_item_id)
         fta_rq = {
             "end_time": ts or to_epoch(keyword.end_time) or timestamp(),
             "issue": issue,
@@ -308,16 +841,185 @@ class RobotService:
         }
         logger.debug("ReportPortal - Finish keyword: request_body={0}".format(fta_rq))
         try:
-            self.rp.finish_test_item(**fta_rq)
+            self._call("finish_keyword", self.rp.finish_test_item, fta_rq)
         except Exception as e:
             if self.debug:
                 logger.error(f"Unable to finish keyword: {e}")
                 logger.exception(e)
             raise e
 
+    def _post_log(self, sl_rq: Dict[str, Any]) -> None:
+        start = time.perf_counter()
+        try:
+            self._call("attachment" if sl_rq["attachment"] else "log", self.rp.log, sl_rq)
+            if self._observe_log_latency:
+                self.log_batcher.observe_latency(time.perf_counter() - start)
+        except Exception as e:
+            if self.debug:
+                logger.error(f"Unable to send log message: {e}")
+                logger.exception(e)
+            raise e
+
+    def _check_log_lane(self, wait: bool = False) -> None:
+        """Remove completed log lane tasks, raising errors of failed ones in the listener thread.
+
+        :param wait: Wait for all the tasks to complete, otherwise stop on the first one which is not done
+        """
+        while self._log_lane_tasks:
+            if not wait and not self._log_lane_tasks[0].done():
+                return
+            self._log_lane_tasks.popleft().result()
+
+    def _wait_log_lane(self) -> None:
+        """Wait until all the log messages handed over to the log lane are sent."""
+        self._check_log_lane(wait=True)
+        self._log_lane_item_tasks.clear()
+
+    def _wait_item_logs(self, item_id: Optional[str]) -> None:
+        """Wait until the log messages of the given item handed over to the log lane are sent.
+
+        The log lane sends messages in order, so it's enough to wait for the last one of the item.
+
+        :param item_id: ReportPortal item ID
+        """
+        task = self._log_lane_item_tasks.pop(item_id, None)
+        if task:
+            wait([task])
+            self._check_log_lane()
+
+    def _submit_log(self, sl_rq: Dict[str, Any]) -> None:
+        """Put log message to the log lane, waiting until there is room in its queue.
+
+        :param sl_rq: Log request
+        """
+        while self.log_queue_size and len(self._log_lane_tasks) >= self.log_queue_size:
+            self._log_lane_tasks.popleft().result()
+        task = self._log_lane.submit(self._post_log, sl_rq)
+        self._log_lane_tasks.append(task)
+        if sl_rq["item_id"]:
+            self._log_lane_item_tasks[sl_rq["item_id"]] = task
+
+    def _dispatch_log(self, sl_rq: Dict[str, Any]) -> None:
+        """Send log message on the log lane if it's enabled, otherwise in the listener thread.
+
+        The log lane lets item start and finish calls, which are made in the listener thread, go ahead of log and
+        attachment uploads. Logs are only dispatched after their item is started, so their order is kept. If the log
+        lane queue is full, the message is handled according to the queue policy.
+
+        :param sl_rq: Log request
+        """
+        if not self._log_lane:
+            self._post_log(sl_rq)
+            return
+        self._check_log_lane()
+        if self.log_queue_size and len(self._log_lane_tasks) >= self.log_queue_size:
+            level = sl_rq["level"]
+            if level in SHED_LEVELS[self.log_queue_policy]:
+                self.shed_logs[level] = self.shed_logs.get(level, 0) + 1
+                self._test_shed_logs += 1
+                return
+            if self._log_spill:
+                self._log_spill.write(sl_rq)
+                return
+        self._submit_log(sl_rq)
+
+    def _send_spilled_logs(self) -> None:
+        """Put log messages spilled to disk to the log lane, waiting for room in its queue."""
+        if self._log_spill:
+            for sl_rq in self._log_spill.read():
+                self._submit_log(sl_rq)
+
+    def _log_shed_summary(self) -> None:
+        """Log numbers of log messages shed or spilled to disk because of the full log queue to the launch."""
+        messages = []
+        if self.shed_logs:
+            levels = ", ".join(f"{level}: {number}" for level, number in sorted(self.shed_logs.items()))
+            messages.append(SHED_LOGS_SUMMARY.format(number=sum(self.shed_logs.values()), levels=levels))
+        if self._log_spill and self._log_spill.count:
+            messages.append(SPILLED_LOGS_SUMMARY.format(number=self._log_spill.count))
+        for message in messages:
+            self._post_log(
+                {"attachment": None, "item_id": None, "level": "WARN", "message": message, "time": timestamp()}
+            )
+
+    def _send_client_log_batch(self, expired_only: bool = False) -> None:
+        """Send log entries collected in the client's log batch without waiting for the batch to fill.
+
+        :param expired_only: Send the batch only if its first entry waits longer than the adaptive batcher time budget
+        """
+        if expired_only and not self.log_batcher:
+            return
+        # Only the synchronous client sends batches within the call, others send them in background on their own
+        if not isinstance(self.rp, RPClient) or (self.breaker and self.breaker.is_open):
+            return
+        # Internals of the client, which may change between its versions
+        client_batcher = getattr(self.rp, "_log_batcher", None)
+        send_batch = getattr(self.rp, "_log", None)
+        if not client_batcher or not send_batch:
+            return
+        if expired_only:
+            if client_batcher is not self.log_batcher:
+                return
+            batch = self.log_batcher.flush_expired()
+        else:
+            batch = client_batcher.flush()
+        if not batch:
+            return
+        start = time.perf_counter()
+        try:
+            self._call("log_batch", send_batch, {"batch": batch})
+            if self._observe_log_latency:
+                self.log_batcher.observe_latency(time.perf_counter() - start)
+        except Exception as e:
+            if self.debug:
+                logger.error(f"Unable to send log batch: {e}")
+                logger.exception(e)
+            raise e
+
+    def _flush_log_buffer(self, send_batch: bool = False) -> None:
+        """Hand over buffered log messages to the client in a row, so they fill its log batches.
+
+        :param send_batch: Also send the client's log batch, even if it is not full
+        """
+        buffer = self._log_buffer
+        self._log_buffer = []
+        self._log_buffer_size = 0
+        for sl_rq in buffer:
+            self._dispatch_log(sl_rq)
+        if send_batch:
+            self._wait_log_lane()
+            self._send_client_log_batch()
+
+    def _send_log(self, sl_rq: Dict[str, Any]) -> None:
+        if not self.log_buffering:
+            self._dispatch_log(sl_rq)
+            return
+        self._log_buffer.append(sl_rq)
+        self._log_buffer_size += get_payload_size(sl_rq)
+        if len(self._log_buffer) >= self.log_buffer_max_count or self._log_buffer_size >= self.log_buffer_max_size:
+            self._flush_log_buffer()
+
+    def _send_pending_logs(self, wait: bool = True) -> None:
+        """Send log messages which were postponed until their attachments are ready, preserving their order.
+
+        :param wait: Wait for attachments processing, otherwise stop on the first message which is not ready
+        """
+        while self._pending_logs:
+            sl_rq = self._pending_logs[0]
+            attachment = sl_rq["attachment"]
+            if isinstance(attachment, Future):
+                if not wait and not attachment.done():
+                    return
+                sl_rq["attachment"] = attachment.result()
+            self._pending_logs.popleft()
+            self._send_log(sl_rq)
+
     def log(self, message: LogMessage, ts: Optional[str] = None):
         """Send log message to ReportPortal.
 
+        Messages with attachments which are still being processed are postponed, along with all the following
+        messages, until the processing is finished or the parent item is going to finish.
+
         :param message: model.LogMessage object
         :param ts:      Timestamp
         """
@@ -328,10 +1030,8 @@ class RobotService:
             "message": message.message,
             "time": ts or to_epoch(message.timestamp) or timestamp(),
         }
-        try:
-            self.rp.log(**sl_rq)
-        except Exception as e:
-            if self.debug:
-                logger.error(f"Unable to send log message: {e}")
-                logger.exception(e)
-            raise e
+        if self._pending_logs or isinstance(message.attachment, Future):
+            self._pending_logs.append(sl_rq)
+            self._send_pending_logs(wait=False)
+            return
+        self._send_log(sl_rq)
@@ -0,0 +1,179 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains stand-ins of the ReportPortal client which do not send data to the server."""
+
+import base64
+import json
+import threading
+import uuid
+from enum import Enum
+from typing import IO, Any, Dict, Iterator, Optional, Tuple
+
+from robotframework_reportportal.metrics import get_payload_size
+
+
+class SinkType(Enum):
+    """Enum of supported destinations of the reported data."""
+
+    CLIENT = "CLIENT"
+    SPOOL = "SPOOL"
+    NULL = "NULL"
+    AGGREGATOR = "AGGREGATOR"
+
+
+class SpoolClient:
+    """ReportPortal client stand-in which writes every call to a local JSON lines spool file.
+
+    Each line holds the client method name and its keyword arguments. Item and launch UUIDs are generated locally,
+    attachment data is encoded with Base64.
+    """
+
+    file_path: str
+    launch_uuid: Optional[str]
+    _file: IO[str]
+    _lock: threading.Lock
+
+    def __init__(self, file_path: str) -> None:
+        """Open the spool file.
+
+        :param file_path: Path to the spool file
+        """
+        self.file_path = file_path
+        self.launch_uuid = None
+        self._file = open(file_path, "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def _write(self, method: str, **kwargs: Any) -> None:
+        line = json.dumps({"method": method, **kwargs}, separators=(",", ":"), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def start_launch(self, name: str, start_time: str, **kwargs: Any) -> str:
+        """Write launch start call and return a generated launch UUID."""
+        self.launch_uuid = str(uuid.uuid4())
+        self._write("start_launch", uuid=self.launch_uuid, name=name, start_time=start_time, **kwargs)
+        return self.launch_uuid
+
+    def finish_launch(self, end_time: str, **kwargs: Any) -> None:
+        """Write launch finish call."""
+        self._write("finish_launch", uuid=self.launch_uuid, end_time=end_time, **kwargs)
+
+    def start_test_item(self, name: str, start_time: str, item_type: str, **kwargs: Any) -> str:
+        """Write item start call and return the given or a generated item UUID."""
+        item_uuid = kwargs.pop("uuid", None) or str(uuid.uuid4())
+        self._write("start_test_item", uuid=item_uuid, name=name, start_time=start_time, item_type=item_type, **kwargs)
+        return item_uuid
+
+    def finish_test_item(self, item_id: str, end_time: str, **kwargs: Any) -> None:
+        """Write item finish call."""
+        self._write("finish_test_item", item_id=item_id, end_time=end_time, **kwargs)
+
+    def log(
+        self,
+        time: str,
+        message: str,
+        level: Optional[str] = None,
+        attachment: Optional[Dict[str, Any]] = None,
+        item_id: Optional[str] = None,
+    ) -> None:
+        """Write log call, encoding attachment data with Base64."""
+        if attachment:
+            data = attachment.get("data")
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            attachment = {**attachment, "data": base64.b64encode(data or b"").decode("ascii")}
+        self._write("log", time=time, message=message, level=level, attachment=attachment, item_id=item_id)
+
+    def flush(self) -> None:
+        """Flush written calls to the spool file."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self) -> None:
+        """Flush and close the spool file, if it's not closed yet."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def read_spool(file_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Read client calls written by SpoolClient, decoding attachment data.
+
+    :param file_path: Path to the spool file
+    :return:          Iterator over client method name and its keyword arguments tuples
+    """
+    with open(file_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            call = json.loads(line)
+            method = call.pop("method")
+            attachment = call.get("attachment")
+            if attachment:
+                attachment["data"] = base64.b64decode(attachment["data"])
+            yield method, call
+
+
+class NullClient:
+    """ReportPortal client stand-in which drops all the data, only counting calls and their payload size.
+
+    It's used to measure the agent's own overhead without any network and serialization cost.
+    """
+
+    launch_uuid: Optional[str]
+    calls: Dict[str, int]
+    payload_size: int
+
+    def __init__(self) -> None:
+        """Initialize counters."""
+        self.launch_uuid = None
+        self.calls = {}
+        self.payload_size = 0
+
+    def _count(self, method: str, request: Dict[str, Any]) -> None:
+        self.calls[method] = self.calls.get(method, 0) + 1
+        self.payload_size += get_payload_size(request)
+
+    def start_launch(self, **kwargs: Any) -> str:
+        """Count launch start call and return a generated launch UUID."""
+        self._count("start_launch", kwargs)
+        self.launch_uuid = str(uuid.uuid4())
+        return self.launch_uuid
+
+    def finish_launch(self, **kwargs: Any) -> None:
+        """Count launch finish call."""
+        self._count("finish_launch", kwargs)
+
+    def start_test_item(self, **kwargs: Any) -> str:
+        """Count item start call and return the given or a generated item UUID."""
+        self._count("start_test_item", kwargs)
+        return kwargs.get("uuid") or str(uuid.uuid4())
+
+    def finish_test_item(self, **kwargs: Any) -> None:
+        """Count item finish call."""
+        self._count("finish_test_item", kwargs)
+
+    def log(self, **kwargs: Any) -> None:
+        """Count log call."""
+        self._count("log", kwargs)
+
+    def close(self) -> None:
+        """Do nothing, there is nothing to release."""
+
+    def format_summary(self) -> str:
+        """Format call counters as a single line suitable for the console."""
+        calls = ", ".join(f"{method}: {count}" for method, count in sorted(self.calls.items()))
+        return f"ReportPortal NULL sink: {sum(self.calls.values())} calls ({calls}), {self.payload_size} bytes"
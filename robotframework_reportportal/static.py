@@ -29,7 +29,7 @@ LOG_LEVEL_MAPPING: Dict[str, str] = {
 MAIN_SUITE_ID: str = "s1"
 PABOT_WITHOUT_LAUNCH_ID_MSG: str = (
     "Pabot library is used but RP_LAUNCH_UUID was not provided. Please, "
-    "initialize listener with the RP_LAUNCH_UUID argument."
+    "initialize listener with the RP_LAUNCH_UUID argument or set RP_PABOT_LAUNCH_COORDINATION to True."
 )
 STATUS_MAPPING: Dict[str, str] = {
     "PASS": "PASSED",
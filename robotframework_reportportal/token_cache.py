@@ -0,0 +1,231 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains OAuth token cache shared by Robot Framework processes of one machine, e.g. pabot workers.
+
+Tokens are kept in a JSON file readable only by its owner and locked for the time of a token exchange, so while one
+process obtains a token, others wait for it instead of making their own requests to the identity provider.
+
+The cache extends internals of the client's OAuth authentication, it's not used if they are missing.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    from reportportal_client._internal.http import ClientSession
+    from reportportal_client._internal.services.auth import OAuthPasswordGrantSync
+except ImportError:
+    # Internal modules of the client, which may change between its versions
+    ClientSession = None
+    OAuthPasswordGrantSync = object
+
+try:
+    import fcntl
+except ImportError:
+    # Not a POSIX system, file locks are not supported
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Only the owner can read and write the file, since it holds credentials
+CACHE_FILE_MODE = 0o600
+# Maximum time to wait for another process to finish its token exchange
+LOCK_TIMEOUT = 60.0
+LOCK_POLL_INTERVAL = 0.05
+# Internals of the client's OAuth password grant the cache relies on
+OAUTH_INTERNALS = ("_access_token", "_refresh_token", "_token_expires_at", "_is_token_expired", "_clear_token")
+
+
+class TokenCacheLockError(TimeoutError):
+    """Token cache file was not locked within the timeout."""
+
+
+def is_token_cache_supported(auth: Any) -> bool:
+    """Check if the client's authentication has the internals the token cache is built on.
+
+    :param auth: Authentication of the client
+    :return:     True if the token cache can be used with the authentication
+    """
+    if ClientSession is None or not isinstance(auth, OAuthPasswordGrantSync):
+        return False
+    return all(hasattr(auth, attribute) for attribute in OAUTH_INTERNALS)
+
+
+def create_session(auth: Any, adapters: Dict[str, Any]) -> Any:
+    """Create the client's HTTP session with the given authentication.
+
+    :param auth:     Authentication of the session
+    :param adapters: Transport adapters of the session by URL prefixes
+    :return:         Client session
+    """
+    session = ClientSession(auth=auth)
+    for prefix, adapter in adapters.items():
+        session.mount(prefix, adapter)
+    return session
+
+
+def get_cache_path() -> str:
+    """Get default cache file path, the same for all processes of the current user.
+
+    :return: Path to the cache file in the temporary directory
+    """
+    user = os.getuid() if hasattr(os, "getuid") else ""
+    return os.path.join(tempfile.gettempdir(), f"rp-oauth-tokens-{user}.json")
+
+
+def get_cache_key(oauth_uri: str, client_id: str, username: str) -> str:
+    """Get key of the tokens issued by the OAuth server to the client for the user.
+
+    :param oauth_uri: OAuth 2.0 token endpoint URI
+    :param client_id: OAuth client ID
+    :param username:  Username the tokens are issued for
+    :return:          Key hash, so the usernames are not stored in the file
+    """
+    return hashlib.sha256(f"{oauth_uri}\n{client_id}\n{username}".encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """JSON file with OAuth tokens, locked exclusively while it's opened."""
+
+    file_path: str
+    lock_timeout: float
+
+    def __init__(self, file_path: str, lock_timeout: float = LOCK_TIMEOUT) -> None:
+        """Initialize cache attributes.
+
+        :param file_path:    Path to the cache file, created on the first use
+        :param lock_timeout: Maximum time in seconds to wait for the file lock
+        """
+        if fcntl is None:
+            raise ValueError("ReportPortal OAuth token cache is not supported on this platform.")
+        self.file_path = file_path
+        self.lock_timeout = lock_timeout
+
+    def _lock(self, fd: int) -> None:
+        deadline = time.monotonic() + self.lock_timeout
+        while True:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise TokenCacheLockError(
+                        f"file {self.file_path} was not locked within {self.lock_timeout:g} seconds"
+                    )
+                time.sleep(LOCK_POLL_INTERVAL)
+
+    @contextmanager
+    def open(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """Lock the file and read its entries, which are written back on exit if changed.
+
+        :return: Dictionary of token entries by cache key
+        :raises TokenCacheLockError: If the file is locked by another process longer than the timeout
+        :raises OSError:             If the file can't be used, e.g. it's a symbolic link or belongs to another user
+        """
+        # The file holds credentials, so a link or a file of another user, e.g. in the shared temporary directory, is
+        # not trusted
+        fd = os.open(self.file_path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, CACHE_FILE_MODE)
+        with os.fdopen(fd, "r+", encoding="utf-8") as f:
+            if os.fstat(fd).st_uid != os.getuid():
+                raise PermissionError(f"file {self.file_path} belongs to another user")
+            self._lock(fd)
+            # The file could be created with a different mode, e.g. by a copy
+            os.fchmod(fd, CACHE_FILE_MODE)
+            try:
+                entries = json.loads(f.read() or "{}")
+            except ValueError:
+                # Written partially, e.g. by a killed process, the tokens are just obtained again
+                entries = {}
+            original = json.dumps(entries, sort_keys=True)
+            yield entries
+            if json.dumps(entries, sort_keys=True) != original:
+                f.seek(0)
+                f.truncate()
+                json.dump(entries, f, separators=(",", ":"))
+                f.flush()
+
+
+class CachedOAuthPasswordGrant(OAuthPasswordGrantSync):
+    """OAuth 2.0 password grant authentication which shares tokens through the cache.
+
+    A valid token from the cache is used as is. Once it's expired, the process holding the cache lock refreshes the
+    token with the latest refresh token from the cache and stores the result, the others wait and use it.
+    """
+
+    cache: TokenCache
+    cache_key: str
+
+    def __init__(self, cache: TokenCache, **kwargs: Any) -> None:
+        """Initialize authentication attributes.
+
+        :param cache:  Token cache
+        :param kwargs: Arguments of OAuthPasswordGrantSync
+        """
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.cache_key = get_cache_key(self.oauth_uri, self.client_id, self.username)
+
+    def get(self) -> Optional[str]:
+        """Get valid Authorization header value from the current token, the cache, or the OAuth server.
+
+        :return: Authorization header value or None if authentication failed
+        """
+        if not self._is_token_expired():
+            return f"Bearer {self._access_token}"
+        try:
+            return self._get_cached()
+        except OSError as e:
+            logger.warning(f"Unable to use ReportPortal OAuth token cache: {e}, obtaining the token without it")
+            return super().get()
+
+    def _get_cached(self) -> Optional[str]:
+        with self.cache.open() as entries:
+            entry = entries.get(self.cache_key)
+            if entry:
+                self._access_token = entry.get("access_token")
+                self._refresh_token = entry.get("refresh_token")
+                self._token_expires_at = entry.get("expires_at")
+                if not self._is_token_expired():
+                    return f"Bearer {self._access_token}"
+            header = super().get()
+            if header:
+                entries[self.cache_key] = {
+                    "access_token": self._access_token,
+                    "refresh_token": self._refresh_token,
+                    "expires_at": self._token_expires_at,
+                }
+            return header
+
+    def refresh(self) -> Optional[str]:
+        """Drop the token rejected by the server from the cache and get a new one.
+
+        :return: Authorization header value or None if refresh failed
+        """
+        try:
+            with self.cache.open() as entries:
+                entry = entries.get(self.cache_key)
+                # Another process could already replace the token, then it's used
+                if entry and entry.get("access_token") == self._access_token:
+                    entry["expires_at"] = 0
+        except OSError as e:
+            logger.warning(f"Unable to use ReportPortal OAuth token cache: {e}, the rejected token is left in it")
+        self._clear_token()
+        return self.get()
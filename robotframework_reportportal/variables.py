@@ -13,6 +13,7 @@
 
 """This module contains model that stores Robot Framework variables."""
 
+import os
 from os import path
 from typing import Any, Dict, List, Optional, Tuple, Union
 from warnings import warn
@@ -22,6 +23,10 @@ from reportportal_client.helpers import to_bool
 from reportportal_client.logs import MAX_LOG_BATCH_PAYLOAD_SIZE
 from robot.libraries.BuiltIn import BuiltIn, RobotNotRunningError
 
+from robotframework_reportportal.attachments import CompressionType
+from robotframework_reportportal.backpressure import QueuePolicy
+from robotframework_reportportal.sinks import SinkType
+
 # This is a storage for the result visitor
 _variables: Dict[str, Any] = {}
 
@@ -39,6 +44,17 @@ def get_variable(name: str, default: Optional[str] = None) -> Optional[str]:
         return _variables.get(name, default)
 
 
+def get_process_file_path(name: str) -> str:
+    """Get path to a JSON lines file in the current directory, unique for the current process.
+
+    Parallel processes, e.g. pabot workers, write their own files and don't overwrite each other's data.
+
+    :param name: Base name of the file
+    :return:     Path to the file
+    """
+    return f"{name}_{os.getpid()}.jsonl"
+
+
 class Variables:
     """This class stores Robot Framework variables related to ReportPortal."""
 
@@ -59,12 +75,20 @@ class Variables:
     oauth_client_id: Optional[str]
     oauth_client_secret: Optional[str]
     oauth_scope: Optional[str]
+    oauth_token_cache: bool
+    oauth_token_cache_file: Optional[str]
 
     attach_log: bool
     attach_report: bool
     attach_xunit: bool
+    attach_compression: CompressionType
+    image_max_size: Optional[Tuple[int, int]]
+    image_format: Optional[str]
+    image_quality: int
     launch_attributes: List[str]
     launch_id: Optional[str]
+    pabot_launch_coordination: bool
+    pabot_shared_suites: bool
     launch_doc: Optional[str]
     log_batch_size: Optional[int]
     mode: Optional[str]
@@ -74,12 +98,43 @@ class Variables:
     test_attributes: List[str]
     skipped_issue: bool
     log_batch_payload_limit: int
+    log_batch_adaptive: bool
+    log_batch_max_size: int
+    log_batch_time_budget: float
+    log_batch_latency_threshold: Optional[float]
+    log_buffer: bool
+    log_buffer_max_count: int
+    log_buffer_max_size: int
+    log_lane_workers: int
+    log_queue_size: int
+    log_queue_policy: QueuePolicy
+    log_spill_file: Optional[str]
+    circuit_breaker: bool
+    circuit_breaker_failures: int
+    circuit_breaker_latency: Optional[float]
+    circuit_breaker_recovery_interval: Optional[float]
+    circuit_breaker_journal: str
     launch_uuid_print: bool
     launch_uuid_print_output: Optional[OutputType]
     client_type: ClientType
+    sink_type: SinkType
+    spool_file: str
+    aggregator_socket: Optional[str]
+    aggregator_idle_timeout: float
     http_timeout: Optional[Union[Tuple[float, float], float]]
     remove_keywords: bool
     flatten_keywords: bool
+    max_keyword_depth: Optional[int]
+    keywords_as_logs: bool
+    skip_empty_suites: bool
+    metrics: bool
+    metrics_file: Optional[str]
+    profile: bool
+    profile_stats_file: Optional[str]
+    record_events: Optional[str]
+    listener_time_budget: Optional[float]
+    listener_queue_size: int
+    passed_detail_sample_rate: Optional[float]
     debug_mode: bool
 
     def __init__(self) -> None:
@@ -93,8 +148,20 @@ class Variables:
         self.attach_log = to_bool(get_variable("RP_ATTACH_LOG", default="False"))
         self.attach_report = to_bool(get_variable("RP_ATTACH_REPORT", default="False"))
         self.attach_xunit = to_bool(get_variable("RP_ATTACH_XUNIT", default="False"))
+        self.attach_compression = CompressionType[get_variable("RP_ATTACH_COMPRESSION", default="NONE").upper()]
+        image_max_size = get_variable("RP_IMAGE_MAX_SIZE")
+        if image_max_size:
+            dimensions = [int(d) for d in image_max_size.lower().split("x", 1)]
+            self.image_max_size = (dimensions[0], dimensions[-1])
+        else:
+            self.image_max_size = None
+        image_format = get_variable("RP_IMAGE_FORMAT")
+        self.image_format = image_format.upper() if image_format else None
+        self.image_quality = int(get_variable("RP_IMAGE_QUALITY", default="85"))
         self.launch_attributes = get_variable("RP_LAUNCH_ATTRIBUTES", default="").split()
         self.launch_id = get_variable("RP_LAUNCH_UUID")
+        self.pabot_launch_coordination = to_bool(get_variable("RP_PABOT_LAUNCH_COORDINATION", default="False"))
+        self.pabot_shared_suites = to_bool(get_variable("RP_PABOT_SHARED_SUITES", default="False"))
         self.launch_doc = get_variable("RP_LAUNCH_DOC")
         self.log_batch_size = int(get_variable("RP_LOG_BATCH_SIZE", default="20"))
         self.mode = get_variable("RP_MODE")
@@ -121,12 +188,37 @@ class Variables:
             self.log_batch_payload_limit = int(batch_payload_size_limit)
         else:
             self.log_batch_payload_limit = MAX_LOG_BATCH_PAYLOAD_SIZE
+        self.log_batch_adaptive = to_bool(get_variable("RP_LOG_BATCH_ADAPTIVE", default="False"))
+        self.log_batch_max_size = int(get_variable("RP_LOG_BATCH_MAX_SIZE", default="100"))
+        self.log_batch_time_budget = float(get_variable("RP_LOG_BATCH_TIME_BUDGET", default="1.0"))
+        latency_threshold = get_variable("RP_LOG_BATCH_LATENCY_THRESHOLD")
+        self.log_batch_latency_threshold = float(latency_threshold) if latency_threshold else None
+        self.log_buffer = to_bool(get_variable("RP_LOG_BUFFER", default="False"))
+        self.log_buffer_max_count = int(get_variable("RP_LOG_BUFFER_MAX_COUNT", default="1000"))
+        self.log_buffer_max_size = int(get_variable("RP_LOG_BUFFER_MAX_SIZE", default="10485760"))
+        self.log_lane_workers = int(get_variable("RP_LOG_LANE_WORKERS", default="0"))
+        self.log_queue_size = int(get_variable("RP_LOG_QUEUE_SIZE", default="1000"))
+        self.log_queue_policy = QueuePolicy[get_variable("RP_LOG_QUEUE_POLICY", default="BLOCK").upper()]
+        self.log_spill_file = get_variable("RP_LOG_SPILL_FILE")
+        self.circuit_breaker = to_bool(get_variable("RP_CIRCUIT_BREAKER", default="False"))
+        self.circuit_breaker_failures = int(get_variable("RP_CIRCUIT_BREAKER_FAILURES", default="3"))
+        breaker_latency = get_variable("RP_CIRCUIT_BREAKER_LATENCY")
+        self.circuit_breaker_latency = float(breaker_latency) if breaker_latency else None
+        recovery_interval = get_variable("RP_CIRCUIT_BREAKER_RECOVERY_INTERVAL")
+        self.circuit_breaker_recovery_interval = float(recovery_interval) if recovery_interval else None
+        self.circuit_breaker_journal = get_variable("RP_CIRCUIT_BREAKER_JOURNAL") or get_process_file_path(
+            "reportportal_journal"
+        )
 
         self.launch_uuid_print = to_bool(get_variable("RP_LAUNCH_UUID_PRINT", default="False"))
         output_type = get_variable("RP_LAUNCH_UUID_PRINT_OUTPUT")
         self.launch_uuid_print_output = OutputType[output_type.upper()] if output_type else None
         client_type = get_variable("RP_CLIENT_TYPE")
         self.client_type = ClientType[client_type.upper()] if client_type else ClientType.SYNC
+        self.sink_type = SinkType[get_variable("RP_SINK_TYPE", default="CLIENT").upper()]
+        self.spool_file = get_variable("RP_SPOOL_FILE") or get_process_file_path("reportportal_spool")
+        self.aggregator_socket = get_variable("RP_AGGREGATOR_SOCKET")
+        self.aggregator_idle_timeout = float(get_variable("RP_AGGREGATOR_IDLE_TIMEOUT", default="5"))
         connect_timeout = get_variable("RP_CONNECT_TIMEOUT")
         connect_timeout = float(connect_timeout) if connect_timeout else None
 
@@ -142,6 +234,20 @@ class Variables:
 
         self.remove_keywords = to_bool(get_variable("RP_REMOVE_KEYWORDS", default="False"))
         self.flatten_keywords = to_bool(get_variable("RP_FLATTEN_KEYWORDS", default="False"))
+        max_keyword_depth = get_variable("RP_MAX_KEYWORD_DEPTH")
+        self.max_keyword_depth = int(max_keyword_depth) if max_keyword_depth else None
+        self.keywords_as_logs = to_bool(get_variable("RP_KEYWORDS_AS_LOGS", default="False"))
+        self.skip_empty_suites = to_bool(get_variable("RP_SKIP_EMPTY_SUITES", default="False"))
+        self.metrics = to_bool(get_variable("RP_METRICS", default="False"))
+        self.metrics_file = get_variable("RP_METRICS_FILE")
+        self.profile = to_bool(get_variable("RP_PROFILE", default="False"))
+        self.profile_stats_file = get_variable("RP_PROFILE_STATS_FILE")
+        self.record_events = get_variable("RP_RECORD_EVENTS")
+        listener_time_budget = get_variable("RP_LISTENER_TIME_BUDGET")
+        self.listener_time_budget = float(listener_time_budget) if listener_time_budget else None
+        self.listener_queue_size = int(get_variable("RP_LISTENER_QUEUE_SIZE", default="1000"))
+        passed_detail_sample_rate = get_variable("RP_PASSED_DETAIL_SAMPLE_RATE")
+        self.passed_detail_sample_rate = float(passed_detail_sample_rate) if passed_detail_sample_rate else None
 
         # API key auth parameter
         self.api_key = get_variable("RP_API_KEY")
@@ -153,6 +259,8 @@ class Variables:
         self.oauth_client_id = get_variable("RP_OAUTH_CLIENT_ID")
         self.oauth_client_secret = get_variable("RP_OAUTH_CLIENT_SECRET")
         self.oauth_scope = get_variable("RP_OAUTH_SCOPE")
+        self.oauth_token_cache = to_bool(get_variable("RP_OAUTH_TOKEN_CACHE", default="False"))
+        self.oauth_token_cache_file = get_variable("RP_OAUTH_TOKEN_CACHE_FILE")
 
         self.debug_mode = to_bool(get_variable("RP_DEBUG_MODE", default="False"))
 
@@ -186,6 +294,25 @@ class Variables:
             self._pabot_used = get_variable(name="PABOTLIBURI")
         return self._pabot_used
 
+    @property
+    def pabot_caller_id(self) -> Optional[str]:
+        """Get ID pabot gave to the current Robot Framework executor.
+
+        :return: Caller ID to hold Pabotlib locks with
+        """
+        return get_variable(name="CALLER_ID")
+
+    @property
+    def pabot_is_last_execution(self) -> Optional[bool]:
+        """Check if pabot had no more items to run when it started the current executor.
+
+        :return: True if it's the last execution in the pool or None if pabot does not pass the flag
+        """
+        is_last_execution = get_variable(name="PABOTISLASTEXECUTIONINPOOL")
+        if is_last_execution is None:
+            return None
+        return str(is_last_execution) != "0"
+
     @property
     def verify_ssl(self) -> Union[bool, str]:
         """Get value of the verify_ssl parameter for the client."""
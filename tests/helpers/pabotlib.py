@@ -0,0 +1,81 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+"""This module contains a stand-in of PabotLib remote server, which pabot starts for its workers."""
+
+import threading
+from typing import Any, Dict, List, Tuple
+from xmlrpc.server import SimpleXMLRPCRequestHandler, SimpleXMLRPCServer
+
+
+class _QuietHandler(SimpleXMLRPCRequestHandler):
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class PabotLibStub:
+    """Remote server with locks and shared values of PabotLib, keywords are run the way Robot remote server does."""
+
+    values: Dict[str, Any]
+    locks: Dict[str, Tuple[str, int]]
+    calls: List[str]
+
+    def __init__(self) -> None:
+        self.values = {}
+        self.locks = {}
+        self.calls = []
+        self._lock = threading.Lock()
+        self._server = SimpleXMLRPCServer(
+            ("127.0.0.1", 0), requestHandler=_QuietHandler, allow_none=True, logRequests=False
+        )
+        self._server.register_function(self.run_keyword)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def uri(self) -> str:
+        host, port = self._server.server_address
+        return f"{host}:{port}"
+
+    def run_keyword(self, name: str, args: List[Any], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.calls.append(name)
+            if name == "acquire_lock":
+                lock_name, caller_id = args
+                owner, count = self.locks.get(lock_name, (caller_id, 0))
+                if owner != caller_id:
+                    return {"status": "PASS", "return": False}
+                self.locks[lock_name] = (caller_id, count + 1)
+                return {"status": "PASS", "return": True}
+            if name == "release_lock":
+                lock_name, caller_id = args
+                owner, count = self.locks[lock_name]
+                if count > 1:
+                    self.locks[lock_name] = (owner, count - 1)
+                else:
+                    del self.locks[lock_name]
+                return {"status": "PASS", "return": ""}
+            if name == "set_parallel_value_for_key":
+                self.values[args[0]] = args[1]
+                return {"status": "PASS", "return": ""}
+            if name == "get_parallel_value_for_key":
+                return {"status": "PASS", "return": self.values.get(args[0], "")}
+            return {"status": "FAIL", "error": f"No keyword with name '{name}' found."}
+
+    def __enter__(self) -> "PabotLibStub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
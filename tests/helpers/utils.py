@@ -39,7 +39,9 @@ def run_robot_tests(
     if arguments:
         for k, v in arguments.items():
             cmd_arguments.append(k)
-            cmd_arguments.append(v)
+            # Options without a value, e.g. flags, are passed with None
+            if v is not None:
+                cmd_arguments.append(v)
 
     if variables is None:
         variables = DEFAULT_VARIABLES
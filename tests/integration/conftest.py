@@ -14,6 +14,11 @@
 
 """This module contains common Pytest fixtures and hooks for unit tests."""
 
+import pytest
+
+from benchmarks.server import MockReportPortalServer
+from tests.helpers.pabotlib import PabotLibStub
+
 KEYWORDS_EXPECTED_TEST_NAMES = ["Invalid Password"]
 KEYWORDS_EXPECTED_CODE_REF_SUFFIXES = ["6"] * 6
 
@@ -51,3 +56,17 @@ def pytest_generate_tests(metafunc):
             ),
         ]
         metafunc.parametrize(func_options, option_args)
+
+
+@pytest.fixture
+def rp_server():
+    """Local stand-in ReportPortal server which records received requests."""
+    with MockReportPortalServer(record=True) as server:
+        yield server
+
+
+@pytest.fixture
+def pabot_lib():
+    """Local stand-in PabotLib remote server with locks and shared values."""
+    with PabotLibStub() as server:
+        yield server
@@ -0,0 +1,42 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import time
+
+from benchmarks.server import ITEM_START_PATH, LAUNCH_FINISH_PATH, LAUNCH_START_PATH, LOG_PATH
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+def test_workers_report_through_aggregator(rp_server, tmp_path):
+    socket_path = tmp_path / "rp.sock"
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_ENDPOINT"] = rp_server.endpoint
+    variables["RP_SINK_TYPE"] = "AGGREGATOR"
+    variables["RP_AGGREGATOR_SOCKET"] = str(socket_path)
+    variables["RP_AGGREGATOR_IDLE_TIMEOUT"] = 0.5
+    for _ in range(2):
+        assert utils.run_robot_tests(["examples/simple.robot"], variables=variables) == 0
+    assert socket_path.exists()
+
+    deadline = time.monotonic() + 10
+    while socket_path.exists() and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert not socket_path.exists()
+
+    assert len(rp_server.get_requests("POST", LAUNCH_START_PATH)) == 2
+    assert len(rp_server.get_requests("PUT", LAUNCH_FINISH_PATH)) == 2
+    assert len(rp_server.get_requests("POST", ITEM_START_PATH)) == 6
+    assert rp_server.get_statistics()["logs"] == 2
+    assert len(rp_server.get_requests("POST", LOG_PATH)) == 2
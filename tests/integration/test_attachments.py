@@ -12,8 +12,13 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import gzip
+import io
+import zipfile
 from unittest import mock
 
+import pytest
+
 from tests import REPORT_PORTAL_SERVICE
 from tests.helpers import utils
 
@@ -65,3 +70,27 @@ def test_agent_attaches_xunit(mock_client_init):
         ["examples/templates/settings.robot"], variables=variables, arguments={"-x": XUNIT_FILE_NAME}
     )
     verify_attachment(mock_client_init, result, "XUnit result file", XUNIT_FILE_NAME, "application/xml")
+
+
+@pytest.mark.parametrize(
+    "compression, name, content_type",
+    [("gzip", "log.html.gz", "application/gzip"), ("zip", "log.html.zip", "application/zip")],
+)
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_agent_attaches_compressed_log(mock_client_init, compression, name, content_type, tmp_path):
+    variables = utils.DEFAULT_VARIABLES.copy()
+    variables["RP_ATTACH_LOG"] = True
+    variables["RP_ATTACH_COMPRESSION"] = compression
+    result = utils.run_robot_tests(
+        ["examples/templates/settings.robot"], variables=variables, arguments={"--outputdir": str(tmp_path)}
+    )
+    verify_attachment(mock_client_init, result, "Execution log", name, content_type)
+
+    data = utils.get_launch_log_calls(mock_client_init.return_value)[0][1]["attachment"]["data"]
+    if compression == "gzip":
+        content = gzip.decompress(data)
+    else:
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            assert zf.namelist() == ["log.html"]
+            content = zf.read("log.html")
+    assert content == (tmp_path / "log.html").read_bytes()
@@ -0,0 +1,27 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from benchmarks.run import run_benchmark
+from benchmarks.suites import SuiteShape
+
+
+def test_benchmark_run(tmp_path):
+    results = run_benchmark(SuiteShape(tests=2, depth=1, logs=1), work_dir=str(tmp_path))
+
+    # 2 suite, 4 test, 4 user keyword, 4 'Log' keyword events and 2 log messages
+    assert results["events"] == 16
+    # Launch, suite, 2 tests, 2 user keywords, 2 'Log' keywords start and finish, and a log batch
+    assert results["requests"] == 17
+    assert results["events_per_second"] > 0
+    assert results["agent_overhead_per_event_us"] is not None
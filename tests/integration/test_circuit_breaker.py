@@ -0,0 +1,71 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import time
+
+from benchmarks.server import ITEM_START_PATH, LAUNCH_FINISH_PATH, LAUNCH_START_PATH, MockReportPortalServer
+from robotframework_reportportal.sinks import read_spool
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+def test_reported_to_journal_when_server_fails(tmp_path):
+    journal_file = tmp_path / "journal.jsonl"
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_CIRCUIT_BREAKER"] = True
+    variables["RP_CIRCUIT_BREAKER_JOURNAL"] = str(journal_file)
+    with MockReportPortalServer(error_rate=1, error_status=400) as server:
+        variables["RP_ENDPOINT"] = server.endpoint
+        start = time.monotonic()
+        result = utils.run_robot_tests(["examples/simple.robot"], variables=variables)
+        assert result == 0
+        assert time.monotonic() - start < 10
+        # Launch, suite and test starts failed before the circuit opened
+        assert server.get_statistics()["requests"] == 3
+
+    calls = list(read_spool(str(journal_file)))
+    assert calls[-1][0] == "finish_launch"
+    # The third failed call opened the circuit and was made on the journal
+    item_starts = [request["name"] for method, request in calls if method == "start_test_item"]
+    assert item_starts[0] == "Simple test"
+
+
+def test_journal_backfilled_on_recovery(rp_server, tmp_path):
+    journal_file = tmp_path / "journal.jsonl"
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_ENDPOINT"] = rp_server.endpoint
+    variables["RP_CIRCUIT_BREAKER"] = True
+    variables["RP_CIRCUIT_BREAKER_FAILURES"] = 1
+    variables["RP_CIRCUIT_BREAKER_RECOVERY_INTERVAL"] = 0
+    variables["RP_CIRCUIT_BREAKER_JOURNAL"] = str(journal_file)
+    rp_server.error_rate = 1
+    rp_server.error_status = 400
+    handle = rp_server.handle
+
+    def fail_once(*args):
+        # Only the launch start fails, so the circuit is opened on it and closed on the next call
+        response = handle(*args)
+        rp_server.error_rate = 0
+        return response
+
+    rp_server.handle = fail_once
+    result = utils.run_robot_tests(["examples/simple.robot"], variables=variables)
+    assert result == 0
+
+    launch_starts = rp_server.get_requests("POST", LAUNCH_START_PATH)
+    assert [r.status for r in launch_starts] == [400, 201]
+    item_starts = rp_server.get_requests("POST", ITEM_START_PATH)
+    assert [r.body["name"] for r in item_starts][:2] == ["Simple", "Simple test"]
+    assert all(r.status < 300 for r in item_starts)
+    assert [r.status for r in rp_server.get_requests("PUT", LAUNCH_FINISH_PATH)] == [200]
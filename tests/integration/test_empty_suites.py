@@ -0,0 +1,33 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pytest
+
+from benchmarks.server import ITEM_FINISH_PATH, ITEM_START_PATH, LAUNCH_FINISH_PATH, LAUNCH_START_PATH
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+@pytest.mark.parametrize("skip_empty_suites, expected_items", [(False, 1), (True, 0)])
+def test_empty_suite_reporting(rp_server, tmp_path, skip_empty_suites, expected_items):
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_ENDPOINT"] = rp_server.endpoint
+    variables["RP_SKIP_EMPTY_SUITES"] = skip_empty_suites
+    arguments = {"--include": "no_such_tag", "--runemptysuite": None, "--outputdir": str(tmp_path)}
+    assert utils.run_robot_tests(["examples/simple.robot"], variables=variables, arguments=arguments) == 0
+
+    assert len(rp_server.get_requests("POST", LAUNCH_START_PATH)) == 1
+    assert len(rp_server.get_requests("PUT", LAUNCH_FINISH_PATH)) == 1
+    assert len(rp_server.get_requests("POST", ITEM_START_PATH)) == expected_items
+    assert len(rp_server.get_requests("PUT", ITEM_FINISH_PATH)) == expected_items
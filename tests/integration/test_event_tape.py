@@ -0,0 +1,55 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import json
+from unittest import mock
+
+from benchmarks.replay import replay
+from robotframework_reportportal.recorder import read_events
+from tests import REPORT_PORTAL_SERVICE
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_record_and_replay(mock_client_init, tmp_path):
+    mock_client = mock_client_init.return_value
+    mock_client.start_test_item.side_effect = utils.item_id_gen
+
+    tape = tmp_path / "events.jsonl"
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_RECORD_EVENTS"] = str(tape)
+    result = utils.run_robot_tests(["examples/screenshot.robot"], variables=variables)
+    assert result == 0
+
+    events = [event for event, _, _, _ in read_events(str(tape))]
+    assert events[0] == "start_suite"
+    assert events[-1] == "close"
+    assert events.count("start_keyword") == events.count("end_keyword") == 2
+
+    spool = tmp_path / "spool.jsonl"
+    results = replay(str(tape), "spool", {"RP_SPOOL_FILE": str(spool)})
+    assert results["events"] == len(events)
+
+    with open(spool) as f:
+        calls = [json.loads(line) for line in f]
+    methods = [call["method"] for call in calls]
+    assert methods.count("start_test_item") == mock_client.start_test_item.call_count
+    assert methods.count("finish_test_item") == mock_client.finish_test_item.call_count
+    logs = [call for call in calls if call["method"] == "log"]
+    assert len(logs) == mock_client.log.call_count
+    assert [log["attachment"]["name"] for log in logs] == [
+        "selenium-screenshot-1.png",
+        "Screenshot_test_FAILURE_SCREENSHOT_1.png",
+    ]
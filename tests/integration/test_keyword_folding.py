@@ -0,0 +1,82 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import re
+from unittest import mock
+
+import pytest
+
+from tests import REPORT_PORTAL_SERVICE
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+@pytest.mark.parametrize(
+    "file, max_depth, exit_code, expected_statuses, log_number",
+    [
+        ("examples/for_keyword.robot", 0, 0, ["PASSED"] * 2, 7),
+        ("examples/for_keyword.robot", 1, 0, ["PASSED"] * 3, 7),
+        ("examples/for_keyword.robot", 2, 0, ["PASSED"] * 6, 9),
+        ("examples/for_keyword.robot", 3, 0, ["PASSED"] * 9, 3),
+        ("examples/for_keyword_failed.robot", 1, 1, ["FAILED"] * 3, 7),
+    ],
+)
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_max_keyword_depth(mock_client_init, file, max_depth, exit_code, expected_statuses, log_number):
+    mock_client = mock_client_init.return_value
+    mock_client.start_test_item.side_effect = utils.item_id_gen
+
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_MAX_KEYWORD_DEPTH"] = max_depth
+    result = utils.run_robot_tests([file], variables=variables)
+    assert result == exit_code
+
+    item_start_calls = mock_client.start_test_item.call_args_list
+    item_finish_calls = mock_client.finish_test_item.call_args_list
+    assert len(item_start_calls) == len(item_finish_calls)
+    statuses = [finish[1]["status"] for finish in item_finish_calls]
+    assert statuses == expected_statuses
+
+    log_calls = utils.get_log_calls(mock_client)
+    assert len(log_calls) == log_number
+    if max_depth < 3:
+        messages = [c[1]["message"] for c in log_calls]
+        assert messages[0].startswith("Keyword started: ")
+        assert re.match(r"^Keyword finished \[(PASS|FAIL)] in \d+ ms: ", messages[-1].split("\n")[-1])
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_keywords_as_logs(mock_client_init):
+    mock_client = mock_client_init.return_value
+    mock_client.start_test_item.side_effect = utils.item_id_gen
+
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_KEYWORDS_AS_LOGS"] = True
+    result = utils.run_robot_tests(["examples/before_after/before_suite_with_steps.robot"], variables=variables)
+    assert result == 0
+
+    item_start_calls = mock_client.start_test_item.call_args_list
+    assert [c[1]["item_type"] for c in item_start_calls] == ["SUITE", "STEP"]
+    suite_id, test_id = [c[1]["name"] for c in item_start_calls]
+
+    log_calls = utils.get_log_calls(mock_client)
+    assert [c[1]["item_id"].startswith(suite_id) for c in log_calls] == [True] * 3 + [False] * 3
+    assert log_calls[0][1]["message"] == (
+        "Keyword started: SETUP Log suite setup ()\n    Keyword started: KEYWORD BuiltIn.Log (Suite setup step)"
+    )
+    assert re.match(
+        r"^    Keyword finished \[PASS] in \d+ ms: KEYWORD BuiltIn.Log \(Suite setup step\)\n"
+        r"Keyword finished \[PASS] in \d+ ms: SETUP Log suite setup \(\)$",
+        log_calls[2][1]["message"],
+    )
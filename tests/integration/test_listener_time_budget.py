@@ -0,0 +1,41 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import time
+
+from benchmarks.server import LAUNCH_FINISH_PATH, LOG_PATH, MockReportPortalServer
+from benchmarks.suites import SuiteShape, generate_suite
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+def test_slow_server_calls_finished_in_background(tmp_path, capfd):
+    suite = generate_suite(str(tmp_path), SuiteShape(tests=3, depth=1, logs=2))
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_LOG_BATCH_SIZE"] = 1
+    variables["RP_LISTENER_TIME_BUDGET"] = 0.005
+    with MockReportPortalServer(latency=0.05, record=True) as server:
+        variables["RP_ENDPOINT"] = server.endpoint
+        start = time.monotonic()
+        result = utils.run_robot_tests([suite], variables=variables)
+        assert result == 0
+        assert time.monotonic() - start < 30
+
+        assert server.get_statistics()["logs"] == len(server.get_requests("POST", LOG_PATH)) == 6
+        assert server.get_requests("PUT", LAUNCH_FINISH_PATH)
+
+    output = capfd.readouterr().out
+    assert "ReportPortal listener time budget:" in output
+    assert "calls exceeded 5 ms and were finished in background" in output
+    assert "start_test: 3" in output
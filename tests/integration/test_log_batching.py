@@ -0,0 +1,42 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import json
+
+from benchmarks.server import LOG_PATH
+from benchmarks.suites import SuiteShape, generate_suite
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+def test_adaptive_log_batching(rp_server, tmp_path):
+    suite = generate_suite(str(tmp_path), SuiteShape(tests=2, depth=1, logs=40))
+    metrics_file = tmp_path / "metrics.json"
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_ENDPOINT"] = rp_server.endpoint
+    variables["RP_LOG_BATCH_ADAPTIVE"] = True
+    variables["RP_LOG_BATCH_SIZE"] = 2
+    variables["RP_LOG_BATCH_MAX_SIZE"] = 16
+    variables["RP_METRICS_FILE"] = str(metrics_file)
+    result = utils.run_robot_tests([suite], variables=variables)
+    assert result == 0
+
+    batch_sizes = [len(r.body) for r in rp_server.get_requests("POST", LOG_PATH)]
+    assert sum(batch_sizes) == 80
+    assert max(batch_sizes) == 16
+    batching = json.loads(metrics_file.read_text())["log_batching"]
+    assert batching["entry_num"] == 16
+    assert batching["entries"] == 80
+    assert batching["batches"] == len(batch_sizes)
+    assert batching["adjustments"] == 3
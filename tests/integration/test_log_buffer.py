@@ -0,0 +1,51 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from benchmarks.server import ITEM_FINISH_PATH, LOG_PATH
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+SUITE = """*** Test Cases ***
+Passed Test
+    FOR    ${i}    IN RANGE    3
+        Log    Passed message ${i}
+    END
+
+Failed Test
+    FOR    ${i}    IN RANGE    3
+        Log    Failed message ${i}
+    END
+    Fail    Test failure
+"""
+
+
+def test_failed_test_logs_sent_before_finish(rp_server, tmp_path):
+    suite = tmp_path / "log_buffer.robot"
+    suite.write_text(SUITE)
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_ENDPOINT"] = rp_server.endpoint
+    variables["RP_LOG_BUFFER"] = True
+    variables["RP_LOG_BATCH_SIZE"] = 50
+    result = utils.run_robot_tests([str(suite)], variables=variables)
+    assert result == 1
+
+    requests = [r for r in rp_server.requests if LOG_PATH.match(r.path) or ITEM_FINISH_PATH.match(r.path)]
+    log_batches = [i for i, r in enumerate(requests) if LOG_PATH.match(r.path)]
+    assert len(log_batches) == 1
+    messages = [log["message"] for log in requests[log_batches[0]].body]
+    assert messages[:3] == [f"Passed message {i}" for i in range(3)]
+    assert messages[3:6] == [f"Failed message {i}" for i in range(3)]
+    # The batch goes right before the failed test and suite finishes, after all the keyword finishes
+    assert log_batches[0] == len(requests) - 3
+    assert [r.body["status"] for r in requests[-2:]] == ["FAILED", "FAILED"]
@@ -0,0 +1,33 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from benchmarks.server import LAUNCH_FINISH_PATH, LOG_PATH
+from benchmarks.suites import SuiteShape, generate_suite
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+def test_logs_sent_on_log_lane(rp_server, tmp_path):
+    suite = generate_suite(str(tmp_path), SuiteShape(tests=3, depth=1, logs=5, attachments=1, attachment_size=1024))
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_ENDPOINT"] = rp_server.endpoint
+    variables["RP_LOG_BATCH_SIZE"] = 1
+    variables["RP_LOG_LANE_WORKERS"] = 1
+    result = utils.run_robot_tests([suite], variables=variables)
+    assert result == 0
+
+    log_requests = rp_server.get_requests("POST", LOG_PATH)
+    assert len(log_requests) == rp_server.get_statistics()["logs"] == 21
+    assert len([f for r in log_requests for f in r.files]) == 3
+    assert LAUNCH_FINISH_PATH.match(rp_server.requests[-1].path)
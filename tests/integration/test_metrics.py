@@ -0,0 +1,42 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import json
+from unittest import mock
+
+from tests import REPORT_PORTAL_SERVICE
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_metrics_file(mock_client_init, tmp_path, capfd):
+    mock_client = mock_client_init.return_value
+    mock_client.start_test_item.side_effect = utils.item_id_gen
+
+    metrics_file = tmp_path / "metrics.json"
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_METRICS_FILE"] = str(metrics_file)
+    result = utils.run_robot_tests(["examples/simple.robot"], variables=variables)
+    assert result == 0
+
+    metrics = json.loads(metrics_file.read_text())
+    methods = metrics["methods"]
+    assert methods["start_launch"]["count"] == methods["finish_launch"]["count"] == 1
+    assert methods["start_test"]["count"] == methods["finish_test"]["count"] == 1
+    assert methods["log"]["count"] == len(utils.get_log_calls(mock_client))
+    assert methods["log"]["payload_bytes"] > 0
+    assert metrics["count"] == sum(m["count"] for m in methods.values())
+    assert metrics["errors"] == 0
+    assert "ReportPortal calls:" in capfd.readouterr().out
@@ -0,0 +1,67 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import time
+
+from reportportal_client import RPClient
+
+from benchmarks.server import ITEM_START_PATH, LOG_PATH, MockReportPortalServer, read_recording
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+def test_screenshot_requests(rp_server):
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_ENDPOINT"] = rp_server.endpoint
+    result = utils.run_robot_tests(["examples/screenshot.robot"], variables=variables)
+    assert result == 0
+
+    item_starts = rp_server.get_requests("POST", ITEM_START_PATH)
+    assert [r.body["type"] for r in item_starts] == ["SUITE", "STEP", "STEP", "STEP", "STEP"]
+    assert [r.body["name"] for r in item_starts[:2]] == ["Screenshot", "Selenium Screenshot test"]
+    log_requests = rp_server.get_requests("POST", LOG_PATH)
+    files = [f for r in log_requests for f in r.files]
+    assert [f.name for f in files] == ["selenium-screenshot-1.png", "Screenshot_test_FAILURE_SCREENSHOT_1.png"]
+    with open("examples/res/selenium-screenshot-1.png", "rb") as f:
+        assert files[0].data == f.read()
+    assert all(r.status < 300 for r in rp_server.requests)
+    assert rp_server.get_statistics()["logs"] == sum(len(r.body) for r in log_requests)
+
+
+def test_error_injection_and_rate_limit():
+    with MockReportPortalServer(error_rate=1, max_rps=20) as server:
+        client = RPClient(server.endpoint, "default_personal", api_key="test_api_key", retries=0)
+        start = time.monotonic()
+        assert client.start_launch("Launch", "1621947055434") is None
+        assert client.start_launch("Launch", "1621947055434") is None
+        assert client.start_launch("Launch", "1621947055434") is None
+        assert time.monotonic() - start >= 0.1
+        client.close()
+    assert server.get_statistics() == {"requests": 3, "errors": 3, "logs": 0}
+
+
+def test_requests_recorded_into_file(tmp_path):
+    record_file = str(tmp_path / "requests.jsonl")
+    with MockReportPortalServer(record_file=record_file) as server:
+        variables = DEFAULT_VARIABLES.copy()
+        variables["RP_ENDPOINT"] = server.endpoint
+        assert utils.run_robot_tests(["examples/screenshot.robot"], variables=variables) == 0
+
+    requests = read_recording(record_file)
+    item_starts = [r for r in requests if r.method == "POST" and ITEM_START_PATH.match(r.path)]
+    assert [r.body["name"] for r in item_starts[:2]] == ["Screenshot", "Selenium Screenshot test"]
+    files = [f for r in requests if LOG_PATH.match(r.path) for f in r.files]
+    with open("examples/res/selenium-screenshot-1.png", "rb") as f:
+        assert files[0].data == f.read()
+    assert server.get_statistics()["requests"] == len(requests)
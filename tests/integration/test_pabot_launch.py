@@ -0,0 +1,113 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from benchmarks.server import ITEM_FINISH_PATH, ITEM_START_PATH, LAUNCH_FINISH_PATH, LAUNCH_START_PATH
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+SPLIT_SUITE = """*** Test Cases ***
+First
+    Log    First test
+
+Second
+    Fail    Second test
+
+Third
+    Log    Third test
+"""
+
+
+def run_worker(rp_server, pabot_lib, index, is_last, tests=None, arguments=None, extra_variables=None):
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_ENDPOINT"] = rp_server.endpoint
+    variables["RP_PABOT_LAUNCH_COORDINATION"] = True
+    variables["PABOTLIBURI"] = pabot_lib.uri
+    variables["PABOTEXECUTIONPOOLID"] = index
+    variables["PABOTISLASTEXECUTIONINPOOL"] = int(is_last)
+    variables["CALLER_ID"] = f"caller-{index}"
+    variables.update(extra_variables or {})
+    return utils.run_robot_tests(tests or ["examples/simple.robot"], variables=variables, arguments=arguments)
+
+
+def test_workers_share_launch(rp_server, pabot_lib):
+    for index, is_last in enumerate([False, False, True]):
+        assert run_worker(rp_server, pabot_lib, index, is_last) == 0
+        # The launch is finished only by the last worker
+        assert len(rp_server.get_requests("PUT", LAUNCH_FINISH_PATH)) == int(is_last)
+
+    launch_starts = rp_server.get_requests("POST", LAUNCH_START_PATH)
+    assert len(launch_starts) == 1
+    launch_uuid = pabot_lib.values["reportportal_launch_uuid"]
+    assert launch_uuid in rp_server.get_requests("PUT", LAUNCH_FINISH_PATH)[0].path
+    item_starts = rp_server.get_requests("POST", ITEM_START_PATH)
+    assert len(item_starts) == 9
+    assert {request.body["launchUuid"] for request in item_starts} == {launch_uuid}
+    assert pabot_lib.values["reportportal_launch_workers"] == "0"
+    assert not pabot_lib.locks
+
+
+def test_own_launch_started_without_pabot_lib(rp_server, pabot_lib):
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_ENDPOINT"] = rp_server.endpoint
+    variables["RP_PABOT_LAUNCH_COORDINATION"] = True
+    variables["PABOTLIBURI"] = "127.0.0.1:1"
+    variables["PABOTEXECUTIONPOOLID"] = 0
+    assert utils.run_robot_tests(["examples/simple.robot"], variables=variables) == 0
+    assert len(rp_server.get_requests("POST", LAUNCH_START_PATH)) == 1
+    assert len(rp_server.get_requests("PUT", LAUNCH_FINISH_PATH)) == 1
+
+
+def test_workers_share_split_suites(rp_server, pabot_lib, tmp_path):
+    suite_dir = tmp_path / "split"
+    suite_dir.mkdir()
+    (suite_dir / "tests.robot").write_text(SPLIT_SUITE)
+    finishes_before_last = 0
+    for index, (test, is_last) in enumerate([("First", False), ("Second", False), ("Third", True)]):
+        if is_last:
+            finishes_before_last = len(rp_server.get_requests("PUT", ITEM_FINISH_PATH))
+        variables = {"RP_PABOT_SHARED_SUITES": True}
+        run_worker(rp_server, pabot_lib, index, is_last, [str(suite_dir)], {"--test": test}, variables)
+
+    item_starts = rp_server.get_requests("POST", ITEM_START_PATH)
+    suite_starts = [request for request in item_starts if request.body["type"] == "SUITE"]
+    assert [request.body["name"] for request in suite_starts] == ["Split", "Tests"]
+    root_uuid = suite_starts[1].path.rsplit("/", 1)[-1]
+    test_starts = [request for request in item_starts if request.body["name"] in ("First", "Second", "Third")]
+    suite_uuid = test_starts[0].path.rsplit("/", 1)[-1]
+    # Tests of all the workers are reported to the same suite, which has no pool ID suffix
+    assert {request.path.rsplit("/", 1)[-1] for request in test_starts} == {suite_uuid}
+
+    item_finishes = rp_server.get_requests("PUT", ITEM_FINISH_PATH)
+    suite_finishes = [
+        request for request in item_finishes if request.path.rsplit("/", 1)[-1] in (root_uuid, suite_uuid)
+    ]
+    # Suites are finished once, by the last worker, with the status of the failed part
+    assert [request.path.rsplit("/", 1)[-1] for request in suite_finishes] == [suite_uuid, root_uuid]
+    assert item_finishes.index(suite_finishes[0]) >= finishes_before_last
+    assert {request.body["status"] for request in suite_finishes} == {"FAILED"}
+    assert not [key for key, value in pabot_lib.values.items() if key.startswith("reportportal_suite:") and value]
+    assert not pabot_lib.locks
+
+
+def test_launch_not_shared_without_last_execution_flag(rp_server, pabot_lib):
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_ENDPOINT"] = rp_server.endpoint
+    variables["RP_PABOT_LAUNCH_COORDINATION"] = True
+    variables["PABOTLIBURI"] = pabot_lib.uri
+    variables["PABOTEXECUTIONPOOLID"] = 0
+    for _ in range(2):
+        assert utils.run_robot_tests(["examples/simple.robot"], variables=variables) == 0
+    assert len(rp_server.get_requests("POST", LAUNCH_START_PATH)) == 2
+    assert len(rp_server.get_requests("PUT", LAUNCH_FINISH_PATH)) == 2
+    assert not pabot_lib.values
@@ -0,0 +1,129 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+from unittest import mock
+
+import pytest
+
+from robotframework_reportportal.helpers import is_sampled
+from tests import REPORT_PORTAL_SERVICE
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+SUITE = """*** Test Cases ***
+Passed test
+    Log    Passed step
+    Log Many    One    Two
+
+Failed test
+    Log    Failed step
+    Fail    Failure
+
+Warning test
+    Log    Warning step
+    Log    Warning    WARN
+"""
+
+
+SCREENSHOT = os.path.abspath("examples/res/selenium-screenshot-1.png")
+NESTED_SUITE = f"""*** Test Cases ***
+Passed test
+    Nested keyword
+
+Failed test
+    FOR    ${{i}}    IN RANGE    150
+        Log    Message ${{i}}
+    END
+    Log    </td></tr><tr><td colspan="3"><a href="{SCREENSHOT}"><img src="{SCREENSHOT}" width="800px"></a>    html=True
+    Fail    Failure
+
+*** Keywords ***
+Nested keyword
+    Log    First
+    Log    Second
+"""
+
+
+def run_suite(tmp_path, sample_rate, suite_text=SUITE):
+    suite = tmp_path / "sampling.robot"
+    suite.write_text(suite_text, encoding="utf-8")
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_PASSED_DETAIL_SAMPLE_RATE"] = sample_rate
+    return utils.run_robot_tests([str(suite)], variables=variables)
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_passed_tests_outside_sample_reported_without_keywords(mock_client_init, tmp_path):
+    mock_client = mock_client_init.return_value
+    mock_client.start_test_item.side_effect = utils.item_id_gen
+
+    assert run_suite(tmp_path, 0.0) == 1
+
+    item_names = [call[1]["name"] for call in mock_client.start_test_item.call_args_list]
+    assert item_names == [
+        "Sampling",
+        "Passed test",
+        "Failed test",
+        "KEYWORD BuiltIn.Log (Failed step)",
+        "KEYWORD BuiltIn.Fail (Failure)",
+        "Warning test",
+        "KEYWORD BuiltIn.Log (Warning step)",
+        "KEYWORD BuiltIn.Log (Warning, WARN)",
+    ]
+    finish_calls = mock_client.finish_test_item.call_args_list
+    assert len(finish_calls) == len(item_names)
+    assert [call[1]["status"] for call in finish_calls][:4] == ["PASSED", "PASSED", "FAILED", "FAILED"]
+
+    messages = [call[1]["message"] for call in mock_client.log.call_args_list]
+    assert "Content of 2 keywords not reported, since the passed test is outside of the sample." in messages
+    assert "Failed step" in messages
+    assert "Passed step" not in messages
+    assert "Warning" in messages
+
+
+@pytest.mark.parametrize("sample_rate", [1.0, 0.5])
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_sampled_passed_tests_reported_with_keywords(mock_client_init, sample_rate, tmp_path):
+    mock_client = mock_client_init.return_value
+    mock_client.start_test_item.side_effect = utils.item_id_gen
+
+    assert run_suite(tmp_path, sample_rate) == 1
+
+    item_starts = mock_client.start_test_item.call_args_list
+    passed_test_case_id = next(call[1]["test_case_id"] for call in item_starts if call[1]["name"] == "Passed test")
+    passed_sampled = is_sampled(passed_test_case_id, sample_rate)
+    item_names = [call[1]["name"] for call in item_starts]
+    assert ("KEYWORD BuiltIn.Log Many (One, Two)" in item_names) is passed_sampled
+    messages = [call[1]["message"] for call in mock_client.log.call_args_list]
+    assert ("Passed step" in messages) is passed_sampled
+    assert "Failed step" in messages
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_nested_keywords_counted_and_failed_test_logs_kept_outside_sample(mock_client_init, tmp_path):
+    mock_client = mock_client_init.return_value
+    mock_client.start_test_item.side_effect = utils.item_id_gen
+
+    assert run_suite(tmp_path, 0.0, NESTED_SUITE) == 1
+
+    messages = [call[1]["message"] for call in mock_client.log.call_args_list]
+    assert "Content of 3 keywords not reported, since the passed test is outside of the sample." in messages
+    assert "First" not in messages
+    assert all(f"Message {i}" in messages for i in range(150))
+    assert "Failure" in messages
+    attachments = [call[1]["attachment"] for call in mock_client.log.call_args_list if call[1]["attachment"]]
+    assert [attachment["name"] for attachment in attachments] == ["selenium-screenshot-1.png"]
+    with open(SCREENSHOT, "rb") as f:
+        assert attachments[0]["data"] == f.read()
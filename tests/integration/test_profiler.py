@@ -0,0 +1,40 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pstats
+from unittest import mock
+
+from tests import REPORT_PORTAL_SERVICE
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_profile_stats_file(mock_client_init, tmp_path, capfd):
+    mock_client = mock_client_init.return_value
+    mock_client.start_test_item.side_effect = utils.item_id_gen
+
+    stats_file = tmp_path / "listener.pstats"
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_PROFILE_STATS_FILE"] = str(stats_file)
+    result = utils.run_robot_tests(["examples/simple.robot"], variables=variables)
+    assert result == 0
+
+    stats = pstats.Stats(str(stats_file))
+    functions = {function for _, _, function in stats.stats}
+    assert {"start_test", "end_test", "start_keyword", "log_message"} <= functions
+
+    output = capfd.readouterr().out
+    assert "ReportPortal listener overhead:" in output
+    assert "start_keyword" in output
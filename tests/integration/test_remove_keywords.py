@@ -190,9 +190,9 @@ def is_gha_agent() -> bool:
             "PASSED",
             0,
             ["PASSED"] * 4,
-            2,
+            1,
             0,
-            "Content removed using the --remove-keywords option.",
+            "Content of 2 keywords removed using the --remove-keywords option.",
         ),
         (
             "examples/wuks_keyword.robot",
@@ -217,9 +217,9 @@ def is_gha_agent() -> bool:
             "PASSED",
             0,
             ["PASSED"] * 4,
-            2,
             1,
-            "Content removed using the --remove-keywords option.",
+            0,
+            "Content of 2 keywords removed using the --remove-keywords option.",
         ),
         (
             "examples/for_keyword_failed.robot",
@@ -12,8 +12,11 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import io
 from unittest import mock
 
+import pytest
+
 from tests import REPORT_PORTAL_SERVICE
 from tests.helpers import utils
 
@@ -42,3 +45,25 @@ def test_screenshot_log(mock_client_init):
         assert attachment["mime"] == "image/png"
         with open(SCREENSHOTS[i], "rb") as file:
             assert attachment["data"] == file.read()
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_screenshot_downscale(mock_client_init):
+    image = pytest.importorskip("PIL.Image")
+    variables = utils.DEFAULT_VARIABLES.copy()
+    variables["RP_IMAGE_MAX_SIZE"] = "640x640"
+    variables["RP_IMAGE_FORMAT"] = "jpeg"
+    result = utils.run_robot_tests([EXAMPLE_TEST], variables=variables)
+    assert result == 0  # the test successfully passed
+
+    mock_client = mock_client_init.return_value
+    calls = utils.get_log_calls(mock_client)
+    assert len(calls) == 2
+
+    for i, call in enumerate(calls):
+        attachment = call[1]["attachment"]
+        assert attachment["name"] == SCREENSHOTS[i].split("/")[-1].replace(".png", ".jpg")
+        assert attachment["mime"] == "image/jpeg"
+        with image.open(io.BytesIO(attachment["data"])) as img:
+            assert img.format == "JPEG"
+            assert max(img.size) == 640
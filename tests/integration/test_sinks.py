@@ -0,0 +1,36 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import re
+from unittest import mock
+
+from tests import REPORT_PORTAL_SERVICE
+from tests.helpers import utils
+from tests.helpers.utils import DEFAULT_VARIABLES
+
+
+@mock.patch(REPORT_PORTAL_SERVICE)
+def test_null_sink(mock_client_init, capfd):
+    variables = DEFAULT_VARIABLES.copy()
+    variables["RP_SINK_TYPE"] = "NULL"
+    result = utils.run_robot_tests(["examples/simple.robot"], variables=variables)
+    assert result == 0
+
+    assert mock_client_init.call_count == 0
+    output = capfd.readouterr().out
+    summary = re.search(r"ReportPortal NULL sink: (\d+) calls \((.*)\), (\d+) bytes", output)
+    assert summary
+    assert int(summary.group(1)) == 9
+    assert summary.group(2) == "finish_launch: 1, finish_test_item: 3, log: 1, start_launch: 1, start_test_item: 3"
+    assert int(summary.group(3)) > 0
@@ -0,0 +1,155 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import stat
+import threading
+from unittest import mock
+
+import pytest
+
+from robotframework_reportportal.aggregator import AggregatorClient, AggregatorServer, get_socket_path
+from robotframework_reportportal.service import RobotService
+from robotframework_reportportal.sinks import SinkType
+
+CONFIG = {"endpoint": "http://localhost:8080", "project": "test", "api_key": "test", "http_timeout": [1, 2]}
+
+
+@pytest.fixture
+def aggregator(tmp_path):
+    with mock.patch("robotframework_reportportal.aggregator.RPClient") as client_class:
+        server = AggregatorServer(str(tmp_path / "rp.sock"), idle_timeout=0.1)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        yield server, client_class
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+
+def test_workers_share_session_and_batcher(aggregator):
+    server, client_class = aggregator
+    first_client, second_client = mock.Mock(), mock.Mock()
+    first_client.start_launch.return_value = "launch-1"
+    second_client.start_launch.return_value = "launch-2"
+    first_client.start_test_item.return_value = "item-1"
+    client_class.side_effect = [first_client, second_client]
+
+    first_worker = AggregatorClient(server.server_address, dict(CONFIG))
+    second_worker = AggregatorClient(server.server_address, dict(CONFIG))
+    assert first_worker.start_launch(name="Launch", start_time="1") == "launch-1"
+    assert second_worker.start_launch(name="Launch", start_time="1") == "launch-2"
+    assert first_worker.start_test_item(name="Test", start_time="2", item_type="TEST") == "item-1"
+    first_worker.log(time="3", message="Attachment", attachment={"name": "a.txt", "data": b"\x00\x01", "mime": "x"})
+    first_worker.close()
+    second_worker.close()
+
+    assert client_class.call_args_list[0][1]["http_timeout"] == (1, 2)
+    assert client_class.call_args_list[1][1]["log_batcher"] is first_client._log_batcher
+    assert second_client.session is first_client.session
+    assert first_client.log.call_args[1]["attachment"]["data"] == b"\x00\x01"
+    assert first_worker.errors == second_worker.errors == 0
+
+
+def test_workers_with_other_credentials_not_sharing_session(aggregator):
+    server, client_class = aggregator
+    first_client, second_client = mock.Mock(), mock.Mock()
+    first_client.start_launch.return_value = "launch-1"
+    second_client.start_launch.return_value = "launch-2"
+    client_class.side_effect = [first_client, second_client]
+
+    first_worker = AggregatorClient(server.server_address, dict(CONFIG))
+    second_worker = AggregatorClient(server.server_address, {**CONFIG, "api_key": "other"})
+    assert first_worker.start_launch(name="Launch", start_time="1") == "launch-1"
+    assert second_worker.start_launch(name="Launch", start_time="1") == "launch-2"
+    first_worker.close()
+    second_worker.close()
+
+    assert "log_batcher" not in client_class.call_args_list[1][1]
+    assert second_client.session is not first_client.session
+    assert len(server.session_clients) == 2
+
+
+def test_workers_share_given_launch(aggregator):
+    server, client_class = aggregator
+    client_class.return_value.start_launch.return_value = "launch-1"
+    workers = [AggregatorClient(server.server_address, {**CONFIG, "launch_uuid": "launch-1"}) for _ in range(3)]
+    for worker in workers:
+        assert worker.start_launch(name="Launch", start_time="1") == "launch-1"
+        worker.close()
+    assert client_class.call_count == 1
+
+
+def test_failed_call_returns_none(aggregator):
+    server, client_class = aggregator
+    worker = AggregatorClient(server.server_address, dict(CONFIG))
+    assert worker.start_test_item(name="Test", start_time="2", item_type="TEST") is None
+    worker.close()
+    assert worker.errors == 1
+    assert "before the launch start" in worker.last_error
+
+
+def test_stopped_when_idle(tmp_path):
+    server = AggregatorServer(str(tmp_path / "rp.sock"), idle_timeout=0.1)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    server.connect_worker()
+    server.disconnect_worker()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert not server.connect_worker()
+    server.server_close()
+    assert not (tmp_path / "rp.sock").exists()
+
+
+def test_default_socket_in_private_directory(tmp_path):
+    with mock.patch("tempfile.gettempdir", return_value=str(tmp_path)):
+        socket_path = get_socket_path("http://localhost:8080", "test")
+        directory = os.path.dirname(socket_path)
+        assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+        os.chmod(directory, 0o777)
+        with pytest.raises(ValueError):
+            get_socket_path("http://localhost:8080", "test")
+
+
+def test_daemon_of_another_user_rejected(aggregator):
+    server, client_class = aggregator
+    with mock.patch("os.getuid", return_value=os.getuid() + 1):
+        with pytest.raises(ValueError, match="belongs to another user"):
+            AggregatorClient(server.server_address, dict(CONFIG))
+    client_class.assert_not_called()
+
+
+def test_unsupported_options_ignored_with_warning(mock_variables, tmp_path, caplog):
+    mock_variables.sink_type = SinkType.AGGREGATOR
+    mock_variables.aggregator_socket = str(tmp_path / "rp.sock")
+    mock_variables.circuit_breaker = True
+    mock_variables.log_batch_adaptive = True
+    service = RobotService()
+    with mock.patch("robotframework_reportportal.aggregator.AggregatorClient") as client_init:
+        service.init_service(mock_variables)
+
+    assert service.rp is client_init.return_value
+    assert service.breaker is None
+    assert service.log_batcher is None
+    assert "does not support RP_CIRCUIT_BREAKER, RP_LOG_BATCH_ADAPTIVE" in caplog.text
+
+
+def test_client_sink_used_without_unix_sockets(mock_variables):
+    mock_variables.sink_type = SinkType.AGGREGATOR
+    service = RobotService()
+    with mock.patch("robotframework_reportportal.service.socket", spec=[]):
+        with mock.patch("robotframework_reportportal.service.create_client") as create_client:
+            service.init_service(mock_variables)
+    assert service.rp is create_client.return_value
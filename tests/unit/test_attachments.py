@@ -0,0 +1,67 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+from unittest import mock
+
+import pytest
+
+from robotframework_reportportal import attachments
+from robotframework_reportportal.attachments import CompressionType, FileCompressor, ImageProcessor
+
+SCREENSHOT = "examples/res/selenium-screenshot-1.png"
+
+
+@pytest.fixture
+def screenshot_attachment():
+    with open(SCREENSHOT, "rb") as f:
+        return {"name": "screenshot.png", "data": f.read(), "mime": "image/png"}
+
+
+def test_image_processor_keeps_small_image(screenshot_attachment):
+    pytest.importorskip("PIL")
+    processor = ImageProcessor((4096, 4096), None, 85)
+    assert processor.submit(screenshot_attachment).result() is screenshot_attachment
+    processor.shutdown()
+
+
+def test_image_processor_skips_non_images():
+    pytest.importorskip("PIL")
+    attachment = {"name": "file.txt", "data": b"text", "mime": "text/plain"}
+    processor = ImageProcessor((10, 10), "JPEG", 85)
+    assert processor.submit(attachment) is attachment
+
+
+def test_image_processor_broken_image():
+    pytest.importorskip("PIL")
+    attachment = {"name": "image.png", "data": b"not an image", "mime": "image/png"}
+    processor = ImageProcessor((10, 10), "JPEG", 85)
+    assert processor.process(attachment) is attachment
+
+
+def test_image_processor_without_pillow(screenshot_attachment):
+    with mock.patch.object(attachments, "Image", None):
+        with pytest.warns(RuntimeWarning):
+            processor = ImageProcessor((10, 10), "JPEG", 85)
+        assert processor.submit(screenshot_attachment) is screenshot_attachment
+
+
+def test_file_compressor_skips_too_large_file(tmp_path):
+    file_path = tmp_path / "output.xml"
+    file_path.write_bytes(os.urandom(4096))
+    compressor = FileCompressor(CompressionType.GZIP, 1024)
+    compressor.submit({"message": "Execution log"}, str(file_path))
+    with mock.patch.object(attachments, "logger") as mock_logger:
+        assert list(compressor.complete()) == []
+    assert "is not attached" in mock_logger.warning.call_args[0][0]
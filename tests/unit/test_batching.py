@@ -0,0 +1,105 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+from unittest import mock
+
+from robotframework_reportportal.batching import AdaptiveLogBatcher
+
+
+def append(batcher, number, size=100):
+    batches = []
+    for _ in range(number):
+        batch = batcher._append(size, mock.Mock())
+        if batch:
+            batches.append(batch)
+    return batches
+
+
+def test_batch_grows_on_fast_responses():
+    batcher = AdaptiveLogBatcher(2, 8, 1024 * 1024, 1.0)
+    for expected in (4, 8, 8):
+        assert len(append(batcher, batcher.entry_num)) == 1
+        batcher.observe_latency(0.01)
+        assert batcher.entry_num == expected
+    assert batcher.adjustments == 2
+
+
+def test_batch_shrinks_on_slow_responses():
+    batcher = AdaptiveLogBatcher(8, 8, 1024 * 1024, 1.0)
+    for expected in (4, 2, 1, 1):
+        assert len(append(batcher, batcher.entry_num)) == 1
+        batcher.observe_latency(1.5)
+        assert batcher.entry_num == expected
+
+
+def test_latency_of_calls_without_batch_ignored():
+    batcher = AdaptiveLogBatcher(4, 8, 1024 * 1024, 1.0)
+    assert append(batcher, 1) == []
+    batcher.observe_latency(0.01)
+    assert batcher.entry_num == 4
+    assert batcher.latency is None
+
+
+def test_batch_capped_by_entry_size():
+    batcher = AdaptiveLogBatcher(20, 100, 1000, 1.0)
+    batches = append(batcher, 10, size=300)
+    assert batcher.entry_num == 3
+    assert [len(b) for b in batches] == [3, 3, 3]
+    assert batcher.to_dict()["mean_entry_bytes"] == 300.0
+
+
+def test_time_budget_flush():
+    batcher = AdaptiveLogBatcher(20, 100, 1024 * 1024, 0.5)
+    with mock.patch("robotframework_reportportal.batching.time.monotonic", side_effect=[0.0, 0.1, 0.6]):
+        assert append(batcher, 2) == []
+        assert len(append(batcher, 1)[0]) == 3
+    assert batcher.flush() is None
+
+    assert append(batcher, 1) == []
+    assert len(batcher.flush()) == 1
+    result = batcher.to_dict()
+    assert result["batches"] == 2
+    assert result["entries"] == 4
+    assert result["mean_batch_entries"] == 2.0
+
+
+def test_latency_threshold_separate_from_time_budget():
+    batcher = AdaptiveLogBatcher(8, 8, 1024 * 1024, 5.0, 0.2)
+    assert len(append(batcher, batcher.entry_num)) == 1
+    batcher.observe_latency(0.5)
+    assert batcher.entry_num == 4
+    assert batcher.to_dict()["latency_threshold_ms"] == 200.0
+
+
+def test_latency_matched_by_thread():
+    batcher = AdaptiveLogBatcher(2, 8, 1024 * 1024, 1.0)
+    assert len(append(batcher, batcher.entry_num)) == 1
+
+    thread = threading.Thread(target=batcher.observe_latency, args=(0.01,))
+    thread.start()
+    thread.join()
+    assert batcher.entry_num == 2
+
+    batcher.observe_latency(0.01)
+    assert batcher.entry_num == 4
+
+
+def test_expired_batch_flush():
+    batcher = AdaptiveLogBatcher(20, 100, 1024 * 1024, 0.5)
+    with mock.patch("robotframework_reportportal.batching.time.monotonic", side_effect=[0.0, 0.1, 0.6]):
+        assert append(batcher, 1) == []
+        assert batcher.flush_expired() is None
+        assert len(batcher.flush_expired()) == 1
+    assert batcher.flush_expired() is None
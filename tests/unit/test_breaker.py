@@ -0,0 +1,51 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from unittest import mock
+
+from robotframework_reportportal.breaker import CircuitBreaker
+
+
+def test_opened_on_consecutive_failures():
+    breaker = CircuitBreaker(3)
+    assert not breaker.record(0.01, True)
+    assert not breaker.record(0.01, True)
+    assert not breaker.record(0.01, False)
+    assert not breaker.record(0.01, True)
+    assert not breaker.record(0.01, True)
+    assert breaker.record(0.01, True)
+    assert breaker.is_open
+    assert breaker.reason == "3 consecutive calls failed"
+    assert not breaker.should_probe()
+
+
+def test_opened_on_latency():
+    breaker = CircuitBreaker(3, latency_threshold=1.0)
+    for _ in range(9):
+        assert not breaker.record(2.0, False)
+    assert breaker.record(2.0, False)
+    assert breaker.reason == "95th latency percentile is 2000 ms"
+
+
+def test_probe_after_recovery_interval():
+    breaker = CircuitBreaker(1, recovery_interval=30)
+    with mock.patch("robotframework_reportportal.breaker.time.monotonic", side_effect=[100.0, 120.0, 131.0, 131.0]):
+        breaker.record(0.01, True)
+        assert not breaker.should_probe()
+        assert breaker.should_probe()
+        breaker.postpone_probe()
+    breaker.close()
+    assert not breaker.is_open
+    assert breaker.consecutive_failures == 0
+    assert breaker.trips == 1
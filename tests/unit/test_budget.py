@@ -0,0 +1,108 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+
+import pytest
+
+from robotframework_reportportal.budget import ListenerTimeBudget
+
+
+def test_call_within_budget():
+    budget = ListenerTimeBudget(1.0)
+    assert budget.call("start_test", lambda a, b: a + b, (1,), {"b": 2}) == 3
+    budget.shutdown()
+    assert budget.calls == 1
+    assert budget.exceeded == {}
+
+
+def test_exceeded_call_finished_in_background_in_order():
+    budget = ListenerTimeBudget(0.01)
+    release = threading.Event()
+    calls = []
+    assert budget.call("log_message", lambda: release.wait(5) and calls.append(1), (), {}) is None
+    budget.call("end_test", calls.append, (2,), {}, wait=False)
+    release.set()
+    budget.call("close", calls.append, (3,), {}, wait=True)
+    budget.shutdown()
+
+    assert calls == [1, 2, 3]
+    assert budget.exceeded["log_message"] == 1
+    assert budget.to_dict()["exceeded"] >= 1
+    assert budget.max_wait < 1.0
+    assert "calls exceeded 10 ms" in budget.format_summary()
+
+
+def test_deferred_call_error_counted():
+    budget = ListenerTimeBudget(0.01)
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("boom")
+
+    budget.call("start_test", fail, (), {})
+    release.set()
+    budget.call("close", lambda: None, (), {}, wait=True)
+    budget.shutdown()
+    assert budget.errors == 1
+    assert "boom" in budget.format_summary()
+
+
+def test_error_within_budget_raised():
+    budget = ListenerTimeBudget(1.0)
+    with pytest.raises(ValueError):
+        budget.call("start_test", int, ("x",), {})
+    budget.shutdown()
+
+
+def test_nested_call_executed_immediately():
+    budget = ListenerTimeBudget(1.0)
+    assert budget.call("start_test", lambda: budget.call("log_message", lambda: 5, (), {}), (), {}) == 5
+    budget.shutdown()
+
+
+def test_call_waited_for_when_queue_full():
+    budget = ListenerTimeBudget(0.01, queue_size=1)
+    release = threading.Event()
+    calls = []
+    assert budget.call("log_message", lambda: release.wait(5) and calls.append(1), (), {}) is None
+    threading.Timer(0.1, release.set).start()
+    assert budget.call("end_test", lambda: calls.append(2) or 2, (), {}) == 2
+    budget.shutdown()
+
+    assert calls == [1, 2]
+    assert budget.blocked == 1
+    assert budget.max_wait >= 0.1
+    assert "1 waited for the full queue of 1 calls" in budget.format_summary()
+
+
+def test_first_deferred_error_logged(caplog):
+    budget = ListenerTimeBudget(0.01)
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("boom")
+
+    budget.call("start_test", fail, (), {})
+    budget.call("end_test", fail, (), {})
+    release.set()
+    budget.call("close", lambda: None, (), {}, wait=True)
+    budget.shutdown()
+
+    records = [r for r in caplog.records if r.name == "robotframework_reportportal.budget"]
+    assert len(records) == 1
+    assert records[0].exc_info[1].args == ("boom",)
+    assert budget.errors == 2
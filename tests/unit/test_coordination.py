@@ -0,0 +1,145 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import threading
+import time
+
+import pytest
+
+from robotframework_reportportal.coordination import LaunchCoordinator, PabotLib, PabotLibError, SuiteRegistry
+from tests.helpers.pabotlib import PabotLibStub
+
+
+def test_single_worker_starts_launch():
+    with PabotLibStub() as stub:
+        coordinators = [LaunchCoordinator(PabotLib(stub.uri, f"caller-{i}"), False) for i in range(4)]
+        launches = {}
+        started = []
+
+        def start_launch():
+            time.sleep(0.1)
+            started.append("launch-1")
+            return "launch-1"
+
+        def join(coordinator):
+            launches[coordinator.pabot_lib.caller_id] = coordinator.get_launch(start_launch)
+
+        threads = [threading.Thread(target=join, args=(coordinator,)) for coordinator in coordinators]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert started == ["launch-1"]
+        assert set(launches.values()) == {"launch-1"}
+        assert len(launches) == 4
+        assert sum(coordinator.is_creator for coordinator in coordinators) == 1
+        assert stub.values["reportportal_launch_workers"] == "4"
+        assert not stub.locks
+
+
+def test_failed_launch_start_passed_to_next_worker():
+    with PabotLibStub() as stub:
+        first = LaunchCoordinator(PabotLib(stub.uri, "caller-1"), False)
+        second = LaunchCoordinator(PabotLib(stub.uri, "caller-2"), False)
+        assert first.get_launch(lambda: None) is None
+        assert second.get_launch(lambda: "launch-2") == "launch-2"
+        assert stub.values["reportportal_launch_uuid"] == "launch-2"
+        assert stub.values["reportportal_launch_workers"] == "1"
+
+
+def test_lock_released_if_launch_start_raises():
+    with PabotLibStub() as stub:
+        first = LaunchCoordinator(PabotLib(stub.uri, "caller-1"), False)
+
+        def fail():
+            raise ConnectionError("Unreachable")
+
+        with pytest.raises(ConnectionError):
+            first.get_launch(fail)
+        assert not stub.locks
+
+
+def test_lock_wait_limited():
+    with PabotLibStub() as stub:
+        stub.locks["reportportal_launch"] = ("caller-1", 1)
+        with pytest.raises(PabotLibError):
+            PabotLib(stub.uri, "caller-2").acquire_lock("reportportal_launch", timeout=0.2)
+
+
+def test_launch_finished_by_last_worker():
+    with PabotLibStub() as stub:
+        first = LaunchCoordinator(PabotLib(stub.uri, "caller-1"), False)
+        last = LaunchCoordinator(PabotLib(stub.uri, "caller-2"), True)
+        assert first.get_launch(lambda: "launch-1") == "launch-1"
+        assert last.get_launch(lambda: "launch-2") == "launch-1"
+        assert not first.leave()
+        assert last.leave()
+
+
+def test_suite_shared_and_finished_by_last_worker():
+    with PabotLibStub() as stub:
+        first = SuiteRegistry(PabotLib(stub.uri, "caller-1"))
+        last = SuiteRegistry(PabotLib(stub.uri, "caller-2"))
+        started = []
+
+        def start_suite(name):
+            started.append(name)
+            return f"uuid-{name}"
+
+        assert first.start("Root", lambda: start_suite("Root")) == "uuid-Root"
+        assert first.start("Root.Suite", lambda: start_suite("Root.Suite")) == "uuid-Root.Suite"
+        assert last.start("Root", lambda: start_suite("Root")) == "uuid-Root"
+        assert last.start("Root.Suite", lambda: start_suite("Root.Suite")) == "uuid-Root.Suite"
+        assert started == ["Root", "Root.Suite"]
+
+        assert first.finish("Root.Suite", "1000", "FAILED") == []
+        assert first.finish("Root", "1001", "FAILED") == []
+        stub.values["reportportal_launch_last_started"] = "1"
+        assert last.finish("Root.Suite", "900", "PASSED") == [("uuid-Root.Suite", "1000", "FAILED")]
+        assert last.finish("Root", "901", "PASSED") == [("uuid-Root", "1001", "FAILED")]
+        assert last.finish_all() == []
+        assert not stub.locks
+
+
+def test_suites_left_by_earlier_workers_finished_with_ancestor():
+    with PabotLibStub() as stub:
+        first = SuiteRegistry(PabotLib(stub.uri, "caller-1"))
+        last = SuiteRegistry(PabotLib(stub.uri, "caller-2"))
+        first.start("Root", lambda: "uuid-Root")
+        first.start("Root.First", lambda: "uuid-Root.First")
+        last.start("Root", lambda: "uuid-Root")
+        last.start("Root.Second", lambda: "uuid-Root.Second")
+        last.start("Root.Crashed", lambda: "uuid-Root.Crashed")
+
+        assert first.finish("Root.First", "1000", "PASSED") == []
+        assert first.finish("Root", "1001", "PASSED") == []
+        stub.values["reportportal_launch_last_started"] = "1"
+        assert last.finish("Root.Second", "2000", "SKIPPED") == [("uuid-Root.Second", "2000", "SKIPPED")]
+        assert last.finish("Root", "2001", "PASSED") == [
+            ("uuid-Root.First", "1000", "PASSED"),
+            ("uuid-Root.Crashed", None, None),
+            ("uuid-Root", "2001", "PASSED"),
+        ]
+        assert last.finish_all() == []
+
+
+def test_open_suites_taken_by_launch_finish():
+    with PabotLibStub() as stub:
+        registry = SuiteRegistry(PabotLib(stub.uri, "caller-1"))
+        registry.start("Root", lambda: "uuid-Root")
+        registry.start("Root.Suite", lambda: "uuid-Root.Suite")
+        assert registry.finish("Root.Suite", "1000", "PASSED") == []
+        assert registry.finish_all() == [("uuid-Root.Suite", "1000", "PASSED"), ("uuid-Root", None, None)]
+        assert registry.finish_all() == []
@@ -13,11 +13,14 @@ See the License for the specific language governing permissions and
 limitations under the License
 """
 
+import base64
+import sys
 from unittest import mock
 
 import pytest
 
 from robotframework_reportportal.listener import listener
+from robotframework_reportportal.model import Keyword, LogMessage, SpilledLogMessage
 from tests import REPORT_PORTAL_SERVICE
 
 
@@ -142,3 +145,129 @@ class TestListener:
         args, kwargs = mock_client.start_test_item.call_args
         assert kwargs["test_case_id"] == "12345"
         assert kwargs["attributes"] == [{"value": "simple"}]
+
+    @mock.patch(REPORT_PORTAL_SERVICE)
+    def test_embedded_image_log(self, mock_client_init, mock_listener, test_attributes):
+        with open("examples/res/selenium-screenshot-1.png", "rb") as f:
+            image_data = f.read()
+        message = (
+            '</td></tr><tr><td colspan="3"><img alt="screenshot" class="robot-seleniumlibrary-screenshot" '
+            f'src="data:image/png;base64,{base64.b64encode(image_data).decode()}" width="900px"></td></tr>'
+        )
+        mock_listener.start_test("Test", test_attributes)
+        mock_listener.log_message({"message": message, "level": "INFO", "html": "yes"})
+        mock_client = mock_client_init.return_value
+        assert mock_client.log.call_count == 1
+        args, kwargs = mock_client.log.call_args
+        assert kwargs["message"] == "Image attached: embedded_image.png"
+        assert kwargs["attachment"] == {"name": "embedded_image.png", "data": image_data, "mime": "image/png"}
+
+    @mock.patch(REPORT_PORTAL_SERVICE)
+    def test_embedded_images_log(self, mock_client_init, mock_listener, test_attributes):
+        with open("examples/res/selenium-screenshot-1.png", "rb") as f:
+            image_data = f.read()
+        image_uri = f"data:image/png;base64,{base64.b64encode(image_data).decode()}"
+        message = f'<p>Before</p><img src="{image_uri}"><p>Between</p><img alt="second" src="{image_uri}"><p>After</p>'
+        mock_listener.start_test("Test", test_attributes)
+        mock_listener.log_message({"message": message, "level": "INFO", "html": "yes"})
+        mock_client = mock_client_init.return_value
+        assert mock_client.log.call_count == 2
+        first, second = [c[1] for c in mock_client.log.call_args_list]
+        assert first["message"] == "<p>Before</p><p>Between</p><p>After</p>"
+        assert first["attachment"] == {"name": "embedded_image.png", "data": image_data, "mime": "image/png"}
+        assert second["message"] == "Image attached: embedded_image_2.png"
+        assert second["attachment"] == {"name": "embedded_image_2.png", "data": image_data, "mime": "image/png"}
+        assert second["item_id"] == first["item_id"]
+
+    @mock.patch(REPORT_PORTAL_SERVICE)
+    def test_empty_suite_not_reported(self, mock_client_init, mock_listener, suite_attributes):
+        mock_listener.variables.skip_empty_suites = True
+        child_attributes = {**suite_attributes, "id": "s1-s1", "longname": "Suite.Child", "status": "PASS"}
+        mock_listener.start_suite("Suite", suite_attributes)
+        mock_listener.start_suite("Child", child_attributes)
+        mock_listener.end_suite("Child", child_attributes)
+        mock_client = mock_client_init.return_value
+        assert mock_client.start_launch.call_count == 1
+        assert mock_client.start_test_item.call_count == 0
+        assert mock_client.finish_test_item.call_count == 0
+
+    @mock.patch(REPORT_PORTAL_SERVICE)
+    def test_suites_reported_on_test_start(self, mock_client_init, mock_listener, suite_attributes, test_attributes):
+        mock_listener.variables.skip_empty_suites = True
+        child_attributes = {**suite_attributes, "id": "s1-s1", "longname": "Suite.Child"}
+        mock_listener.start_suite("Suite", suite_attributes)
+        mock_listener.start_suite("Child", child_attributes)
+        mock_client = mock_client_init.return_value
+        assert mock_client.start_test_item.call_count == 0
+        mock_listener.start_test("Test", test_attributes)
+        assert mock_client.start_test_item.call_count == 3
+        names = [kwargs["name"] for args, kwargs in mock_client.start_test_item.call_args_list]
+        assert names == ["Suite", "Child", "Test"]
+        assert mock_client.start_test_item.call_args_list[1][1]["parent_item_id"] == (
+            mock_client.start_test_item.return_value
+        )
+
+    @mock.patch(REPORT_PORTAL_SERVICE)
+    def test_suites_reported_on_start_by_default(self, mock_client_init, mock_listener, suite_attributes):
+        child_attributes = {**suite_attributes, "id": "s1-s1", "longname": "Suite.Child", "status": "PASS"}
+        mock_listener.start_suite("Suite", suite_attributes)
+        mock_listener.start_suite("Child", child_attributes)
+        mock_client = mock_client_init.return_value
+        assert mock_client.start_test_item.call_count == 2
+        mock_listener.end_suite("Child", child_attributes)
+        assert mock_client.finish_test_item.call_count == 1
+
+    @mock.patch(REPORT_PORTAL_SERVICE)
+    def test_skipped_keywords_replay(self, mock_client_init, mock_listener, test_attributes, kwd_attributes):
+        mock_listener.start_test("Test", test_attributes)
+        parent = root = Keyword("Log", {**kwd_attributes, "status": "PASS"}, mock_listener.current_item)
+        root.posted = False
+        for _ in range(sys.getrecursionlimit() * 2):
+            kwd = Keyword("Log", {**kwd_attributes, "status": "PASS"}, parent)
+            kwd.posted = False
+            kwd.skipped_logs.append(LogMessage("Message"))
+            parent.skipped_keywords.append(kwd)
+            parent = kwd
+        mock_client = mock_client_init.return_value
+        mock_listener._post_skipped_keywords(root)
+        mock_listener._post_skipped_keywords(root)
+        depth = sys.getrecursionlimit() * 2
+        assert mock_client.start_test_item.call_count == depth + 2
+        assert mock_client.finish_test_item.call_count == depth
+        assert mock_client.log.call_count == depth
+
+    @mock.patch(REPORT_PORTAL_SERVICE)
+    @mock.patch("robotframework_reportportal.listener.SAMPLED_OUT_BUFFER_SIZE", 10)
+    def test_logs_of_sampled_out_test_spilled_and_posted_on_failure(
+        self, mock_client_init, mock_listener, test_attributes
+    ):
+        mock_listener.variables.passed_detail_sample_rate = 0.0
+        mock_listener.start_test("Test", test_attributes)
+        mock_listener._log_message(LogMessage("Step"))
+        attachment = LogMessage("Screenshot")
+        attachment.attachment = {"name": "screenshot.png", "data": b"data", "mime": "image/png"}
+        mock_listener._log_message(attachment)
+        skipped_logs = mock_listener.current_item.skipped_logs
+        assert skipped_logs[0] == "Step"
+        assert isinstance(skipped_logs[1], SpilledLogMessage)
+
+        mock_listener.end_test("Test", {**test_attributes, "status": "FAIL"})
+        mock_client = mock_client_init.return_value
+        calls = [kwargs for args, kwargs in mock_client.log.call_args_list]
+        assert [call["message"] for call in calls] == ["Step", "Screenshot"]
+        assert calls[1]["attachment"] == attachment.attachment
+        assert mock_listener._sampled_out_spill is None
+
+    @mock.patch(REPORT_PORTAL_SERVICE)
+    def test_failure_message_of_sampled_out_test_posts_its_content(
+        self, mock_client_init, mock_listener, suite_attributes, test_attributes
+    ):
+        mock_listener.variables.passed_detail_sample_rate = 0.0
+        mock_listener.start_suite("Suite", suite_attributes)
+        mock_listener.start_test("Test", test_attributes)
+        mock_listener._log_message(LogMessage("Step"))
+        failure = LogMessage("Failure")
+        failure.level = "FAIL"
+        mock_listener._log_message(failure)
+        mock_client = mock_client_init.return_value
+        assert [kwargs["message"] for args, kwargs in mock_client.log.call_args_list] == ["Step", "Failure"]
@@ -0,0 +1,40 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from robotframework_reportportal.metrics import ServiceMetrics, get_payload_size
+
+
+def test_payload_size():
+    attachment = {"name": "file.txt", "data": b"12345", "mime": "text/plain"}
+    assert get_payload_size({"message": "abc", "attachment": attachment, "level": None}) == 8
+
+
+def test_call_metrics():
+    metrics = ServiceMetrics()
+    for duration in (0.0005, 0.003, 0.003, 0.15):
+        metrics.record("log", duration, 10)
+    metrics.record("log", 0.02, 10, error=True)
+
+    result = metrics.to_dict()
+    assert result["count"] == 5
+    assert result["errors"] == 1
+    log = result["methods"]["log"]
+    assert log["count"] == 5
+    assert log["payload_bytes"] == 50
+    assert log["max_ms"] == 150.0
+    assert log["p50_ms"] == 5.0
+    assert log["p95_ms"] == 150.0
+    assert log["histogram"]["<=1ms"] == 1
+    assert log["histogram"]["<=5ms"] == 2
+    assert "log" in metrics.format_summary()
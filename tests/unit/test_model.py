@@ -35,3 +35,13 @@ def test_keyword_get_type(kwd_attributes, self_type, parent_type, expected):
     kwd = Keyword(name="Test keyword", robot_attributes=kwd_attributes, parent=parent)
     kwd.keyword_type = self_type
     assert kwd.get_type() == expected
+
+
+def test_keyword_depth(kwd_attributes):
+    """Test for the keyword depth calculation."""
+    parent = mock.Mock()
+    parent.type = "TEST"
+    kwd = Keyword(name="Test keyword", robot_attributes=kwd_attributes, parent=parent)
+    child = Keyword(name="Child keyword", robot_attributes=kwd_attributes, parent=kwd)
+    assert kwd.depth == 1
+    assert child.depth == 2
@@ -14,8 +14,10 @@ limitations under the License
 """
 
 import sys
+from unittest import mock
 
 import pytest
+from robot.result import Message
 
 from robotframework_reportportal.result_visitor import to_timestamp
 from robotframework_reportportal.variables import _variables
@@ -58,3 +60,12 @@ if sys.version_info >= (3, 9):
 def test_time_stamp_conversion(time_str, time_shift, expected):
     _variables["RP_TIME_ZONE_OFFSET"] = time_shift
     assert to_timestamp(time_str) == expected
+
+
+@mock.patch("robotframework_reportportal.result_visitor.listener")
+def test_embedded_image_message(mock_listener, visitor):
+    message = '<img src="data:image/png;base64,iVBORw0KGgo=" width="800px">'
+    visitor.start_message(Message(message, level="INFO", html=True))
+    assert mock_listener.log_message_with_image.call_count == 0
+    assert mock_listener.log_message.call_count == 1
+    assert mock_listener.log_message.call_args[0][0] == {"message": message, "level": "INFO", "html": "yes"}
@@ -0,0 +1,239 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from reportportal_client import RPClient
+from reportportal_client._internal.logs.batcher import LogBatcher
+from reportportal_client.core.rp_requests import RPRequestLog
+
+from robotframework_reportportal.backpressure import LogSpill, QueuePolicy
+from robotframework_reportportal.breaker import CircuitBreaker
+from robotframework_reportportal.model import Keyword, Launch, LogMessage, Suite, Test
+from robotframework_reportportal.service import RobotService
+from robotframework_reportportal.sinks import read_spool
+from robotframework_reportportal.variables import Variables
+
+
+@pytest.fixture
+def service():
+    service = RobotService()
+    service.rp = mock.Mock()
+    return service
+
+
+def log_message(text, attachment=None):
+    message = LogMessage(text)
+    message.item_id = "test_item"
+    message.attachment = attachment
+    return message
+
+
+def test_log_postponed_until_attachment_ready(service):
+    attachment = Future()
+    service.log(log_message("First", attachment))
+    service.log(log_message("Second"))
+    assert service.rp.log.call_count == 0
+
+    attachment.set_result({"name": "image.png", "data": b"data", "mime": "image/png"})
+    service.log(log_message("Third"))
+    assert [c[1]["message"] for c in service.rp.log.call_args_list] == ["First", "Second", "Third"]
+    assert service.rp.log.call_args_list[0][1]["attachment"]["name"] == "image.png"
+
+
+def test_postponed_logs_sent_before_item_finish(service, test_attributes):
+    attachment = Future()
+    service.log(log_message("First", attachment))
+    attachment.set_result(None)
+    test = Test("Test", test_attributes, [], None).update({"status": "PASS", "endtime": "20210407 12:24:28.116"})
+    service.finish_test(test)
+    assert [c[0] for c in service.rp.method_calls] == ["log", "finish_test_item"]
+
+
+def test_logs_buffered_until_test_finish(service, test_attributes):
+    service.log_buffering = True
+    service.log_buffer_max_count = 10
+    service.log_buffer_max_size = 1024
+    for i in range(3):
+        service.log(log_message(f"Message {i}"))
+    assert service.rp.log.call_count == 0
+
+    test = Test("Test", test_attributes, [], None).update({"status": "FAIL", "endtime": "20210407 12:24:28.116"})
+    service.finish_test(test)
+    assert [c[0] for c in service.rp.method_calls] == ["log", "log", "log", "finish_test_item"]
+
+
+@pytest.mark.parametrize("max_count, max_size, expected_calls", [(2, 1024, 4), (10, 80, 3), (10, 1024, 0)])
+def test_log_buffer_flushed_on_threshold(service, max_count, max_size, expected_calls):
+    service.log_buffering = True
+    service.log_buffer_max_count = max_count
+    service.log_buffer_max_size = max_size
+    for i in range(5):
+        service.log(log_message(f"Message {i}"))
+    assert service.rp.log.call_count == expected_calls
+
+
+def test_item_calls_go_ahead_of_log_lane(service, kwd_attributes):
+    service._log_lane = ThreadPoolExecutor(1)
+    upload_allowed = threading.Event()
+    service.rp.log.side_effect = lambda **_: upload_allowed.wait(5)
+    service.log(log_message("Attachment", {"name": "file.txt", "data": b"data", "mime": "text/plain"}))
+
+    keyword = Keyword("Log", {**kwd_attributes, "status": "PASS", "endtime": "1621947055435"}, None)
+    service.finish_keyword(keyword)
+    assert [c[0] for c in service.rp.method_calls] == ["log", "finish_test_item"]
+
+    upload_allowed.set()
+    service.terminate_service()
+    assert not service._log_lane_tasks
+    assert [c[0] for c in service.rp.method_calls] == ["log", "finish_test_item", "close"]
+
+
+def test_item_finish_waits_for_own_logs(service, kwd_attributes):
+    service._log_lane = ThreadPoolExecutor(1)
+    completed = []
+    service.rp.log.side_effect = lambda **_: time.sleep(0.2) or completed.append("log")
+    service.rp.finish_test_item.side_effect = lambda **_: completed.append("finish_test_item")
+    service.log(log_message("Message"))
+
+    keyword = Keyword("Log", {**kwd_attributes, "status": "PASS", "endtime": "1621947055435"}, None)
+    keyword.rp_item_id = "test_item"
+    service.finish_keyword(keyword)
+    assert completed == ["log", "finish_test_item"]
+    assert not service._log_lane_item_tasks
+    service._log_lane.shutdown()
+
+
+def saturated_service(service, policy):
+    service._log_lane = ThreadPoolExecutor(1)
+    service.log_queue_size = 1
+    service.log_queue_policy = policy
+    upload_allowed = threading.Event()
+    service.rp.log.side_effect = lambda **_: upload_allowed.wait(5)
+    service.log(log_message("Occupies the queue"))
+    return upload_allowed
+
+
+@pytest.mark.parametrize(
+    "policy, shed_levels", [(QueuePolicy.DROP_DEBUG, ["DEBUG"]), (QueuePolicy.DROP_NON_ERRORS, ["DEBUG", "INFO"])]
+)
+def test_logs_shed_when_queue_full(service, test_attributes, suite_attributes, policy, shed_levels):
+    upload_allowed = saturated_service(service, policy)
+    service.start_test(Test("Test", test_attributes, [], None))
+    # Messages which are not shed wait for the upload to finish
+    threading.Timer(0.2, upload_allowed.set).start()
+    for level in ("DEBUG", "INFO", "ERROR"):
+        message = log_message(f"{level} message")
+        message.level = level
+        service.log(message)
+
+    test = Test("Test", test_attributes, [], None).update({"status": "PASS", "endtime": "20210407 12:24:28.116"})
+    service.finish_test(test)
+    attributes = service.rp.finish_test_item.call_args[1]["attributes"]
+    assert {"key": "rp_shed_logs", "value": str(len(shed_levels))} in attributes
+
+    launch = Launch("Launch", {**suite_attributes, "status": "PASS", "endtime": "20210407 12:24:28.116"}, None)
+    service.finish_launch(launch)
+    summary = service.rp.log.call_args[1]
+    assert summary["item_id"] is None
+    assert summary["message"].startswith(f"{len(shed_levels)} log messages were not reported")
+    sent = [c[1]["message"].split()[0] for c in service.rp.log.call_args_list[1:-1]]
+    assert sent == [level for level in ("DEBUG", "INFO", "ERROR") if level not in shed_levels]
+    service._log_lane.shutdown()
+
+
+def test_logs_spilled_when_queue_full(service):
+    upload_allowed = saturated_service(service, QueuePolicy.SPILL)
+    service._log_spill = LogSpill()
+    service.log(log_message("Spilled", {"name": "file.txt", "data": b"data", "mime": "text/plain"}))
+    assert service._log_spill.count == 1
+    spill_file = service._log_spill.file_path
+    assert os.path.basename(spill_file).startswith("reportportal_log_spill_")
+    upload_allowed.set()
+
+    service.terminate_service()
+    messages = [c[1]["message"] for c in service.rp.log.call_args_list]
+    assert messages == ["Occupies the queue", "Spilled"]
+    assert service.rp.log.call_args[1]["attachment"]["data"] == b"data"
+    assert not os.path.exists(spill_file)
+
+
+def test_circuit_breaker_journal_and_backfill(service, test_attributes, tmp_path):
+    service.breaker = CircuitBreaker(2, recovery_interval=0)
+    service.journal_file = str(tmp_path / "journal.jsonl")
+    service.rp.start_test_item.return_value = None
+    service.rp.get_project_settings.return_value = None
+    for _ in range(3):
+        item_id = service.start_test(Test("Test", test_attributes, [], None))
+    assert service.breaker.is_open
+    assert service.rp.start_test_item.call_count == 2
+    assert item_id
+
+    service.rp.get_project_settings.return_value = {"project": 1}
+    service.rp.start_test_item.side_effect = lambda **kwargs: kwargs["uuid"]
+    service.log(log_message("After recovery"))
+    assert not service.breaker.is_open
+    replayed_ids = [c[1]["uuid"] for c in service.rp.start_test_item.call_args_list[2:]]
+    assert len(replayed_ids) == 2
+    assert item_id in replayed_ids
+    assert service.rp.log.call_args[1]["message"] == "After recovery"
+
+
+def test_client_log_batch_journaled_on_close(test_attributes, tmp_path):
+    service = RobotService()
+    service.rp = mock.Mock(spec=RPClient)
+    service.rp._log_batcher = LogBatcher(entry_num=10)
+    service.rp.log.side_effect = lambda **kwargs: service.rp._log_batcher.append(
+        RPRequestLog(launch_uuid="launch", item_uuid=kwargs["item_id"], time=kwargs["time"], message=kwargs["message"])
+    )
+    service.rp.start_test_item.return_value = None
+    service.breaker = CircuitBreaker(1)
+    service.journal_file = str(tmp_path / "journal.jsonl")
+    service.log(log_message("In the client's batch"))
+    service.start_test(Test("Test", test_attributes, [], None))
+    assert service.breaker.is_open
+    service.log(log_message("In the journal"))
+    service.terminate_service()
+
+    assert service.rp._log.call_count == 0
+    assert service.rp.close.call_count == 1
+    calls = [(method, request.get("message")) for method, request in read_spool(service.journal_file)]
+    assert calls == [("log", "In the client's batch"), ("start_test_item", None), ("log", "In the journal")]
+
+
+def test_shared_suite_descendants_without_end_time_finished(service, suite_attributes):
+    service.suite_registry = mock.Mock()
+    service.suite_registry.finish.return_value = [("crashed", None, None), ("suite", "1000", "PASSED")]
+    suite = Suite("Suite", {**suite_attributes, "status": "PASS", "endtime": "20210407 12:24:28.116"})
+    suite.rp_item_id = "suite"
+    service.finish_suite(suite, ts="1000")
+
+    crashed, shared = [c[1] for c in service.rp.finish_test_item.call_args_list]
+    assert crashed["item_id"] == "crashed"
+    assert crashed["end_time"]
+    assert crashed["status"] == "FAILED"
+    assert shared == {"end_time": "1000", "issue": None, "item_id": "suite", "status": "PASSED"}
+
+
+def test_spool_file_unique_per_process():
+    assert Variables().spool_file == f"reportportal_spool_{os.getpid()}.jsonl"
+
+
+def test_journal_file_unique_per_process():
+    assert Variables().circuit_breaker_journal == f"reportportal_journal_{os.getpid()}.jsonl"
@@ -0,0 +1,151 @@
+#  Copyright 2024 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import fcntl
+import os
+import stat
+import time
+from unittest import mock
+
+import pytest
+
+from robotframework_reportportal.service import RobotService
+from robotframework_reportportal.token_cache import CachedOAuthPasswordGrant, TokenCache, TokenCacheLockError
+
+OAUTH_URI = "http://localhost:8080/uat/sso/oauth/token"
+
+
+def token_session(*tokens):
+    session = mock.Mock()
+    responses = []
+    for token in tokens:
+        response = mock.Mock(ok=True)
+        response.json.return_value = {"access_token": token, "refresh_token": f"refresh-{token}", "expires_in": 3600}
+        responses.append(response)
+    session.post.side_effect = responses
+    return session
+
+
+def create_auth(cache, session, username="user"):
+    return CachedOAuthPasswordGrant(
+        cache, oauth_uri=OAUTH_URI, username=username, password="password", client_id="client", session=session
+    )
+
+
+def test_token_shared_between_processes(tmp_path):
+    cache_file = str(tmp_path / "tokens.json")
+    first_session, second_session = token_session("token-1"), token_session()
+    assert create_auth(TokenCache(cache_file), first_session).get() == "Bearer token-1"
+    assert create_auth(TokenCache(cache_file), second_session).get() == "Bearer token-1"
+    assert first_session.post.call_count == 1
+    assert second_session.post.call_count == 0
+    assert stat.S_IMODE(os.stat(cache_file).st_mode) == 0o600
+    assert "user" not in open(cache_file).read()
+
+
+def test_tokens_cached_by_username(tmp_path):
+    cache = TokenCache(str(tmp_path / "tokens.json"))
+    assert create_auth(cache, token_session("token-1")).get() == "Bearer token-1"
+    assert create_auth(cache, token_session("token-2"), "other").get() == "Bearer token-2"
+
+
+def test_expired_token_refreshed_with_cached_refresh_token(tmp_path):
+    cache = TokenCache(str(tmp_path / "tokens.json"))
+    create_auth(cache, token_session("token-1")).get()
+    with cache.open() as entries:
+        for entry in entries.values():
+            entry["expires_at"] = time.time() - 1
+
+    session = token_session("token-2")
+    assert create_auth(cache, session).get() == "Bearer token-2"
+    assert session.post.call_args[1]["data"]["grant_type"] == "refresh_token"
+    assert session.post.call_args[1]["data"]["refresh_token"] == "refresh-token-1"
+    assert create_auth(cache, token_session()).get() == "Bearer token-2"
+
+
+def test_rejected_token_replaced_in_cache(tmp_path):
+    cache = TokenCache(str(tmp_path / "tokens.json"))
+    auth = create_auth(cache, token_session("token-1", "token-2"))
+    auth.get()
+    # Skip throttling of token requests made within the same second
+    auth._last_attempt_time = None
+    assert auth.refresh() == "Bearer token-2"
+    assert create_auth(cache, token_session()).get() == "Bearer token-2"
+
+
+def test_token_obtained_without_cache_when_lock_not_acquired(tmp_path):
+    cache_file = str(tmp_path / "tokens.json")
+    cache = TokenCache(cache_file, lock_timeout=0.1)
+    with open(cache_file, "w") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        with pytest.raises(TokenCacheLockError):
+            with cache.open():
+                pass
+        session = token_session("token-1")
+        assert create_auth(cache, session).get() == "Bearer token-1"
+    assert session.post.call_count == 1
+    assert open(cache_file).read() == ""
+
+
+def test_token_obtained_without_cache_when_file_unusable(tmp_path):
+    session = token_session("token-1", "token-2")
+    missing_dir_cache = TokenCache(str(tmp_path / "missing" / "tokens.json"))
+    assert create_auth(missing_dir_cache, session).get() == "Bearer token-1"
+
+    link = tmp_path / "link.json"
+    link.symlink_to(tmp_path / "target.json")
+    assert create_auth(TokenCache(str(link)), session).get() == "Bearer token-2"
+    assert session.post.call_count == 2
+    assert not (tmp_path / "target.json").exists()
+
+
+def test_file_of_another_user_not_used(tmp_path):
+    cache_file = tmp_path / "tokens.json"
+    cache_file.write_text('{"key": {"access_token": "foreign"}}')
+    with mock.patch("os.getuid", return_value=os.getuid() + 1):
+        with pytest.raises(PermissionError):
+            with TokenCache(str(cache_file)).open():
+                pass
+
+
+def configure_token_cache(mock_variables, tmp_path):
+    mock_variables.api_key = None
+    mock_variables.oauth_uri = OAUTH_URI
+    mock_variables.oauth_username = "user"
+    mock_variables.oauth_password = "password"
+    mock_variables.oauth_client_id = "client"
+    mock_variables.oauth_token_cache = True
+    mock_variables.oauth_token_cache_file = str(tmp_path / "tokens.json")
+
+
+def test_service_uses_token_cache(mock_variables, tmp_path):
+    configure_token_cache(mock_variables, tmp_path)
+    service = RobotService()
+    service.init_service(mock_variables)
+    assert isinstance(service.rp.auth, CachedOAuthPasswordGrant)
+    assert service.rp.auth.cache.file_path == mock_variables.oauth_token_cache_file
+    # The retry strategy of the client is kept
+    assert service.rp.session._client.adapters["https://"].max_retries.total == 5
+    service.rp.close()
+
+
+@mock.patch("robotframework_reportportal.service.logger")
+@mock.patch("robotframework_reportportal.service.is_token_cache_supported", mock.Mock(return_value=False))
+def test_service_falls_back_without_client_internals(mock_logger, mock_variables, tmp_path):
+    configure_token_cache(mock_variables, tmp_path)
+    service = RobotService()
+    service.init_service(mock_variables)
+    assert not isinstance(service.rp.auth, CachedOAuthPasswordGrant)
+    assert "not supported by the installed ReportPortal client version" in mock_logger.warning.call_args[0][0]
+    service.rp.close()